@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк задержки команд: HTTP POST /api/control/* vs команда по /ws/telemetry.
+
+Меряет:
+  - rtt:      отправка команды -> ответ (HTTP response / WS ack)
+  - feedback: отправка команды -> первый кадр телеметрии с новым состоянием
+
+Требует запущенный бэкенд и пакет websockets (services/requirements.txt):
+    python3 main.py &
+    python3 bench/bench_commands.py --url http://127.0.0.1:8000 -n 50 [--json]
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import statistics
+import time
+from urllib.parse import urlparse
+
+import websockets
+
+
+class HttpClient:
+    """Keep-alive соединение, как у браузера киоска."""
+
+    def __init__(self, url):
+        parsed = urlparse(url)
+        self.conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=5)
+
+    def post(self, path):
+        self.conn.request("POST", path, body=b"{}", headers={"Content-Type": "application/json"})
+        res = self.conn.getresponse()
+        res.read()
+        return res.status
+
+
+async def wait_state(ws, side, state):
+    while True:
+        msg = json.loads(await ws.recv())
+        if msg.get("topic") == side and msg.get("payload", {}).get("state") == state:
+            return time.perf_counter()
+
+
+async def bench_http(ws, http, side, n):
+    rtt, feedback = [], []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await asyncio.to_thread(http.post, f"/api/control/flush/{side}")
+        rtt.append(time.perf_counter() - t0)
+        feedback.append(await wait_state(ws, side, "FLUSH") - t0)
+
+        await asyncio.to_thread(http.post, f"/api/control/reset/{side}")
+        await wait_state(ws, side, "IDLE")
+    return rtt, feedback
+
+
+async def bench_ws(ws, side, n):
+    # ack и кадр могут прийти в любом порядке — разбираем оба в одном цикле чтения
+    rtt, feedback = [], []
+    for i in range(n):
+        cmd_id = i * 2 + 1
+        t0 = time.perf_counter()
+        await ws.send(json.dumps({"type": "command", "id": cmd_id, "command": "flush", "side": side}))
+        ack = state = None
+        while ack is None or state is None:
+            msg = json.loads(await ws.recv())
+            now = time.perf_counter()
+            if msg.get("type") == "ack" and msg.get("id") == cmd_id:
+                ack = now
+            elif msg.get("topic") == side and msg.get("payload", {}).get("state") == "FLUSH":
+                state = now
+        rtt.append(ack - t0)
+        feedback.append(state - t0)
+
+        await ws.send(json.dumps({"type": "command", "id": cmd_id + 1, "command": "reset", "side": side}))
+        await wait_state(ws, side, "IDLE")
+    return rtt, feedback
+
+
+def summarize(samples):
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[max(int(len(ms) * 0.95) - 1, 0)], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+async def run(url, side, n):
+    ws_url = url.replace("http", "ws", 1) + "/ws/telemetry?delta=0"
+    http = HttpClient(url)
+    results = {}
+
+    async with websockets.connect(ws_url) as ws:
+        http_rtt, http_fb = await bench_http(ws, http, side, n)
+    results["http"] = {"rtt": summarize(http_rtt), "feedback": summarize(http_fb)}
+
+    async with websockets.connect(ws_url) as ws:
+        ws_rtt, ws_fb = await bench_ws(ws, side, n)
+    results["ws"] = {"rtt": summarize(ws_rtt), "feedback": summarize(ws_fb)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control command latency benchmark")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Backend base URL")
+    parser.add_argument("--side", default="left", help="Group to exercise (must be IDLE)")
+    parser.add_argument("-n", "--number", type=int, default=50, help="Commands per transport")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.url, args.side, args.number))
+    if args.json:
+        print(json.dumps({"benchmark": "control_commands", "n": args.number, "results": results}, indent=2))
+        return
+
+    print(f"{'transport':<10} {'metric':<9} {'median ms':>10} {'p95 ms':>8} {'max ms':>8}")
+    for transport, metrics in results.items():
+        for metric, s in metrics.items():
+            print(f"{transport:<10} {metric:<9} {s['median_ms']:>10.2f} {s['p95_ms']:>8.2f} {s['max_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
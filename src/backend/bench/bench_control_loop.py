@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Тайминг контура управления под нагрузкой HTTP и WebSocket.
+
+Снимает гистограммы джиттера/перебегов контура (GET /api/telemetry/clients,
+секция "acquisition") до и после нагрузки и печатает разницу:
+  - ws:   N клиентов /ws/telemetry читают кадры;
+  - http: M потоков крутят GET /api/settings и GET /api/shots/live/left?points=200.
+
+Требует запущенный бэкенд и пакет websockets (services/requirements.txt):
+    python3 main.py &
+    python3 bench/bench_control_loop.py --url http://127.0.0.1:8000 -d 10 [--json]
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import time
+from urllib.parse import urlparse
+
+import websockets
+
+HTTP_PATHS = ("/api/settings", "/api/shots/live/left?points=200")
+
+
+def get_json(url, path):
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=5)
+    conn.request("GET", path)
+    data = json.loads(conn.getresponse().read())
+    conn.close()
+    return data
+
+
+def http_worker(url, stop_at):
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=5)
+    requests = 0
+    while time.monotonic() < stop_at:
+        conn.request("GET", HTTP_PATHS[requests % len(HTTP_PATHS)])
+        conn.getresponse().read()
+        requests += 1
+    conn.close()
+    return requests
+
+
+async def ws_worker(url, stop_at):
+    frames = 0
+    async with websockets.connect(url.replace("http", "ws", 1) + "/ws/telemetry") as ws:
+        while time.monotonic() < stop_at:
+            try:
+                await asyncio.wait_for(ws.recv(), timeout=max(stop_at - time.monotonic(), 0.01))
+                frames += 1
+            except asyncio.TimeoutError:
+                break
+    return frames
+
+
+def diff(before, after):
+    """Гистограмма за время нагрузки: разница счетчиков корзин."""
+    buckets = {k: after["buckets"][k] - before["buckets"].get(k, 0) for k in after["buckets"]}
+    return {"count": after["count"] - before["count"], "max_total": after["max"], "buckets": buckets}
+
+
+async def run(url, duration, ws_clients, http_workers):
+    before = get_json(url, "/api/telemetry/clients")["acquisition"]
+    stop_at = time.monotonic() + duration
+    ws_tasks = [ws_worker(url, stop_at) for _ in range(ws_clients)]
+    http_tasks = [asyncio.to_thread(http_worker, url, stop_at) for _ in range(http_workers)]
+    counts = await asyncio.gather(*ws_tasks, *http_tasks)
+    after = get_json(url, "/api/telemetry/clients")["acquisition"]
+    return {
+        "ws_frames": sum(counts[:ws_clients]),
+        "http_requests": sum(counts[ws_clients:]),
+        "ticks": after["samples"] - before["samples"],
+        "expected_ticks": int(after["rate_hz"] * duration),
+        "overruns": after["overruns"] - before["overruns"],
+        "jitter_ms": diff(before["jitter_ms"], after["jitter_ms"]),
+        "overrun_ms": diff(before["overrun_ms"], after["overrun_ms"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control loop timing under load")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Backend base URL")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Load duration, s")
+    parser.add_argument("--ws", type=int, default=8, help="WebSocket clients")
+    parser.add_argument("--http", type=int, default=4, help="HTTP worker threads")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.url, args.duration, args.ws, args.http))
+    if args.json:
+        print(json.dumps({"benchmark": "control_loop", "duration": args.duration, "results": result}, indent=2))
+        return
+
+    print(f"load: {args.ws} ws clients ({result['ws_frames']} frames), "
+          f"{args.http} http workers ({result['http_requests']} requests), {args.duration:.0f} s")
+    print(f"ticks: {result['ticks']} / {result['expected_ticks']} expected, overruns: {result['overruns']}")
+    for name in ("jitter_ms", "overrun_ms"):
+        print(f"\n{name} (count {result[name]['count']}):")
+        for bound, n in result[name]["buckets"].items():
+            print(f"  <= {bound:>5}: {n}")
+
+
+if __name__ == "__main__":
+    main()
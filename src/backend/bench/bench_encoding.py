@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк форматов кадров телеметрии: JSON vs бинарный (headunit.telemetry.bin.v1).
+Меряет стоимость кодирования/декодирования одного кадра и байты на проводе.
+
+Запуск (на устройстве или локально):
+    cd /run/headunit/active_app/backend && python3 bench/bench_encoding.py [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry.binary import pack_frame, unpack_frame  # noqa: E402
+
+FRAMES = {
+    "machine": {"boiler_temp": 95.5, "steam_pressure": 1.2, "water_level": "ok"},
+    "left": {
+        "temp": 93.1, "pressure": 9.0, "flowIn": 2.5, "flowOut": 2.2,
+        "yield": 24.6, "time": "0:11", "done": False, "active": True,
+        "state": "EXTRACTION",
+    },
+    "right": {
+        "temp": 93.0, "pressure": 0.0, "flowIn": 0.0, "flowOut": 0.0,
+        "yield": 0.0, "time": "0:00", "done": False, "active": False,
+        "state": "IDLE",
+    },
+}
+
+
+def measure(fn, number):
+    # Лучший из 5 прогонов, микросекунды на вызов
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(number):
+    results = []
+    for topic, payload in FRAMES.items():
+        msg = {"topic": topic, "payload": payload}
+        text = json.dumps(msg)
+        blob = pack_frame(topic, payload, seq=1, key=True)
+        results.append({
+            "topic": topic,
+            "json_bytes": len(text.encode()),
+            "json_encode_us": measure(lambda: json.dumps(msg), number),
+            "json_decode_us": measure(lambda: json.loads(text), number),
+            "bin_bytes": len(blob),
+            "bin_encode_us": measure(lambda: pack_frame(topic, payload, 1, True), number),
+            "bin_decode_us": measure(lambda: unpack_frame(blob), number),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry encoding benchmark")
+    parser.add_argument("-n", "--number", type=int, default=20000, help="Iterations per measurement")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps({"benchmark": "telemetry_encoding", "results": results}, indent=2))
+        return
+
+    print(f"{'topic':<8} {'fmt':<5} {'bytes':>6} {'encode us':>10} {'decode us':>10}")
+    for r in results:
+        print(f"{r['topic']:<8} {'json':<5} {r['json_bytes']:>6} {r['json_encode_us']:>10.2f} {r['json_decode_us']:>10.2f}")
+        print(f"{'':<8} {'bin':<5} {r['bin_bytes']:>6} {r['bin_encode_us']:>10.2f} {r['bin_decode_us']:>10.2f}")
+    print("\nNote: decode cost in the kiosk is JSON.parse vs DataView (utils/telemetryCodec.js);")
+    print("python decode numbers are a proxy for relative cost only.")
+
+
+if __name__ == "__main__":
+    main()
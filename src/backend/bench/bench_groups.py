@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк стоимости тика по числу групп (конфиг "groups").
+Все группы в экстракции; меряет в микросекундах:
+  - tick — шаг контура опроса (50 Гц), мок с фиксированной кривой и, если
+    есть numpy, с физической моделью (один векторный шаг на все группы);
+  - telemetry — get_telemetry() (кадр публикации);
+  - encode_json / encode_bin — полные кадры всех топиков одной публикации.
+
+Запуск (на устройстве или локально):
+    cd /run/headunit/active_app/backend && python3 bench/bench_groups.py [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hardware.mock import MockHardware  # noqa: E402
+from hardware.simulator import np, MachineSimulator  # noqa: E402
+from telemetry.binary import pack_frame, topic_ids  # noqa: E402
+
+GROUP_COUNTS = (2, 4, 8)
+
+
+def measure(fn, number):
+    # Лучший из 5 прогонов, микросекунды на вызов
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def make_hardware(n, sim):
+    sides = tuple(f"g{i}" for i in range(n))
+    hw = MockHardware(sides=sides, simulator=MachineSimulator(n, seed=1) if sim else None)
+    for side in sides:
+        hw.start_extraction(side, {"id": 1})
+    return hw
+
+
+def run_one(n, sim, number, loop):
+    hw = make_hardware(n, sim)
+    hw.tick()
+    frames = loop.run_until_complete(hw.get_telemetry())
+    topics = topic_ids(hw.SIDES)
+    result = {
+        "groups": n,
+        "model": "sim" if sim else "curve",
+        "tick_us": measure(hw.tick, number),
+        "telemetry_us": measure(lambda: loop.run_until_complete(hw.get_telemetry()), number // 10),
+        "encode_json_us": measure(lambda: [json.dumps({"topic": t, "payload": p}) for t, p in frames.items()], number),
+        "encode_bin_us": measure(lambda: [pack_frame(t, p, 0, True, topics) for t, p in frames.items()], number),
+    }
+    result["tick_per_group_us"] = result["tick_us"] / n
+    return {k: round(v, 2) if isinstance(v, float) else v for k, v in result.items()}
+
+
+def run(number):
+    loop = asyncio.new_event_loop()
+    try:
+        models = (False, True) if np is not None else (False,)
+        return [run_one(n, sim, number, loop) for sim in models for n in GROUP_COUNTS]
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-tick cost vs number of brew groups")
+    parser.add_argument("-n", "--number", type=int, default=2000, help="Calls per measurement")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps({"benchmark": "groups", "results": results}, indent=2))
+        return
+
+    print(f"{'model':<6} {'groups':>6} {'tick us':>9} {'us/group':>9} {'telemetry us':>13} {'json us':>8} {'bin us':>8}")
+    for r in results:
+        print(f"{r['model']:<6} {r['groups']:>6} {r['tick_us']:>9.2f} {r['tick_per_group_us']:>9.2f} "
+              f"{r['telemetry_us']:>13.2f} {r['encode_json_us']:>8.2f} {r['encode_bin_us']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
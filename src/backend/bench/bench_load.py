@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест конвейера телеметрии: N клиентов /ws/telemetry на одном бэкенде.
+
+Поднимает main.py (uvicorn) на mock или replay и ступенями наращивает число
+клиентов (--clients 1,5,10,...). На каждой ступени:
+  - одна группа в экстракции (кадры 5 Гц — на них считается джиттер);
+  - по другой группе идут команды flush/reset по WS, у каждого клиента
+    меряется задержка команда -> первый кадр с новым состоянием;
+  - CPU процесса бэкенда (/proc/<pid>/stat) за ступень, в том числе на клиента;
+  - missed_ticks рассылки и перебеги контура опроса (GET /api/telemetry/clients).
+Ступени идут до первой, на которой тики рассылки начали опаздывать:
+max_clients — последняя ступень без опозданий. Ступень должна быть короче
+экстракции мока (30 с), иначе группа нагрузки уйдет в Summary.
+Вывод --json несет версию бэкенда (/api/health) — для сравнения между релизами.
+Поднятый бэкенд пишет шоты и настройки во временный каталог (HEADUNIT_SHOTS_DIR,
+HEADUNIT_USER_CONFIG), который удаляется после прогона, — история машины не трогается.
+
+Клиенты живут в процессе бенчмарка; на слабом устройстве сам бенчмарк
+лучше запускать с другой машины (--url), тогда CPU бэкенда — по --pid.
+
+Требует пакет websockets (services/requirements.txt):
+    cd /run/headunit/active_app/backend && python3 bench/bench_load.py [--hardware replay --trace DIR] [--json]
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLISH_INTERVAL = 0.2  # с, кадры группы в экстракции (PUBLISH_RATES: 5 Гц)
+
+
+def get_json(url, path, method="GET"):
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=5)
+    conn.request(method, path, body=b"{}" if method == "POST" else None,
+                 headers={"Content-Type": "application/json"})
+    data = json.loads(conn.getresponse().read())
+    conn.close()
+    return data
+
+
+def cpu_seconds(pid):
+    """utime + stime процесса, с; None — нет /proc (не Linux) или процесса."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def ms(value):
+    return None if value is None else round(value * 1000, 3)
+
+
+class Probe:
+    """Ожидаемое состояние группы после команды: клиенты отмечают, когда увидели его."""
+
+    def __init__(self, clients):
+        self.clients = clients
+        self.side = self.state = None
+        self.sent_at = 0.0
+        self.seen = set()
+        self.latencies = []
+        self.done = asyncio.Event()
+
+    def arm(self, side, state):
+        self.side, self.state = side, state
+        self.seen.clear()
+        self.done.clear()
+        self.sent_at = time.perf_counter()
+
+    def observe(self, client_id, side, state, now):
+        if side == self.side and state == self.state and client_id not in self.seen:
+            self.seen.add(client_id)
+            self.latencies.append(now - self.sent_at)
+            if len(self.seen) == self.clients:
+                self.done.set()
+
+
+async def client(client_id, ws_url, probe, intervals, stop):
+    """Клиент как киоск: JSON-дельты, состояние топиков собирается из ключевых кадров и дельт."""
+    state = {}
+    last_active = {}  # topic -> время прошлого кадра в экстракции
+    async with websockets.connect(ws_url, max_queue=None) as ws:
+        while not stop.is_set():
+            try:
+                raw = await asyncio.wait_for(ws.recv(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            now = time.perf_counter()
+            msg = json.loads(raw)
+            topic = msg.get("topic")
+            if topic is None:
+                continue
+            if "payload" in msg:
+                state[topic] = dict(msg["payload"])
+            elif topic in state:
+                state[topic].update(msg.get("delta", {}))
+            else:
+                continue
+            group_state = state[topic].get("state")
+            probe.observe(client_id, topic, group_state, now)
+            if group_state == "EXTRACTION":
+                prev = last_active.get(topic)
+                # Команда публикует кадр вне сетки тиков: интервалы рядом с ней не считаем
+                if prev is not None and probe.sent_at < prev - PUBLISH_INTERVAL:
+                    intervals.append(now - prev)
+                last_active[topic] = now
+            else:
+                last_active.pop(topic, None)
+
+
+async def command(ws, cmd_id, name, side):
+    await ws.send(json.dumps({"type": "command", "id": cmd_id, "command": name, "side": side}))
+
+
+async def run_step(url, n, duration, pid, command_side, load_side):
+    ws_url = url.replace("http", "ws", 1) + "/ws/telemetry"
+    probe = Probe(n)
+    intervals = [[] for _ in range(n)]
+    stop = asyncio.Event()
+
+    get_json(url, f"/api/control/reset/{load_side}", "POST")
+    get_json(url, f"/api/control/reset/{command_side}", "POST")
+    tasks = [asyncio.create_task(client(i, ws_url, probe, intervals[i], stop)) for i in range(n)]
+    await asyncio.sleep(0.5)  # Подключение и ключевые кадры
+    get_json(url, f"/api/control/start/{load_side}", "POST")
+    await asyncio.sleep(0.5)
+
+    before = get_json(url, "/api/telemetry/clients")
+    cpu0, wall0 = cpu_seconds(pid) if pid else None, time.monotonic()
+    timeouts = 0
+    async with websockets.connect(ws_url) as driver:
+        cmd_id = 0
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            for name, expected in (("flush", "FLUSH"), ("reset", "IDLE")):
+                cmd_id += 1
+                probe.arm(command_side, expected)
+                await command(driver, cmd_id, name, command_side)
+                try:
+                    await asyncio.wait_for(probe.done.wait(), 2.0)
+                except asyncio.TimeoutError:
+                    timeouts += 1
+            await asyncio.sleep(0.2)
+    cpu1, wall1 = cpu_seconds(pid) if pid else None, time.monotonic()
+    after = get_json(url, "/api/telemetry/clients")
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Джиттер клиента — отклонение интервала между кадрами от периода публикации
+    jitter_p95 = [percentile([abs(i - PUBLISH_INTERVAL) for i in ivs], 0.95) for ivs in intervals if ivs]
+    cpu = None
+    if cpu0 is not None and cpu1 is not None:
+        cpu = (cpu1 - cpu0) / (wall1 - wall0) * 100
+    acq0, acq1 = before.get("acquisition", {}), after.get("acquisition", {})
+    return {
+        "clients": n,
+        "commands": len(probe.latencies) // max(n, 1),
+        "command_timeouts": timeouts,
+        "command_to_frame_ms": {
+            "median": ms(statistics.median(probe.latencies)) if probe.latencies else None,
+            "p95": ms(percentile(probe.latencies, 0.95)),
+            "max": ms(max(probe.latencies)) if probe.latencies else None,
+        },
+        "frame_jitter_ms": {
+            "median_client_p95": ms(statistics.median(jitter_p95)) if jitter_p95 else None,
+            "worst_client_p95": ms(max(jitter_p95)) if jitter_p95 else None,
+        },
+        "cpu_percent": None if cpu is None else round(cpu, 2),
+        "cpu_percent_per_client": None if cpu is None else round(cpu / n, 3),
+        "missed_ticks": after["missed_ticks"] - before["missed_ticks"],
+        "ticks": after["ticks"] - before["ticks"],
+        "max_tick_lateness_ms": after["max_tick_lateness_ms"],
+        "acquisition_overruns": acq1.get("overruns", 0) - acq0.get("overruns", 0),
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def user_config_file():
+    """Файл настроек пользователя, с которыми работает бэкенд на этой машине."""
+    sys.path.insert(0, BACKEND_DIR)
+    import settings_manager
+    return settings_manager.hu_config.USER_CONFIG_FILE
+
+
+def start_backend(args, workdir):
+    """Бэкенд с историей шотов, настройками и состоянием процесса железа в workdir."""
+    port = free_port()
+    config = os.path.join(workdir, "user_settings.json")
+    current = user_config_file()
+    if os.path.exists(current):
+        shutil.copy(current, config)  # Те же группы и частоты публикации, что у машины
+    env = dict(
+        os.environ,
+        HEADUNIT_HARDWARE=args.hardware,
+        HEADUNIT_SHOTS_DIR=os.path.join(workdir, "shots"),
+        HEADUNIT_USER_CONFIG=config,
+        HEADUNIT_SHM_PATH=os.path.join(workdir, "state"),
+        HEADUNIT_HARDWARE_SOCKET=os.path.join(workdir, "hardware.sock"),
+    )
+    if args.hardware == "replay":
+        env["HEADUNIT_REPLAY_PATH"] = os.path.abspath(args.trace)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            get_json(url, "/api/groups")
+            return proc, url
+        except OSError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("backend did not start")
+
+
+async def run(url, pid, steps, duration, tolerance):
+    groups = [g["name"] for g in get_json(url, "/api/groups")]
+    if len(groups) < 2:
+        raise RuntimeError("load test needs at least two groups")
+    command_side, load_side = groups[0], groups[1]
+    results = []
+    max_clients = 0
+    for n in steps:
+        step = await run_step(url, n, duration, pid, command_side, load_side)
+        step["slipped"] = step["missed_ticks"] > tolerance
+        results.append(step)
+        if step["slipped"]:
+            break
+        max_clients = n
+    return results, max_clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry pipeline load test")
+    parser.add_argument("--url", default=None, help="Use a running backend instead of starting one")
+    parser.add_argument("--pid", type=int, default=None, help="Backend pid for CPU accounting (with --url)")
+    parser.add_argument("--hardware", default="mock", choices=("mock", "replay"), help="Driver of the started backend")
+    parser.add_argument("--trace", default=None, help="Shot history for --hardware replay")
+    parser.add_argument("--clients", default="1,5,10,25,50,100", help="Client count per step")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Seconds per step")
+    parser.add_argument("--tolerance", type=int, default=0, help="Missed ticks allowed per step")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = parser.parse_args()
+    if args.hardware == "replay" and not args.trace and not args.url:
+        parser.error("--hardware replay needs --trace")
+
+    steps = [int(n) for n in args.clients.split(",")]
+    proc = workdir = None
+    url, pid = args.url, args.pid
+    try:
+        if url is None:
+            workdir = tempfile.mkdtemp(prefix="headunit-load-")
+            proc, url = start_backend(args, workdir)
+            pid = proc.pid
+        version = get_json(url, "/api/health").get("version")
+        results, max_clients = asyncio.run(run(url, pid, steps, args.duration, args.tolerance))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(10)
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({
+            "benchmark": "telemetry_load",
+            "version": version,
+            "hardware": args.hardware if args.url is None else None,
+            "duration_s": args.duration,
+            "max_clients": max_clients,
+            "steps": results,
+        }, indent=2))
+        return
+
+    print(f"{'clients':>7} {'cmd p50':>8} {'cmd p95':>8} {'jitter p95':>11} {'cpu %':>7} "
+          f"{'cpu/cl':>7} {'missed':>7} {'overruns':>9}")
+    for r in results:
+        lat, jit = r["command_to_frame_ms"], r["frame_jitter_ms"]
+        print(f"{r['clients']:>7} {lat['median'] or 0:>8.2f} {lat['p95'] or 0:>8.2f} "
+              f"{jit['worst_client_p95'] or 0:>11.2f} {r['cpu_percent'] or 0:>7.1f} "
+              f"{r['cpu_percent_per_client'] or 0:>7.2f} {r['missed_ticks']:>7} {r['acquisition_overruns']:>9}")
+    print(f"max clients without tick slip: {max_clients}")
+
+
+if __name__ == "__main__":
+    main()
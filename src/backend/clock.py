@@ -0,0 +1,118 @@
+"""
+Источник времени для железа, таймеров и контура опроса.
+
+Clock — реальное время, при speed != 1 ускоренное (воспроизведение 10x):
+и показания, и сон масштабируются, так что код выше не знает о скорости.
+VirtualClock — время идет только по advance(): тесты и бенчмарки гоняют
+тысячи шотов без ожидания и с одинаковым результатом от прогона к прогону.
+
+Интерфейс (его ждут TimerHeap, AcquisitionScheduler, AutoStop, HardwareBase):
+  clock()                — монотонное время, с;
+  clock.time()           — время по стене (unix), для start_time и started_at шота;
+  await clock.sleep(d)   — сон d секунд времени этих часов;
+  await clock.wait(e, t) — ожидание asyncio.Event не дольше t (None — без предела),
+                           True — событие наступило.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class Clock:
+    def __init__(self, speed=1.0):
+        if speed <= 0:
+            raise ValueError("clock speed must be positive")
+        self.speed = speed
+        self._mono0 = time.monotonic()
+        self._wall0 = time.time()
+
+    def __call__(self):
+        if self.speed == 1.0:
+            return time.monotonic()
+        return self._mono0 + (time.monotonic() - self._mono0) * self.speed
+
+    def time(self):
+        if self.speed == 1.0:
+            return time.time()
+        return self._wall0 + (self() - self._mono0)
+
+    async def sleep(self, delay):
+        await asyncio.sleep(delay / self.speed)
+
+    async def wait(self, event, timeout=None):
+        try:
+            await asyncio.wait_for(event.wait(), None if timeout is None else timeout / self.speed)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class VirtualClock:
+    """
+    Часы, которые двигает только advance(). Корутины sleep()/wait()
+    просыпаются внутри advance(), когда время доходит до их срока.
+    """
+
+    def __init__(self, start=0.0, wall=1_700_000_000.0):
+        self.now = start
+        self.wall = wall - start  # time() = wall + now
+        self._sleepers = []  # (when, seq, future)
+        self._seq = itertools.count()
+
+    def __call__(self):
+        return self.now
+
+    def time(self):
+        return self.wall + self.now
+
+    def advance(self, delay):
+        """Сдвигает время на delay и будит корутины, чей срок наступил."""
+        self.advance_to(self.now + delay)
+
+    def advance_to(self, when):
+        self.now = max(self.now, when)
+        sleepers = self._sleepers
+        while sleepers and sleepers[0][0] <= self.now:
+            future = heapq.heappop(sleepers)[2]
+            if not future.done():
+                future.set_result(None)
+
+    def next_deadline(self):
+        """Срок ближайшего спящего (None — никто не спит)."""
+        sleepers = self._sleepers
+        while sleepers and sleepers[0][2].done():
+            heapq.heappop(sleepers)
+        return sleepers[0][0] if sleepers else None
+
+    def _deadline(self, delay):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + delay, next(self._seq), future))
+        return future
+
+    async def sleep(self, delay):
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        await self._deadline(delay)
+
+    async def wait(self, event, timeout=None):
+        if event.is_set():
+            return True
+        if timeout is not None and timeout <= 0:
+            await asyncio.sleep(0)
+            return event.is_set()
+        waiter = asyncio.ensure_future(event.wait())
+        waits = {waiter}
+        if timeout is not None:
+            waits.add(self._deadline(timeout))
+        try:
+            await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for w in waits:
+                if not w.done():
+                    w.cancel()
+        return event.is_set()
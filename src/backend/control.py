@@ -0,0 +1,33 @@
+"""
+Команды управления группами.
+Общая точка входа для HTTP (/api/control/*) и WebSocket-канала команд.
+"""
+
+# command -> (метод железа, статус ответа)
+COMMANDS = {
+    "start": ("start_extraction", "started"),
+    "stop": ("stop_extraction", "stopped"),
+    "flush": ("start_flush", "flushing"),
+    "cleaning": ("start_cleaning", "cleaning"),
+    "reset": ("reset_group", "reset"),
+}
+
+
+def execute(hw, command, side, profile=None):
+    """
+    Выполняет команду и возвращает статус. side — имя группы или ее id.
+    ValueError — неизвестная команда, группа или профиль не объект.
+    """
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command: {command}")
+    if command == "start" and profile is not None and not isinstance(profile, dict):
+        raise ValueError("profile must be an object")
+    group = hw.group(side)
+    if group is None:
+        raise ValueError(f"unknown group: {side}")
+    method, status = COMMANDS[command]
+    if command == "start":
+        getattr(hw, method)(group.side, profile or {})
+    else:
+        getattr(hw, method)(group.side)
+    return status
@@ -0,0 +1,124 @@
+"""
+Контур управления и опрос датчиков с фиксированной частотой, независимой
+от частоты публикации.
+
+AcquisitionScheduler вызывает sample() ACQUISITION_RATE раз в секунду
+по абсолютным дедлайнам (без накопления дрейфа от asyncio.sleep)
+и ведет гистограммы джиттера и перебегов.
+
+Сэмплы копятся в Window; на каждом тике публикации окно забирается целиком:
+в кадр уходят последнее значение и min/max/mean за окно, поэтому короткий
+скачок давления между публикациями не теряется, а трафик не растет.
+"""
+import asyncio
+
+from clock import SYSTEM_CLOCK
+from histogram import Histogram
+
+ACQUISITION_RATE = 50  # Гц
+
+
+class Window:
+    """Агрегат сэмплов за окно публикации: last/min/max/mean по каждому полю."""
+
+    __slots__ = ("fields", "count", "last", "min", "max", "sum")
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.reset()
+
+    def reset(self):
+        n = len(self.fields)
+        self.count = 0
+        self.last = None
+        self.min = [float("inf")] * n
+        self.max = [float("-inf")] * n
+        self.sum = [0.0] * n
+
+    def add(self, values):
+        mins, maxs, sums = self.min, self.max, self.sum
+        for i, v in enumerate(values):
+            if v < mins[i]:
+                mins[i] = v
+            if v > maxs[i]:
+                maxs[i] = v
+            sums[i] += v
+        self.count += 1
+        self.last = values
+
+    def take(self):
+        """
+        Возвращает (last, stats) и начинает новое окно. None — сэмплов не было.
+        stats: {"samples": n, "min": {field: v}, "max": {...}, "mean": {...}}
+        """
+        if not self.count:
+            return None
+        n = self.count
+        stats = {
+            "samples": n,
+            "min": {f: round(v, 2) for f, v in zip(self.fields, self.min)},
+            "max": {f: round(v, 2) for f, v in zip(self.fields, self.max)},
+            "mean": {f: round(v / n, 2) for f, v in zip(self.fields, self.sum)},
+        }
+        last = self.last
+        self.reset()
+        return last, stats
+
+
+class AcquisitionScheduler:
+    """
+    Контур управления с фиксированным периодом: вызывает sample() ACQUISITION_RATE
+    раз в секунду по абсолютным дедлайнам. Опоздавшие тики не догоняются.
+    Если active() ложно, цикл спит до wake().
+
+    jitter  — опоздание пробуждения относительно дедлайна, мс;
+    overrun — на сколько тик (пробуждение + работа) вылез за следующий дедлайн, мс.
+    """
+
+    def __init__(self, sample, rate=ACQUISITION_RATE, active=None, clock=SYSTEM_CLOCK):
+        self.sample = sample
+        self.clock = clock
+        self.rate = rate
+        self.active = active  # () -> bool: есть ли что опрашивать; None — всегда
+        self._wake = asyncio.Event()
+        self.samples = 0
+        self.overruns = 0
+        self.jitter = Histogram()
+        self.overrun = Histogram()
+
+    async def run(self):
+        clock = self.clock
+        interval = 1.0 / self.rate
+        deadline = clock()
+        while True:
+            if self.active is not None and not self.active():
+                # Опрашивать нечего — спим до wake(), а не тикаем вхолостую
+                self._wake.clear()
+                await self._wake.wait()
+                deadline = clock()
+            self.jitter.observe((clock() - deadline) * 1000)
+            self.sample()
+            self.samples += 1
+            deadline += interval
+            now = clock()
+            delay = deadline - now
+            if delay < 0:
+                # Не успели к дедлайну: считаем и перестраиваем сетку от текущего момента
+                self.overruns += 1
+                self.overrun.observe(-delay * 1000)
+                deadline = now
+                delay = 0
+            await clock.sleep(delay)
+
+    def wake(self):
+        """Возобновляет опрос (например, при старте экстракции)."""
+        self._wake.set()
+
+    def stats(self):
+        return {
+            "rate_hz": self.rate,
+            "samples": self.samples,
+            "overruns": self.overruns,
+            "jitter_ms": self.jitter.snapshot(),
+            "overrun_ms": self.overrun.snapshot(),
+        }
@@ -0,0 +1,119 @@
+"""
+Авто-стоп экстракции по целевому выходу (targetYield профиля).
+
+Стоп решается в контуре управления (HardwareBase.record_sample, 50 Гц),
+без ожидания команды от клиента, и с упреждением. После команды вода течет
+еще время реакции L (клапан, помпа, обмен с контроллером), а после закрытия
+в чашку докапывает D. Стоп срабатывает, когда прогноз итога
+    yield + flowOut * L + D
+достигает target.
+
+L и D уточняются после каждого авто-стопа (EMA):
+  L — время от команды до подтверждения стопа драйвером;
+  D — итоговый перелив сверх потока за L.
+Перелив шота (итог - target) уходит в кривую шота и в гистограмму точности.
+"""
+import settings_manager
+from clock import SYSTEM_CLOCK
+from histogram import Histogram
+
+FLOW_ALPHA = 0.2  # EMA потока по сэмплам: сглаживает шум весов
+LEARN_ALPHA = 0.3  # Скорость подстройки L и D по завершенным шотам
+DEFAULT_LATENCY = 0.2  # с
+DEFAULT_DRIP = 1.0  # г
+
+# Перелив, г: отрицательный — недолив
+OVERSHOOT_BUCKETS_G = (-2, -1, -0.5, -0.25, 0, 0.25, 0.5, 1, 2, 5)
+# Время реакции на стоп, мс
+LATENCY_BUCKETS_MS = (50, 100, 200, 300, 500, 1000, 2000)
+
+
+class _Shot:
+    __slots__ = ("target", "flow", "last_yield", "stop_at", "stop_yield", "stop_flow")
+
+    def __init__(self, target):
+        self.target = target
+        self.flow = 0.0
+        self.last_yield = 0.0
+        self.stop_at = None  # monotonic команды авто-стопа
+        self.stop_yield = 0.0
+        self.stop_flow = 0.0
+
+
+class AutoStop:
+    def __init__(self, latency=None, drip=None, clock=SYSTEM_CLOCK):
+        config = settings_manager.get_setting("autostop") or {}
+        self.enabled = config.get("enabled", True)
+        self.latency = float(latency if latency is not None else config.get("latency", DEFAULT_LATENCY))
+        self.drip = float(drip if drip is not None else config.get("drip", DEFAULT_DRIP))
+        self.clock = clock
+        self.shots = {}  # side -> _Shot текущей экстракции с целью
+        self.stops = 0
+        self.last_overshoot = None
+        self.overshoot = Histogram(OVERSHOOT_BUCKETS_G)
+        self.stop_latency = Histogram(LATENCY_BUCKETS_MS)
+
+    def arm(self, side, target):
+        """Новая экстракция; target (г) не задан или <= 0 — без авто-стопа."""
+        try:
+            target = float(target)
+        except (TypeError, ValueError):
+            target = 0.0
+        if self.enabled and target > 0:
+            self.shots[side] = _Shot(target)
+        else:
+            self.shots.pop(side, None)
+
+    def predict(self, side):
+        """Прогноз итогового выхода, если остановить сейчас."""
+        shot = self.shots[side]
+        return shot.last_yield + shot.flow * self.latency + self.drip
+
+    def update(self, side, flow_out, yld):
+        """Сэмпл контура. True — пора останавливать (один раз за шот)."""
+        shot = self.shots.get(side)
+        if shot is None:
+            return False
+        shot.flow += FLOW_ALPHA * (flow_out - shot.flow)
+        shot.last_yield = yld
+        if shot.stop_at is not None:
+            return False
+        if yld + shot.flow * self.latency + self.drip < shot.target:
+            return False
+        shot.stop_at = self.clock()
+        shot.stop_yield = yld
+        shot.stop_flow = shot.flow
+        return True
+
+    def finish(self, side, final_yield=None):
+        """
+        Конец экстракции (подтвержден драйвером). final_yield — итог по весам,
+        None — последний сэмпл. Возвращает (target, overshoot) или (None, None).
+        """
+        shot = self.shots.pop(side, None)
+        if shot is None:
+            return None, None
+        final = shot.last_yield if final_yield is None else final_yield
+        overshoot = final - shot.target
+        if shot.stop_at is not None:
+            # Авто-стоп: измеряем реакцию и докап, подстраиваем модель
+            latency = self.clock() - shot.stop_at
+            drip = max(final - shot.stop_yield - shot.stop_flow * latency, 0.0)
+            self.latency += LEARN_ALPHA * (latency - self.latency)
+            self.drip += LEARN_ALPHA * (drip - self.drip)
+            self.stop_latency.observe(latency * 1000)
+            self.overshoot.observe(overshoot)
+            self.stops += 1
+            self.last_overshoot = overshoot
+        return shot.target, round(overshoot, 2)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "latency_s": round(self.latency, 3),
+            "drip_g": round(self.drip, 2),
+            "stops": self.stops,
+            "last_overshoot_g": round(self.last_overshoot, 2) if self.last_overshoot is not None else None,
+            "overshoot_g": self.overshoot.snapshot(),
+            "stop_latency_ms": self.stop_latency.snapshot(),
+        }
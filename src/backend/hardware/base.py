@@ -0,0 +1,195 @@
+import asyncio
+import settings_manager
+from hardware.acquisition import Window
+from hardware.autostop import AutoStop
+from hardware.profile import ProfileExecutor
+from hardware.recorder import ShotRecorder
+from clock import SYSTEM_CLOCK
+from timers import TimerHeap
+
+
+DEFAULT_GROUPS = ("left", "right")
+GROUP_NAME_SIZE = 8  # Имя группы в разделяемой памяти (hardware/shm.py) и в индексе шотов — 8s
+
+
+def check_groups(groups):
+    """
+    Имена групп: ASCII до GROUP_NAME_SIZE байт, без повторов, не "machine".
+    Длинное имя обрезалось бы в shm и в истории шотов и не совпадало бы с группой.
+    ValueError — имя не подходит.
+    """
+    groups = tuple(str(g) for g in groups)
+    for name in groups:
+        if not name or not name.isascii() or len(name) > GROUP_NAME_SIZE or name == "machine":
+            raise ValueError(f"bad group name {name!r}: need 1-{GROUP_NAME_SIZE} ASCII characters")
+    if len(set(groups)) != len(groups):
+        raise ValueError(f"duplicate group names: {list(groups)}")
+    return groups
+
+
+def configured_groups():
+    """Группы машины из конфига ({"groups": ["left", "center", "right"]}), по умолчанию две."""
+    return check_groups(settings_manager.get_setting("groups") or DEFAULT_GROUPS)
+
+
+class Group:
+    """Состояние группы. index — id группы: номер в конфиге, код на проводе и в бинарных топиках."""
+
+    __slots__ = ("side", "index", "state", "start_time", "profile", "last_frame", "timer")
+
+    def __init__(self, side, index, state):
+        self.side = side
+        self.index = index
+        self.state = state
+        self.start_time = 0
+        self.profile = None
+        self.last_frame = None
+        self.timer = None
+
+
+class HardwareBase:
+    """
+    Общий интерфейс железа для бэкенда.
+
+    Бэкенд использует только то, что объявлено здесь:
+      - groups / group() — группы из конфига (configured_groups), топик на группу;
+      - get_telemetry() -> {"machine": {...}, "left": {...}, "right": {...}}
+      - telemetry_updated — событие "есть новое состояние, опубликуй сразу";
+      - acquisition_loop() — фоновая задача сбора данных (запускается в lifespan);
+      - команды групп (start_extraction, stop_extraction, ...), см. control.COMMANDS;
+      - recorders / shot_listeners — запись шотов;
+      - windows — агрегаты сэмплов за окно публикации (см. hardware/acquisition.py);
+      - timers — переходы по времени (см. timers.py), run() крутит acquisition_loop;
+      - autostop — стоп по targetYield профиля из контура (см. hardware/autostop.py);
+      - executor — уставки профиля и отклонение от них (см. hardware/profile.py);
+      - clock — источник времени (clock.py), общий для таймеров, контура и авто-стопа;
+      - stats() — тайминг драйвера для /api/telemetry/clients.
+    """
+
+    # States
+    IDLE = "IDLE"
+    HEATING = "HEATING"
+    EXTRACTION = "EXTRACTION"
+    CLEANING = "CLEANING"
+    FLUSH = "FLUSH"
+    ERROR = "ERROR"
+    DONE = "DONE"
+    STOPPED = "STOPPED"
+
+    SIDES = DEFAULT_GROUPS
+    SENSOR_FIELDS = ShotRecorder.FIELDS[1:]  # Все поля сэмпла, кроме времени
+
+    def __init__(self, sides=None, clock=None):
+        self.telemetry_updated = asyncio.Event()
+        self.clock = clock or SYSTEM_CLOCK  # clock.py; VirtualClock — симуляция быстрее реального времени
+        self.SIDES = check_groups(sides) if sides else configured_groups()
+        self.groups = {side: Group(side, i, self.IDLE) for i, side in enumerate(self.SIDES)}
+        self.group_list = list(self.groups.values())  # Group по id
+        self.recorders = {side: ShotRecorder(side, on_complete=self._shot_complete, clock=self.clock.time) for side in self.groups}
+        self.shot_listeners = []  # callback(curve) для завершенных шотов
+        self.windows = {side: Window(self.SENSOR_FIELDS) for side in self.groups}
+        self.timers = TimerHeap(self.clock)
+        self.autostop = AutoStop(clock=self.clock)
+        self.executor = ProfileExecutor()
+
+    def group(self, key):
+        """Group по имени или id (int или строка с числом); None — нет такой группы."""
+        g = self.groups.get(key)
+        if g is None:
+            try:
+                i = int(key)
+            except (TypeError, ValueError):
+                return None
+            g = self.group_list[i] if 0 <= i < len(self.group_list) else None
+        return g
+
+    def _shot_complete(self, curve):
+        for listener in self.shot_listeners:
+            listener(curve)
+
+    def set_timer(self, side, delay, callback=None):
+        """
+        Таймер перехода группы: callback(side) через delay секунд.
+        У группы один таймер — новый переход (или delay=None) отменяет предыдущий.
+        """
+        g = self.groups[side]
+        if g.timer is not None:
+            g.timer.cancel()
+        g.timer = self.timers.call_later(delay, callback, side) if delay is not None else None
+
+    @staticmethod
+    def summary_timeout():
+        """Сколько держать Summary (DONE/STOPPED) до авто-IDLE, с. 0 — Summary отключен."""
+        return int(settings_manager.get_setting("summary_timeout", 15))
+
+    def begin_shot(self, side, profile):
+        """Начало экстракции: новый шот в рекордере, уставки и авто-стоп по профилю."""
+        profile = profile or {}
+        self.recorders[side].start(profile.get("id"))
+        self.executor.load(side, profile)
+        self.autostop.arm(side, profile.get("targetYield"))
+
+    def finish_shot(self, side, state, final_yield=None):
+        """Конец экстракции: перелив относительно цели — в шот, затем фиксация."""
+        rec = self.recorders[side]
+        rec.target_yield, rec.overshoot = self.autostop.finish(side, final_yield)
+        self.executor.unload(side)
+        rec.freeze(state)
+
+    def record_sample(self, side, elapsed, sensors):
+        """
+        Сэмпл экстракции: в рекордер шота (полная частота) и в окно публикации.
+        Здесь же, на частоте контура, сверка с уставками профиля и авто-стоп.
+        """
+        self.recorders[side].append(elapsed, *sensors)
+        self.windows[side].add(sensors)
+        self.executor.update(side, elapsed, sensors)
+        if self.autostop.update(side, sensors[3], sensors[4]):
+            self.auto_stop(side)
+
+    def auto_stop(self, side):
+        """Команда авто-стопа; конец шота драйвер подтверждает через finish_shot()."""
+        self.stop_extraction(side)
+
+    def stats(self):
+        """Тайминг драйвера для /api/telemetry/clients."""
+        return {"timers": self.timers.stats(), "autostop": self.autostop.stats()}
+
+    def extraction_frame(self, side, frame, window=None):
+        """Кадр экстракции + агрегаты окна и отклонение от уставок профиля (если есть)."""
+        live = self.executor.live(side)
+        if window is None and live is None:
+            return frame
+        frame = {**frame, **live} if live else dict(frame)
+        if window is not None:
+            frame["window"] = window
+        return frame
+
+    def idle_frame(self, state, active=False):
+        """Кадр группы без экстракции (IDLE, FLUSH, CLEANING, ...)."""
+        return {
+            "temp": 93.0, "pressure": 0.0, "flowIn": 0.0, "flowOut": 0.0,
+            "yield": 0.0, "time": "0:00", "done": False, "active": active,
+            "state": state
+        }
+
+    async def acquisition_loop(self):
+        raise NotImplementedError
+
+    async def get_telemetry(self):
+        raise NotImplementedError
+
+    def start_extraction(self, side, profile):
+        raise NotImplementedError
+
+    def stop_extraction(self, side):
+        raise NotImplementedError
+
+    def start_flush(self, side):
+        raise NotImplementedError
+
+    def start_cleaning(self, side):
+        raise NotImplementedError
+
+    def reset_group(self, side):
+        raise NotImplementedError
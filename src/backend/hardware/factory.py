@@ -0,0 +1,32 @@
+import logging
+
+
+def create_hardware(kind="mock", port="/dev/ttyAMA0", baudrate=115200, seed=None, speed=1.0,
+                    trace=None, autoplay=False):
+    """
+    Драйвер железа в текущем процессе: mock — симуляция, sim — mock с физической
+    моделью (seed — для воспроизводимых прогонов), replay — шоты из истории trace
+    (autoplay — группы запускают их сами), serial — контроллер на порту.
+    speed — ускорение времени симуляции (clock.Clock), для serial игнорируется.
+    """
+    if kind == "serial":
+        from hardware.serial_driver import SerialHardware
+        return SerialHardware(port, baudrate)
+    if kind not in ("mock", "sim", "replay"):
+        raise ValueError(f"unknown hardware: {kind}")
+    from clock import Clock
+    from hardware.base import configured_groups
+    from hardware.mock import MockHardware
+    clock = Clock(speed)
+    if kind == "replay":
+        from hardware.replay import ReplayHardware
+        if not trace:
+            raise ValueError("replay needs a trace directory")
+        return ReplayHardware(trace, clock=clock, autoplay=autoplay)
+    if kind == "sim":
+        from hardware import simulator
+        if simulator.np is not None:
+            sides = configured_groups()
+            return MockHardware(sides, simulator.MachineSimulator(len(sides), seed), clock, seed)
+        logging.warning("[HW] numpy not installed, sim falls back to the plain mock")
+    return MockHardware(clock=clock, seed=seed)
@@ -1,126 +1,293 @@
 import asyncio
-import time
+import math
 import random
-import settings_manager
-
-class MockHardware:
-    # States
-    IDLE = "IDLE"
-    HEATING = "HEATING"
-    EXTRACTION = "EXTRACTION"
-    CLEANING = "CLEANING"
-    FLUSH = "FLUSH"
-    ERROR = "ERROR"
-    DONE = "DONE"
-    STOPPED = "STOPPED"
-
-    def __init__(self):
-        self.telemetry_updated = asyncio.Event()
-        self.groups = {
-            "left": {"state": self.IDLE, "start_time": 0, "profile": None, "last_frame": None},
-            "right": {"state": self.IDLE, "start_time": 0, "profile": None, "last_frame": None}
-        }
+from hardware.base import HardwareBase
+from hardware.acquisition import AcquisitionScheduler
+
+
+def read_sensors(elapsed, rng=random):
+    """Показания датчиков экстракции без профиля: (temp, pressure, flowIn, flowOut, yield)"""
+    return (
+        93.0 + rng.uniform(-0.1, 0.1),
+        9.0 if elapsed > 2 else elapsed * 4.5,
+        2.5,
+        2.2,
+        elapsed * 2.2,
+    )
+
+
+class MockHardware(HardwareBase):
+    """
+    Симуляция кофемашины для разработки без контроллера.
+
+    Переходы по времени (конец экстракции, выход из Summary) планируются
+    таймерами при входе в состояние, сэмплы снимает контур tick() — и только
+    пока есть экстракция. Состояние идет вперед и без подключенных клиентов;
+    get_telemetry() только читает.
+
+    С профилем (points) группа ведет себя как инерционный объект, который
+    контур тянет к уставкам профиля; без профиля — фиксированная кривая _read_sensors().
+    С simulator (hardware/simulator.py) показания дает физическая модель,
+    все группы шагают одним векторным шагом.
+
+    Время — из clock (clock.py). С VirtualClock run_for() прогоняет контур
+    и таймеры без event loop: шот за миллисекунды, при одном seed — один результат.
+    """
+
+    EXTRACTION_TIME = 30.0  # Длительность симулированной экстракции без targetYield, с
+    SIM_STOP_LATENCY = 0.15  # Симулированная реакция клапана на стоп, с
+    SIM_DRIP = 1.2  # Симулированный докап после закрытия клапана, г
+    # Постоянные времени отклика на уставку, с: temp, pressure, flowIn, flowOut
+    SIM_TAU = (3.0, 0.6, 0.4, 0.8)
+
+    def __init__(self, sides=None, simulator=None, clock=None, seed=None):
+        super().__init__(sides, clock)
+        self.scheduler = AcquisitionScheduler(self.tick, active=self._sampling, clock=self.clock)
+        self.rng = random.Random(seed)
+        self.plant = {side: None for side in self.groups}  # [temp, pressure, flowIn, flowOut, yield, t]
+        self.sim = simulator
+        if simulator is not None:
+            from hardware.simulator import np, DEFAULT_SETPOINT
+            self.default_setpoint = DEFAULT_SETPOINT
+            self.setpoints = np.tile(DEFAULT_SETPOINT, (len(self.groups), 1))
+            self.last_readings = simulator.readings()
+
+    def _read_sensors(self, elapsed):
+        return read_sensors(elapsed, self.rng)
+
+    def _sampling(self):
+        return any(g.state == self.EXTRACTION for g in self.groups.values())
+
+    def _follow(self, side, elapsed, setpoint):
+        """Шаг инерционной модели группы к уставкам (temp, press, flowIn, flowOut, energy)."""
+        plant = self.plant[side]
+        dt = max(elapsed - plant[5], 0.0)
+        for i, tau in enumerate(self.SIM_TAU):
+            plant[i] += (setpoint[i] - plant[i]) * (1.0 - math.exp(-dt / tau))
+        plant[4] += plant[3] * dt
+        plant[5] = elapsed
+        return (plant[0] + self.rng.uniform(-0.1, 0.1), plant[1], plant[2], plant[3], plant[4])
+
+    def tick(self):
+        """Шаг контура (частота ACQUISITION_RATE): сэмплы групп в экстракции."""
+        now = self.clock.time()
+        if self.sim is not None:
+            self._tick_sim(now)
+            return
+        for g in self.group_list:
+            if g.state == self.EXTRACTION:
+                side = g.side
+                elapsed = now - g.start_time
+                setpoint = self.executor.setpoint(side, elapsed)
+                if setpoint is None:
+                    sensors = self._read_sensors(elapsed)
+                else:
+                    sensors = self._follow(side, elapsed, setpoint)
+                self.record_sample(side, elapsed, sensors)
+
+    def _tick_sim(self, now):
+        """Один векторный шаг модели для всех групп, затем сэмплы групп в экстракции."""
+        setpoints = self.setpoints
+        active = []
+        for g in self.group_list:
+            if g.state == self.EXTRACTION:
+                elapsed = now - g.start_time
+                setpoint = self.executor.setpoint(g.side, elapsed)
+                if setpoint is not None:
+                    setpoints[g.index] = setpoint
+                active.append((g, elapsed))
+        self.sim.step(setpoints)
+        readings = self.last_readings = self.sim.readings()
+        for g, elapsed in active:
+            self.record_sample(g.side, elapsed, tuple(readings[g.index].tolist()))
+
+    def _current(self, side, elapsed):
+        """Показания группы для кадра, если за окно публикации не было сэмплов."""
+        if self.sim is not None:
+            return self.last_readings[self.groups[side].index].tolist()
+        if self.executor.profiles.get(side):
+            return self.plant[side][:5]
+        return self._read_sensors(elapsed)
+
+    def _stop_flow(self, side):
+        """Поток через группу прекращен. Итог шота с докапом; None — итог по последнему сэмплу."""
+        if self.sim is not None:
+            i = self.groups[side].index
+            self.setpoints[i] = self.default_setpoint
+            return self.sim.stop(i)
+        return None
+
+    # --- Переходы по таймерам ---
+
+    def _finish_extraction(self, side, final_yield=None):
+        g = self.groups[side]
+        if g.state == self.EXTRACTION:
+            g.state = self.DONE
+            g.start_time = self.clock.time() # Таймер для выхода из DONE
+            stopped = self._stop_flow(side)
+            if final_yield is None:
+                final_yield = stopped
+            if final_yield is not None and g.last_frame:
+                g.last_frame = {**g.last_frame, "yield": round(final_yield, 1)}
+            self.finish_shot(side, self.DONE, final_yield)
+            self._enter_summary(side)
+
+    def auto_stop(self, side):
+        # Клапан закрывается не сразу: поток идет еще SIM_STOP_LATENCY
+        self.set_timer(side, self.SIM_STOP_LATENCY, self._valve_closed)
+
+    def _valve_closed(self, side):
+        g = self.groups[side]
+        if g.state == self.EXTRACTION:
+            if self.sim is not None:
+                self._finish_extraction(side)  # Докап считает модель
+                return
+            plant = self.plant[side]
+            yld = plant[4] if self.executor.profiles.get(side) else self._read_sensors(self.clock.time() - g.start_time)[4]
+            self._finish_extraction(side, yld + self.SIM_DRIP * self.rng.uniform(0.8, 1.2))
+
+    def _enter_summary(self, side):
+        # Авто-уход в IDLE (защита бэкенда); timeout == 0 — Summary отключен (сразу в IDLE)
+        self.set_timer(side, self.summary_timeout(), self._exit_summary)
+        self.telemetry_updated.set()
+
+    def _exit_summary(self, side):
+        g = self.groups[side]
+        if g.state in (self.DONE, self.STOPPED):
+            g.state = self.IDLE
+            g.timer = None
+            self.telemetry_updated.set()
+
+    async def acquisition_loop(self):
+        await asyncio.gather(self.scheduler.run(), self.timers.run())
+
+    def run_for(self, seconds):
+        """
+        Прогон на seconds виртуального времени вместо acquisition_loop():
+        часы прыгают к ближайшему событию — таймеру или тику контура,
+        таймеры срабатывают точно в срок, как в реальном цикле. Только для VirtualClock.
+        """
+        clock = self.clock
+        if not hasattr(clock, "advance_to"):
+            raise RuntimeError("run_for() needs a VirtualClock")
+        start = clock()
+        end = start + seconds
+        dt = 1.0 / self.scheduler.rate
+        k = 1
+        while True:
+            next_tick = start + k * dt
+            deadline = self.timers.next_deadline()
+            when = next_tick if deadline is None else min(deadline, next_tick)
+            if when > end:
+                break
+            clock.advance_to(when)
+            self.timers.run_due()
+            if when == next_tick:
+                k += 1
+                if self._sampling():
+                    self.tick()
+                    self.scheduler.samples += 1
+        clock.advance_to(end)
+        self.timers.run_due()
+
+    def stats(self):
+        return {**super().stats(), "acquisition": self.scheduler.stats()}
 
     async def get_telemetry(self):
         res = {
-            "machine": {
+            "machine": self.sim.machine() if self.sim is not None else {
                 "boiler_temp": 95.5,
                 "steam_pressure": 1.2,
                 "water_level": "ok"
             }
         }
-        for side in ["left", "right"]:
-            g = self.groups[side]
-            state = g["state"]
+        for side, g in self.groups.items():
+            state = g.state
 
             if state == self.IDLE:
-                res[side] = {
-                    "temp": 93.0, "pressure": 0.0, "flowIn": 0.0, "flowOut": 0.0,
-                    "yield": 0.0, "time": "0:00", "done": False, "active": False,
-                    "state": self.IDLE
-                }
+                res[side] = self.idle_frame(self.IDLE)
             elif state in [self.DONE, self.STOPPED]:
                 # Возвращаем последний зафиксированный кадр экстракции
-                if g["last_frame"]:
-                    res[side] = {**g["last_frame"], "state": state, "active": False}
+                if g.last_frame:
+                    res[side] = {**g.last_frame, "state": state, "active": False, "done": state == self.DONE}
                 else:
-                    res[side] = {
-                        "temp": 93.0, "pressure": 0.0, "flowIn": 0.0, "flowOut": 0.0,
-                        "yield": 0.0, "time": "0:00", "done": False, "active": False,
-                        "state": state
-                    }
-
-                # Авто-уход в IDLE (защита бэкенда)
-                settings = settings_manager.get_settings()
-                timeout = int(settings.get("summary_timeout", 15))
-
-                # Если timeout == 0, значит Summary отключен (сразу в IDLE)
-                # Иначе ждем указанное время
-                if timeout == 0 or (time.time() - g["start_time"] > timeout):
-                    g["state"] = self.IDLE
+                    res[side] = self.idle_frame(state)
             elif state == self.EXTRACTION:
-                elapsed = time.time() - g["start_time"]
-                done = elapsed > 30
+                elapsed = self.clock.time() - g.start_time
+                window = self.windows[side].take()
+                if window:
+                    (temp, pressure, flow_in, flow_out, yld), stats = window
+                else:
+                    temp, pressure, flow_in, flow_out, yld = self._current(side, elapsed)
 
                 frame = {
-                    "temp": round(93.0 + random.uniform(-0.1, 0.1), 1),
-                    "pressure": round(9.0 if elapsed > 2 else elapsed * 4.5, 1),
-                    "flowIn": 2.5,
-                    "flowOut": 2.2,
-                    "yield": round(elapsed * 2.2, 1),
+                    "temp": round(temp, 1),
+                    "pressure": round(pressure, 1),
+                    "flowIn": round(flow_in, 2),
+                    "flowOut": round(flow_out, 2),
+                    "yield": round(yld, 1),
                     "time": f"{int(elapsed // 60)}:{int(elapsed % 60):02d}",
-                    "done": done,
+                    "done": False,
                     "active": True,
                     "state": self.EXTRACTION
                 }
-                res[side] = frame
-                g["last_frame"] = frame # Сохраняем для Summary
-
-                if done:
-                    g["state"] = self.DONE
-                    g["start_time"] = time.time() # Таймер для выхода из DONE
+                g.last_frame = frame # Сохраняем для Summary
+                res[side] = self.extraction_frame(side, frame, stats if window else None)
             else:
                 # Другие состояния (HEATING, CLEANING, и т.д.)
-                res[side] = {
-                    "temp": 93.0, "pressure": 0.0, "flowIn": 0.0, "flowOut": 0.0,
-                    "yield": 0.0, "time": "0:00", "done": False, "active": True,
-                    "state": state
-                }
+                res[side] = self.idle_frame(state, active=True)
         return res
 
     def start_extraction(self, side, profile):
-        if side in self.groups and self.groups[side]["state"] == self.IDLE:
-            self.groups[side]["state"] = self.EXTRACTION
-            self.groups[side]["start_time"] = time.time()
-            self.groups[side]["profile"] = profile
+        if side in self.groups and self.groups[side].state == self.IDLE:
+            # Сначала шот: если профиль не принят, группа остается в IDLE
+            self.begin_shot(side, profile)
+            if self.sim is not None:
+                if not self._sampling():
+                    self.sim.settle()  # Модель стояла вместе с контуром
+                self.sim.start(self.groups[side].index)
+            self.groups[side].state = self.EXTRACTION
+            self.groups[side].start_time = self.clock.time()
+            self.groups[side].profile = profile
+            compiled = self.executor.profiles.get(side)
+            self.plant[side] = [93.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            # Без авто-стопа экстракция кончается вместе с профилем
+            self.set_timer(side, compiled.duration if compiled else self.EXTRACTION_TIME, self._finish_extraction)
+            self.scheduler.wake()
             self.telemetry_updated.set()
 
     def stop_extraction(self, side):
         if side in self.groups:
-            current_state = self.groups[side]["state"]
+            current_state = self.groups[side].state
             if current_state == self.EXTRACTION:
-                self.groups[side]["state"] = self.STOPPED
-                self.groups[side]["start_time"] = time.time()
-                self.telemetry_updated.set()
+                self.groups[side].state = self.STOPPED
+                self.groups[side].start_time = self.clock.time()
+                self.finish_shot(side, self.STOPPED, self._stop_flow(side))
+                self._enter_summary(side)
             elif current_state in [self.FLUSH, self.CLEANING]:
-                self.groups[side]["state"] = self.IDLE
-                self.groups[side]["last_frame"] = None
+                self.groups[side].state = self.IDLE
+                self.groups[side].last_frame = None
+                self.set_timer(side, None)
                 self.telemetry_updated.set()
 
     def start_flush(self, side):
-        if side in self.groups and self.groups[side]["state"] == self.IDLE:
-            self.groups[side]["state"] = self.FLUSH
-            self.groups[side]["start_time"] = time.time()
+        if side in self.groups and self.groups[side].state == self.IDLE:
+            self.groups[side].state = self.FLUSH
+            self.groups[side].start_time = self.clock.time()
             self.telemetry_updated.set()
 
     def start_cleaning(self, side):
-        if side in self.groups and self.groups[side]["state"] == self.IDLE:
-            self.groups[side]["state"] = self.CLEANING
-            self.groups[side]["start_time"] = time.time()
+        if side in self.groups and self.groups[side].state == self.IDLE:
+            self.groups[side].state = self.CLEANING
+            self.groups[side].start_time = self.clock.time()
             self.telemetry_updated.set()
 
     def reset_group(self, side):
         if side in self.groups:
-            self.groups[side]["state"] = self.IDLE
-            self.groups[side]["last_frame"] = None
+            if self.groups[side].state == self.EXTRACTION:
+                # Шот прерван сбросом: фиксируем как остановленный (и сохраняем)
+                self.finish_shot(side, self.STOPPED, self._stop_flow(side))
+            self.groups[side].state = self.IDLE
+            self.groups[side].last_frame = None
+            self.set_timer(side, None)
             self.telemetry_updated.set()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Процесс железа: драйвер (mock/serial), контур управления и таймеры вне процесса uvicorn.
+
+Паузы GC и медленные запросы бэкенда не влияют на тайминг контура, а бэкендов
+может быть несколько. Последние кадры топиков и рекордеры шотов процесс пишет
+в разделяемую память (hardware/shm.py) — бэкенд и локальные сервисы читают их
+оттуда напрямую. По unix-сокету ходят только редкие сообщения (JSON-строки):
+  клиент -> железо: {"type": "call", "method": "start_extraction", "args": ["left", {...}]}
+  железо -> клиент: {"type": "updated"} — состояние изменилось, опубликуй сразу;
+                    {"type": "stats", ...} — тайминг контура, раз в STATS_INTERVAL.
+Завершенные шоты процесс железа сохраняет сам (единственный писатель ShotStore).
+
+Запуск отдельным сервисом (бэкенд подключится к сокету):
+    python3 -m hardware.process --kind mock --shots /data/shots
+Без сервиса процесс запускает сам бэкенд (ProcessHardware, spawn=True).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+import control
+from hardware.base import HardwareBase
+from hardware.factory import create_hardware
+from hardware.shm import DEFAULT_PATH, RecorderView, SharedRecorder, SharedState
+
+DEFAULT_SOCKET = "/run/headunit/hardware.sock" if os.path.isdir("/run/headunit") else "/tmp/headunit-hardware.sock"
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EXPORT_INTERVAL = 0.02  # Кадры в разделяемую память с частотой контура (50 Гц)
+STATS_INTERVAL = 5.0
+
+# Методы железа, доступные клиентам сокета
+ALLOWED_METHODS = {method for method, _ in control.COMMANDS.values()}
+
+
+# --- Сторона процесса железа ---
+
+
+class HardwareServer:
+    def __init__(self, hw, shared, socket_path, store=None):
+        self.hw = hw
+        self.shared = shared
+        self.socket_path = socket_path
+        self.store = store
+        self.clients = set()
+        self.exports = 0
+
+    def broadcast(self, message):
+        line = (json.dumps(message) + "\n").encode()
+        for writer in list(self.clients):
+            try:
+                writer.write(line)
+            except (ConnectionError, RuntimeError):
+                self.clients.discard(writer)
+
+    async def _client(self, reader, writer):
+        self.clients.add(writer)
+        try:
+            async for line in reader:
+                try:
+                    msg = json.loads(line)
+                    if msg.get("type") == "call" and msg.get("method") in ALLOWED_METHODS:
+                        getattr(self.hw, msg["method"])(*msg.get("args", []))
+                except Exception as e:
+                    logging.error(f"[HW-PROC] Bad message {line[:100]!r}: {e}")
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def _export_loop(self):
+        hw = self.hw
+        while True:
+            updated = hw.telemetry_updated.is_set()
+            hw.telemetry_updated.clear()
+            self.shared.write_frames(await hw.get_telemetry())
+            self.exports += 1
+            if updated:
+                self.broadcast({"type": "updated"})
+            try:
+                await asyncio.wait_for(hw.telemetry_updated.wait(), timeout=EXPORT_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _stats_loop(self):
+        while True:
+            await asyncio.sleep(STATS_INTERVAL)
+            self.broadcast({"type": "stats", **self.hw.stats(), "exports": self.exports})
+
+    def _save_shot(self, curve):
+        try:
+            shot_id = self.store.append(curve)
+            logging.info(f"[SHOTS] Saved shot {shot_id} ({curve['side']}, {curve['samples']} samples)")
+        except Exception as e:
+            logging.error(f"[SHOTS] Failed to save shot: {e}")
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        if self.store is not None:
+            self.hw.shot_listeners.append(lambda curve: loop.run_in_executor(None, self._save_shot, curve))
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._client, path=self.socket_path)
+        logging.info(f"[HW-PROC] Serving {self.socket_path}, state in {self.shared.path}")
+        tasks = [
+            asyncio.create_task(self.hw.acquisition_loop()),
+            asyncio.create_task(self._export_loop()),
+            asyncio.create_task(self._stats_loop()),
+        ]
+        try:
+            async with server:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def _already_running(socket_path):
+    try:
+        _, writer = await asyncio.open_unix_connection(socket_path)
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HeadUnit hardware process")
+    parser.add_argument("--kind", default="mock", help="mock | sim | replay | serial")
+    parser.add_argument("--seed", type=int, default=None, help="Simulator seed (kind=sim)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Simulated time speed-up (mock/sim)")
+    parser.add_argument("--trace", default=None, help="Shot history to replay (kind=replay)")
+    parser.add_argument("--autoplay", action="store_true", help="Replay shots without commands (kind=replay)")
+    parser.add_argument("--port", default="/dev/ttyAMA0", help="Serial port (kind=serial)")
+    parser.add_argument("--baud", type=int, default=115200, help="Serial baudrate")
+    parser.add_argument("--shm", default=DEFAULT_PATH, help="Shared state file")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Control socket")
+    parser.add_argument("--shots", default=None, help="Shot history directory (saving disabled if omitted)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if asyncio.run(_already_running(args.socket)):
+        logging.info(f"[HW-PROC] Already running on {args.socket}")
+        return
+
+    hw = create_hardware(args.kind, args.port, args.baud, args.seed, args.speed, args.trace, args.autoplay)
+    shared = SharedState(args.shm, hw.SIDES, create=True)
+    hw.recorders = {side: SharedRecorder(side, shared, on_complete=hw._shot_complete, clock=hw.clock.time) for side in hw.groups}
+    store = None
+    if args.shots and args.kind == "replay":
+        logging.info("[HW-PROC] Replayed shots are not saved")
+    elif args.shots:
+        from shots.store import ShotStore
+        store = ShotStore(args.shots)
+
+    try:
+        asyncio.run(HardwareServer(hw, shared, args.socket, store).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+# --- Сторона бэкенда ---
+
+
+class ProcessHardware(HardwareBase):
+    """
+    Железо в отдельном процессе. Состояние читается из разделяемой памяти
+    на каждом тике публикации (без обмена сообщениями), команды уходят в сокет.
+    spawn=True — если процесс железа не запущен, бэкенд запускает его сам.
+    """
+
+    RECONNECT_DELAY = 0.5
+
+    def __init__(self, kind="mock", shm_path=DEFAULT_PATH, socket_path=DEFAULT_SOCKET,
+                 spawn=True, shots_dir=None, port="/dev/ttyAMA0", baudrate=115200, seed=None, speed=1.0,
+                 trace=None, autoplay=False):
+        super().__init__()
+        self.kind = kind
+        self.shm_path = shm_path
+        self.socket_path = socket_path
+        self.spawn = spawn
+        self.shots_dir = shots_dir
+        self.port = port
+        self.baudrate = baudrate
+        self.seed = seed
+        self.speed = speed
+        self.trace = trace
+        self.autoplay = autoplay
+        self.shared = None
+        self.recorders = {}
+        self.child_stats = {}
+        self.connected = False
+        self._writer = None
+        self._proc = None
+        self._consumed = {side: (0, 0) for side in self.groups}  # (shot_id, total) — уже в окнах
+
+    async def _spawn(self):
+        if self._proc is not None and self._proc.returncode is None:
+            return
+        cmd = [
+            sys.executable, "-m", "hardware.process", "--kind", self.kind,
+            "--port", self.port, "--baud", str(self.baudrate),
+            "--shm", self.shm_path, "--socket", self.socket_path,
+        ]
+        if self.shots_dir:
+            cmd += ["--shots", self.shots_dir]
+        if self.seed is not None:
+            cmd += ["--seed", str(self.seed)]
+        if self.speed != 1.0:
+            cmd += ["--speed", str(self.speed)]
+        if self.trace:
+            cmd += ["--trace", self.trace]
+        if self.autoplay:
+            cmd += ["--autoplay"]
+        self._proc = await asyncio.create_subprocess_exec(*cmd, cwd=BACKEND_DIR)
+        logging.info(f"[HW-PROC] Started hardware process pid={self._proc.pid}")
+
+    def _attach(self):
+        if self.shared is not None:
+            self.shared.close()
+        self.shared = SharedState(self.shm_path)
+        self.recorders = {side: RecorderView(side, self.shared) for side in self.shared.sides if side in self.groups}
+        self._consumed = {side: (0, 0) for side in self.groups}
+
+    async def acquisition_loop(self):
+        try:
+            while True:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(self.socket_path)
+                except OSError:
+                    if self.spawn:
+                        await self._spawn()
+                    await asyncio.sleep(self.RECONNECT_DELAY)
+                    continue
+
+                try:
+                    self._attach()
+                    self._writer = writer
+                    self.connected = True
+                    self.telemetry_updated.set()
+                    logging.info(f"[HW-PROC] Connected to {self.socket_path}")
+                    async for line in reader:
+                        self._on_message(json.loads(line))
+                except (OSError, ValueError) as e:
+                    logging.warning(f"[HW-PROC] Connection error: {e}")
+                finally:
+                    self.connected = False
+                    self._writer = None
+                    writer.close()
+                logging.warning("[HW-PROC] Lost hardware process, reconnecting")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+        finally:
+            if self._proc is not None and self._proc.returncode is None:
+                self._proc.terminate()
+                await self._proc.wait()
+
+    def _on_message(self, msg):
+        kind = msg.pop("type", None)
+        if kind == "updated":
+            self.telemetry_updated.set()
+        elif kind == "stats":
+            self.child_stats = msg
+
+    def _window(self, side):
+        """Окно публикации по сэмплам рекордера, появившимся с прошлого вызова."""
+        rec = self.recorders.get(side)
+        if rec is None or not rec.refresh():
+            return None
+        shot_id, total = self._consumed[side]
+        new = rec.total - (total if shot_id == rec.shot_id else 0)
+        self._consumed[side] = (rec.shot_id, rec.total)
+        window = self.windows[side]
+        for sample in rec.recent(new):
+            window.add(sample)
+        taken = window.take()
+        return taken[1] if taken else None
+
+    async def get_telemetry(self):
+        frames = self.shared.read_frames() if self.shared is not None else {}
+        for side, g in self.groups.items():
+            frame = frames.get(side)
+            if frame is None:
+                frames[side] = self.idle_frame(self.IDLE)
+                continue
+            prev, g.state = g.state, frame["state"]
+            if frame["state"] == self.EXTRACTION:
+                window = self._window(side)
+                rec = self.recorders.get(side)
+                if rec is not None and rec.count:
+                    # Отклонение от уставок — по последнему сэмплу рекордера
+                    i = (rec.head - 1) % rec.capacity
+                    self.executor.update(side, rec.columns[0][i], tuple(col[i] for col in rec.columns[1:]))
+                frames[side] = self.extraction_frame(side, frame, window)
+            elif prev == self.EXTRACTION:
+                # Уставки снимаем только по концу шота: сразу после команды start
+                # память еще показывает IDLE, а профиль уже загружен
+                self.executor.unload(side)
+        frames.setdefault("machine", {"boiler_temp": 0.0, "steam_pressure": 0.0, "water_level": "ok"})
+        return frames
+
+    def stats(self):
+        return {
+            **self.child_stats,
+            "process": {
+                "connected": self.connected,
+                "pid": self._proc.pid if self._proc is not None else None,
+            },
+        }
+
+    # --- Команды ---
+
+    def _call(self, method, *args):
+        if self._writer is None:
+            logging.warning(f"[HW-PROC] Hardware process offline, dropping {method}")
+            return
+        self._writer.write((json.dumps({"type": "call", "method": method, "args": list(args)}) + "\n").encode())
+
+    def start_extraction(self, side, profile):
+        # Уставки нужны и здесь: отклонение считается при чтении кадра
+        if side in self.groups and self.groups[side].state == self.IDLE:
+            self.executor.load(side, profile)
+        self._call("start_extraction", side, profile)
+
+    def stop_extraction(self, side):
+        self._call("stop_extraction", side)
+
+    def start_flush(self, side):
+        self._call("start_flush", side)
+
+    def start_cleaning(self, side):
+        self._call("start_cleaning", side)
+
+    def reset_group(self, side):
+        self._call("reset_group", side)
+
+
+if __name__ == "__main__":
+    main()
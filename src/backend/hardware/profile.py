@@ -0,0 +1,118 @@
+"""
+Исполнение профилей экстракции на бэкенде.
+
+Профиль — список точек {t, temp, press, flowIn, flowOut, energy}
+(как в src/frontend/src/constants/profiles.js). При старте экстракции
+он один раз компилируется в плотные таблицы уставок с шагом контура
+(1 / ACQUISITION_RATE). В тике уставка берется по индексу int(elapsed * rate),
+без поиска сегмента и интерполяции. После конца профиля держится последняя точка.
+
+ProfileExecutor сравнивает сэмплы с уставками и отдает живое отклонение
+(факт - уставка) в кадр телеметрии.
+"""
+import logging
+from array import array
+
+from hardware.acquisition import ACQUISITION_RATE
+
+SETPOINT_FIELDS = ("temp", "press", "flowIn", "flowOut", "energy")
+# Уставка -> индекс поля в сэмпле датчиков (HardwareBase.SENSOR_FIELDS) и имя в кадре
+TRACKED = ((0, 0, "temp"), (1, 1, "pressure"), (2, 2, "flowIn"), (3, 3, "flowOut"))
+MAX_DURATION = 600  # с: защита от профиля, который съест память
+
+
+class CompiledProfile:
+    __slots__ = ("profile_id", "rate", "duration", "size", "columns")
+
+    def __init__(self, points, rate=ACQUISITION_RATE, profile_id=None):
+        points = sorted(
+            ({f: float(p.get(f, 0.0)) for f in ("t",) + SETPOINT_FIELDS} for p in points),
+            key=lambda p: p["t"],
+        )
+        if not points:
+            raise ValueError("profile has no points")
+        self.profile_id = profile_id
+        self.rate = rate
+        self.duration = max(points[-1]["t"], 0.0)
+        if self.duration > MAX_DURATION:
+            raise ValueError(f"profile is longer than {MAX_DURATION} s")
+        self.size = int(self.duration * rate) + 1
+        self.columns = [array("d", bytes(8 * self.size)) for _ in SETPOINT_FIELDS]
+
+        seg = 0
+        last = len(points) - 1
+        for i in range(self.size):
+            t = i / rate
+            while seg < last - 1 and points[seg + 1]["t"] <= t:
+                seg += 1
+            p0 = points[seg]
+            p1 = points[min(seg + 1, last)]
+            span = p1["t"] - p0["t"]
+            k = min(max((t - p0["t"]) / span, 0.0), 1.0) if span > 0 else 1.0
+            for col, f in zip(self.columns, SETPOINT_FIELDS):
+                col[i] = p0[f] + (p1[f] - p0[f]) * k
+
+    def index(self, elapsed):
+        i = int(elapsed * self.rate)
+        return i if 0 <= i < self.size else (0 if i < 0 else self.size - 1)
+
+    def setpoint(self, elapsed):
+        """Уставки (temp, press, flowIn, flowOut, energy) на момент elapsed."""
+        i = self.index(elapsed)
+        return tuple(col[i] for col in self.columns)
+
+
+def compile_profile(profile, rate=ACQUISITION_RATE):
+    """CompiledProfile по dict профиля или None (нет точек / битые точки)."""
+    points = (profile or {}).get("points")
+    if not points:
+        return None
+    try:
+        return CompiledProfile(points, rate, profile.get("id"))
+    except (TypeError, ValueError, AttributeError) as e:
+        logging.warning(f"[PROFILE] Cannot compile profile {profile.get('id')}: {e}")
+        return None
+
+
+class ProfileExecutor:
+    """Уставки и отклонения по группам; профиль загружается на время экстракции."""
+
+    def __init__(self, rate=ACQUISITION_RATE):
+        self.rate = rate
+        self.profiles = {}  # side -> CompiledProfile
+        self.last = {}  # side -> (setpoint, sensors) последнего сэмпла
+
+    def load(self, side, profile):
+        compiled = compile_profile(profile, self.rate)
+        if compiled is None:
+            self.unload(side)
+        else:
+            self.profiles[side] = compiled
+            self.last.pop(side, None)
+        return compiled
+
+    def unload(self, side):
+        self.profiles.pop(side, None)
+        self.last.pop(side, None)
+
+    def setpoint(self, side, elapsed):
+        compiled = self.profiles.get(side)
+        return compiled.setpoint(elapsed) if compiled is not None else None
+
+    def update(self, side, elapsed, sensors):
+        """Сэмпл контура: запоминает пару уставка/факт. Возвращает уставку или None."""
+        sp = self.setpoint(side, elapsed)
+        if sp is not None:
+            self.last[side] = (sp, sensors)
+        return sp
+
+    def live(self, side):
+        """{"target": {...}, "deviation": {...}} по последнему сэмплу или None."""
+        last = self.last.get(side)
+        if last is None:
+            return None
+        sp, sensors = last
+        return {
+            "target": {name: round(sp[i], 2) for i, _, name in TRACKED},
+            "deviation": {name: round(sensors[j] - sp[i], 2) for i, j, name in TRACKED},
+        }
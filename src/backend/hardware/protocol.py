@@ -0,0 +1,146 @@
+"""
+Протокол последовательного порта контроллера кофемашины.
+
+Кадр (little-endian):
+    A5 5A | type:u8 | len:u8 | payload[len] | crc:u16
+
+CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) по type, len и payload.
+Считается binascii.crc_hqx — табличная реализация в C, принимает memoryview
+без копирования.
+
+Контроллер -> бэкенд: GROUP (сэмпл группы), MACHINE (общие датчики).
+Бэкенд -> контроллер: COMMAND.
+"""
+import struct
+from binascii import crc_hqx
+
+SYNC = b"\xa5\x5a"
+HEADER = struct.Struct("<2sBB")  # sync, type, len
+CRC = struct.Struct("<H")
+CRC_INIT = 0xFFFF
+MAX_PAYLOAD = 64
+
+FRAME_GROUP = 0x01
+FRAME_MACHINE = 0x02
+FRAME_COMMAND = 0x10
+
+# Порядок важен: индекс = код на проводе.
+# Группы — по умолчанию; на машине код группы = ее номер в конфиге "groups" (Group.index)
+GROUPS = ("left", "right")
+STATES = ("IDLE", "HEATING", "EXTRACTION", "CLEANING", "FLUSH", "ERROR", "DONE", "STOPPED")
+WATER_LEVELS = ("ok", "low", "empty")
+COMMANDS = ("start", "stop", "flush", "cleaning", "reset")
+
+
+def profile_code(profile_id):
+    """id профиля для полей i32 (кадр COMMAND, shm, индекс шотов); не целое или вне i32 — -1."""
+    if isinstance(profile_id, int) and not isinstance(profile_id, bool) and -2**31 <= profile_id < 2**31:
+        return profile_id
+    return -1
+
+
+def parse_time(value):
+    """Поле кадра "time" ('m:ss') -> секунды; 0 — нет или не разобрать."""
+    try:
+        minutes, seconds = value.split(":")
+        return int(minutes) * 60 + int(seconds)
+    except (AttributeError, ValueError):
+        return 0
+
+LAYOUTS = {
+    # group, state, t_ms (от начала экстракции), temp, pressure, flowIn, flowOut, yield
+    FRAME_GROUP: struct.Struct("<BBIfffff"),
+    # boiler_temp, steam_pressure, water_level
+    FRAME_MACHINE: struct.Struct("<ffB"),
+    # group, command, profile_id (-1 — без профиля)
+    FRAME_COMMAND: struct.Struct("<BBi"),
+}
+
+
+def encode(frame_type, *values):
+    """Собирает кадр типа frame_type из значений его раскладки."""
+    payload = LAYOUTS[frame_type].pack(*values)
+    body = bytes((frame_type, len(payload))) + payload
+    return SYNC + body + CRC.pack(crc_hqx(body, CRC_INIT))
+
+
+class FrameParser:
+    """
+    Потоковый разбор кадров из произвольно нарезанных чанков.
+
+    Данные копятся в одном bytearray; кадры разбираются struct.unpack_from
+    прямо из буфера, CRC считается по memoryview — без промежуточных bytes.
+    Разобранный префикс удаляется из буфера один раз за feed().
+    При ошибке CRC или мусоре парсер ищет следующий SYNC.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.frames = 0
+        self.crc_errors = 0
+        self.unknown = 0
+        self.dropped_bytes = 0
+
+    def feed(self, data):
+        """Добавляет данные и возвращает список (type, values) полных кадров."""
+        buf = self.buffer
+        buf += data
+        out = []
+        end = len(buf)
+        pos = 0
+        view = memoryview(buf)
+        try:
+            while True:
+                start = buf.find(SYNC, pos)
+                if start < 0:
+                    # Последний байт может оказаться началом SYNC
+                    keep = end - 1 if end > pos and buf[-1] == SYNC[0] else end
+                    self.dropped_bytes += keep - pos
+                    pos = keep
+                    break
+                self.dropped_bytes += start - pos
+                if start + HEADER.size > end:
+                    pos = start
+                    break
+
+                frame_type = buf[start + 2]
+                length = buf[start + 3]
+                if length > MAX_PAYLOAD:
+                    self.dropped_bytes += 1
+                    pos = start + 1
+                    continue
+                frame_end = start + HEADER.size + length + CRC.size
+                if frame_end > end:
+                    pos = start
+                    break
+
+                crc_at = frame_end - CRC.size
+                (crc,) = CRC.unpack_from(buf, crc_at)
+                if crc_hqx(view[start + 2:crc_at], CRC_INIT) != crc:
+                    self.crc_errors += 1
+                    self.dropped_bytes += 1
+                    pos = start + 1
+                    continue
+
+                layout = LAYOUTS.get(frame_type)
+                if layout is None or layout.size != length:
+                    self.unknown += 1
+                else:
+                    out.append((frame_type, layout.unpack_from(buf, start + HEADER.size)))
+                    self.frames += 1
+                pos = frame_end
+        finally:
+            view.release()
+
+        if pos:
+            del buf[:pos]
+        return out
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "crc_errors": self.crc_errors,
+            "unknown": self.unknown,
+            "dropped_bytes": self.dropped_bytes,
+            "buffered": len(self.buffer),
+        }
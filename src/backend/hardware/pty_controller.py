@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Имитация контроллера кофемашины на pty.
+
+Создает псевдотерминал и говорит на нем протоколом hardware/protocol.py:
+шлет сэмплы групп (SAMPLE_RATE Гц) и датчики машины, принимает команды.
+Позволяет гонять SerialHardware на любой Linux-машине без железа:
+
+    python3 -m hardware.pty_controller
+    # -> Controller on /dev/pts/5
+    HEADUNIT_HARDWARE=serial HEADUNIT_SERIAL_PORT=/dev/pts/5 python3 main.py
+"""
+import asyncio
+import os
+import time
+import tty
+
+from hardware.base import configured_groups
+from hardware.mock import MockHardware, read_sensors
+from hardware.protocol import (
+    COMMANDS, FRAME_COMMAND, FRAME_GROUP, FRAME_MACHINE, GROUPS, STATES, FrameParser, encode,
+)
+
+
+class PtyController:
+    SAMPLE_RATE = 50
+    MACHINE_EVERY = 5  # Кадр MACHINE на каждый 5-й тик
+
+    def __init__(self, extraction_time=30.0, groups=GROUPS):
+        self.extraction_time = extraction_time
+        self.groups = tuple(groups)
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.path = os.ttyname(self.slave)
+        self.parser = FrameParser()
+        self.states = {side: "IDLE" for side in self.groups}
+        self.started = {side: 0.0 for side in self.groups}
+        self.yields = {side: 0.0 for side in self.groups}  # Выход по весам; в DONE/STOPPED — итог шота
+        self.commands = []  # (side, command, profile_id) — для тестов
+        self.ticks = 0
+
+    def _on_readable(self):
+        try:
+            data = os.read(self.master, 4096)
+        except (BlockingIOError, OSError):
+            return
+        for frame_type, values in self.parser.feed(data):
+            if frame_type == FRAME_COMMAND:
+                group, command, profile_id = values
+                if group < len(self.groups) and command < len(COMMANDS):
+                    self.command(self.groups[group], COMMANDS[command], profile_id)
+
+    def command(self, side, command, profile_id=-1):
+        self.commands.append((side, command, profile_id))
+        state = self.states[side]
+        if command == "start" and state == "IDLE":
+            self._set(side, "EXTRACTION")
+        elif command == "stop":
+            if state == "EXTRACTION":
+                self._set(side, "STOPPED")
+            elif state in ("FLUSH", "CLEANING"):
+                self._set(side, "IDLE")
+        elif command == "flush" and state == "IDLE":
+            self._set(side, "FLUSH")
+        elif command == "cleaning" and state == "IDLE":
+            self._set(side, "CLEANING")
+        elif command == "reset":
+            self._set(side, "IDLE")
+
+    def _set(self, side, state):
+        if state in ("DONE", "STOPPED"):
+            self.yields[side] += MockHardware.SIM_DRIP  # Докап после закрытия клапана
+        elif state != "EXTRACTION":
+            self.yields[side] = 0.0
+        self.states[side] = state
+        self.started[side] = time.monotonic()
+
+    def step(self):
+        """Кадры одного тика."""
+        now = time.monotonic()
+        out = bytearray()
+        for group, side in enumerate(self.groups):
+            state = self.states[side]
+            elapsed = now - self.started[side]
+            if state == "EXTRACTION" and elapsed > self.extraction_time:
+                self._set(side, "DONE")
+                state = "DONE"
+            if state == "EXTRACTION":
+                sensors = read_sensors(elapsed)
+                self.yields[side] = sensors[4]
+            else:
+                sensors = (93.0, 0.0, 0.0, 0.0, self.yields[side])
+            out += encode(FRAME_GROUP, group, STATES.index(state), int(elapsed * 1000), *sensors)
+        if self.ticks % self.MACHINE_EVERY == 0:
+            out += encode(FRAME_MACHINE, 95.5, 1.2, 0)
+        self.ticks += 1
+        return bytes(out)
+
+    def write(self, data):
+        try:
+            os.write(self.master, data)
+        except BlockingIOError:
+            pass  # Никто не читает порт — кадр теряется, как на настоящем UART
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self.master, self._on_readable)
+        interval = 1.0 / self.SAMPLE_RATE
+        try:
+            while True:
+                self.write(self.step())
+                await asyncio.sleep(interval)
+        finally:
+            loop.remove_reader(self.master)
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+
+async def _main():
+    controller = PtyController(groups=configured_groups())
+    print(f"Controller on {controller.path}", flush=True)
+    try:
+        await controller.run()
+    finally:
+        controller.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,95 @@
+import time
+from array import array
+
+
+class ShotRecorder:
+    """
+    Запись кривой экстракции одной группы.
+    Кольцевой буфер фиксированной емкости на массивах (array('d') на поле),
+    без аллокации dict на каждый сэмпл. Если шот длиннее буфера,
+    затираются самые старые сэмплы.
+    """
+
+    FIELDS = ("t", "temp", "pressure", "flowIn", "flowOut", "yield")
+    SAMPLE_RATE = 50  # Гц, = ACQUISITION_RATE, выше частоты публикации (1-5 Гц)
+    CAPACITY = SAMPLE_RATE * 180  # 3 минуты
+
+    def __init__(self, side, capacity=CAPACITY, on_complete=None, columns=None, clock=time.time):
+        self.side = side
+        self.clock = clock  # Время по стене для started_at (clock.py: Clock.time)
+        self.on_complete = on_complete  # callback(curve) после фиксации шота
+        self.capacity = capacity
+        # columns — внешние буферы float64 (например, memoryview разделяемой памяти)
+        self.columns = columns or [array("d", bytes(8 * capacity)) for _ in self.FIELDS]
+        self.head = 0
+        self.count = 0
+        self.shot_id = 0
+        self.started_at = None
+        self.profile_id = None
+        self.recording = False
+        self.final_state = None
+        self.target_yield = None  # Цель авто-стопа, г
+        self.overshoot = None  # Итог - цель, г (см. hardware/autostop.py)
+
+    def start(self, profile_id=None):
+        """Начинает новый шот (start_extraction)."""
+        self.shot_id += 1
+        self.head = 0
+        self.count = 0
+        self.started_at = self.clock()
+        self.profile_id = profile_id
+        self.final_state = None
+        self.target_yield = None
+        self.overshoot = None
+        self.recording = True
+
+    def freeze(self, state):
+        """Фиксирует шот (DONE или STOPPED). Повторный вызов ничего не меняет."""
+        if self.recording:
+            self.recording = False
+            self.final_state = state
+            if self.on_complete:
+                self.on_complete(self.curve())
+
+    def append(self, t, temp, pressure, flow_in, flow_out, yld):
+        if not self.recording:
+            return
+        i = self.head
+        c = self.columns
+        c[0][i] = t
+        c[1][i] = temp
+        c[2][i] = pressure
+        c[3][i] = flow_in
+        c[4][i] = flow_out
+        c[5][i] = yld
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def column(self, index):
+        """Колонка в хронологическом порядке (копия)."""
+        col = memoryview(self.columns[index])
+        out = array("d")
+        if self.count < self.capacity:
+            out.frombytes(col[:self.count].cast("B"))
+        else:
+            out.frombytes(col[self.head:].cast("B"))
+            out.frombytes(col[:self.head].cast("B"))
+        return out
+
+    def curve(self):
+        """Полная кривая текущего или последнего шота, в колоночном виде."""
+        if self.started_at is None:
+            return None
+        return {
+            "shot_id": self.shot_id,
+            "side": self.side,
+            "state": "RECORDING" if self.recording else self.final_state,
+            "started_at": self.started_at,
+            "profile_id": self.profile_id,
+            "sample_rate": self.SAMPLE_RATE,
+            "samples": self.count,
+            "target_yield": self.target_yield,
+            "overshoot": self.overshoot,
+            "data": {name: self.column(i).tolist() for i, name in enumerate(self.FIELDS)},
+        }
@@ -0,0 +1,165 @@
+"""
+Воспроизведение записанных шотов (HEADUNIT_HARDWARE=replay).
+
+Трассы — история шотов в формате ShotStore (shots.log + shots.idx, колонки
+float32), например /data/shots, скопированная с машины клиента. Лог
+отображается в память (mmap): на тике читается один сэмпл по смещению
+колонки, шот целиком не загружается.
+
+ReplayHardware — MockHardware, у которого показания группы берутся из трассы.
+start_extraction() берет следующий шот истории (или шот {"trace": id} из профиля),
+экстракция кончается в тот же момент и с тем же состоянием, что в записи;
+авто-стоп не вмешивается. С autoplay группы сами запускают шоты друг за другом —
+конвейер телеметрии под реальной нагрузкой без машины и оператора.
+Скорость задают часы (clock.py): Clock(10) — 10x, VirtualClock + run_for() —
+так быстро, как получится.
+"""
+import itertools
+import logging
+import mmap
+import struct
+import zlib
+
+from hardware.mock import MockHardware
+from shots.store import CRC, LOG_HEADER, LOG_MAGIC, STATES, ShotStore
+
+SAMPLE = struct.Struct("<f")
+IDLE_GAP = 5.0  # с между шотами группы в autoplay
+
+
+class TraceShot:
+    """Колонки одного шота в отображенном логе: сэмпл читается по индексу, без копии записи."""
+
+    __slots__ = ("mm", "shot_id", "side", "state", "count", "rate", "duration", "offsets")
+
+    def __init__(self, mm, rec):
+        self.mm = mm
+        self.shot_id, _, _, _, side, _, state, offset, _ = rec
+        self.side = side.rstrip(b"\0").decode()
+        self.state = STATES[state]
+        _, _, _, rate, count, n_fields = LOG_HEADER.unpack_from(mm, offset)
+        pos = offset + LOG_HEADER.size
+        names = []
+        for _ in range(n_fields):
+            end = mm.find(b"\0", pos)
+            names.append(mm[pos:end].decode())
+            pos = end + 1
+        columns = {name: pos + 4 * count * i for i, name in enumerate(names)}
+        if "t" not in columns:
+            raise ValueError(f"shot {self.shot_id} has no time column")
+        self.count = count
+        # Смещение колонки для каждого поля сэмпла; поля нет в записи — None (0.0)
+        self.offsets = tuple(columns.get(f) for f in ShotStore.FIELDS)
+        self.duration = SAMPLE.unpack_from(mm, columns["t"] + 4 * (count - 1))[0]
+        self.rate = rate or ((count - 1) / self.duration if self.duration > 0 else 1.0)
+
+    def sample(self, elapsed):
+        """(temp, pressure, flowIn, flowOut, yield) на момент elapsed; после конца — последний сэмпл."""
+        i = min(max(int(elapsed * self.rate), 0), self.count - 1)
+        at = 4 * i
+        mm = self.mm
+        return tuple(0.0 if off is None else SAMPLE.unpack_from(mm, off + at)[0] for off in self.offsets[1:])
+
+
+class ShotTrace:
+    """История шотов для воспроизведения: индекс — в памяти (ShotStore), лог — через mmap."""
+
+    def __init__(self, path):
+        self.store = ShotStore(path, readonly=True)
+        if not len(self.store):
+            raise ValueError(f"no recorded shots in {path}")
+        with open(self.store.log_path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self.mm)
+        self.ids = [rec[0] for rec in self.store.entries if rec[7] + rec[8] <= size]
+        self._shots = {}  # Разобранные заголовки; колонки остаются в mmap
+
+    def __len__(self):
+        return len(self.ids)
+
+    def shot(self, shot_id):
+        """TraceShot по id; None — нет такого шота или запись повреждена."""
+        shot = self._shots.get(shot_id)
+        if shot is not None:
+            return shot
+        if not 1 <= shot_id <= len(self.store.entries):
+            return None
+        rec = self.store.entries[shot_id - 1]
+        offset, length = rec[7], rec[8]
+        mm = self.mm
+        end = offset + length - CRC.size
+        if end > len(mm) or mm[offset:offset + len(LOG_MAGIC)] != LOG_MAGIC \
+                or zlib.crc32(mm[offset:end]) != CRC.unpack_from(mm, end)[0]:
+            logging.error(f"[REPLAY] Shot {shot_id} is damaged, skipped")
+            return None
+        shot = self._shots[shot_id] = TraceShot(mm, rec)
+        return shot
+
+    def close(self):
+        self.mm.close()
+
+
+class ReplayHardware(MockHardware):
+    """Шоты из истории вместо симуляции: тот же интерфейс и те же переходы, что у MockHardware."""
+
+    def __init__(self, path, sides=None, clock=None, autoplay=False):
+        super().__init__(sides, clock=clock)
+        self.trace = ShotTrace(path)
+        self.autoplay = autoplay
+        self.playing = {side: None for side in self.groups}  # TraceShot текущего шота группы
+        self._next = itertools.cycle(self.trace.ids)
+        if autoplay:
+            # Группы со сдвигом, чтобы шоты не шли в ногу
+            for g in self.group_list:
+                self.set_timer(g.side, g.index * IDLE_GAP / len(self.group_list), self._autostart)
+
+    def _pick(self, profile):
+        wanted = profile.get("trace")
+        if wanted is not None:
+            return self.trace.shot(int(wanted))
+        for _ in range(len(self.trace)):
+            shot = self.trace.shot(next(self._next))
+            if shot is not None:
+                return shot
+        return None
+
+    def tick(self):
+        now = self.clock.time()
+        for g in self.group_list:
+            if g.state == self.EXTRACTION:
+                elapsed = now - g.start_time
+                self.record_sample(g.side, elapsed, self.playing[g.side].sample(elapsed))
+
+    def _current(self, side, elapsed):
+        return self.playing[side].sample(elapsed)
+
+    def auto_stop(self, side):
+        pass  # Конец шота задает запись
+
+    def _end_of_trace(self, side):
+        shot = self.playing[side]
+        if shot.state == self.DONE:
+            self._finish_extraction(side, shot.sample(shot.duration)[4])
+        else:
+            self.stop_extraction(side)
+
+    def _exit_summary(self, side):
+        super()._exit_summary(side)
+        if self.autoplay and self.groups[side].state == self.IDLE:
+            self.set_timer(side, IDLE_GAP, self._autostart)
+
+    def _autostart(self, side):
+        self.start_extraction(side, {})
+
+    def start_extraction(self, side, profile):
+        if side not in self.groups or self.groups[side].state != self.IDLE:
+            return
+        profile = profile or {}
+        shot = self._pick(profile)
+        if shot is None:
+            logging.error(f"[REPLAY] No playable shot for {side}")
+            return
+        self.playing[side] = shot
+        super().start_extraction(side, profile)
+        # Конец — там же, где в записи, а не по профилю или EXTRACTION_TIME
+        self.set_timer(side, shot.duration, self._end_of_trace)
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+
+from hardware.base import HardwareBase
+from hardware.protocol import (
+    COMMANDS, FRAME_COMMAND, FRAME_GROUP, FRAME_MACHINE, STATES, WATER_LEVELS,
+    FrameParser, encode, profile_code,
+)
+from hardware.serial_port import SerialPort
+
+
+class SerialHardware(HardwareBase):
+    """
+    Контроллер кофемашины на последовательном порту.
+
+    Состояние групп ведет контроллер: команды уходят кадрами COMMAND,
+    а новое состояние приходит в следующем сэмпле GROUP. Сэмплы разбираются
+    прямо в callback-е чтения порта: последний кадр каждой группы хранится
+    для get_telemetry(), сэмплы экстракции пишутся в рекордер шота и в окно
+    публикации (частоту сэмплов задает контроллер).
+    """
+
+    RECONNECT_DELAY = 2.0
+
+    def __init__(self, port, baudrate=115200, sides=None, clock=None):
+        super().__init__(sides, clock)
+        self.port = SerialPort(port, baudrate)
+        self.parser = FrameParser()
+        self.connected = False
+        self.machine = {"boiler_temp": 0.0, "steam_pressure": 0.0, "water_level": "ok"}
+
+    # --- Чтение ---
+
+    async def acquisition_loop(self):
+        await asyncio.gather(self._read_loop(), self.timers.run())
+
+    async def _read_loop(self):
+        try:
+            while True:
+                try:
+                    self.port.open(self._on_data)
+                except OSError as e:
+                    logging.warning(f"[SERIAL] Cannot open {self.port.path}: {e}")
+                    await asyncio.sleep(self.RECONNECT_DELAY)
+                    continue
+
+                logging.info(f"[SERIAL] Connected to {self.port.path}")
+                self.connected = True
+                error = await self.port.closed
+                self.connected = False
+                logging.warning(f"[SERIAL] Lost {self.port.path}: {error}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+        finally:
+            self.connected = False
+            self.port.close()
+
+    def _on_data(self, data):
+        for frame_type, values in self.parser.feed(data):
+            if frame_type == FRAME_GROUP:
+                self._on_group(*values)
+            elif frame_type == FRAME_MACHINE:
+                boiler_temp, steam_pressure, water = values
+                self.machine = {
+                    "boiler_temp": round(boiler_temp, 1),
+                    "steam_pressure": round(steam_pressure, 2),
+                    "water_level": WATER_LEVELS[water] if water < len(WATER_LEVELS) else "empty",
+                }
+
+    def _on_group(self, group, state_code, t_ms, temp, pressure, flow_in, flow_out, yld):
+        if group >= len(self.group_list):
+            return
+        g = self.group_list[group]
+        side = g.side
+        state = STATES[state_code] if state_code < len(STATES) else self.ERROR
+        elapsed = t_ms / 1000.0
+
+        if state != g.state:
+            if g.state == self.EXTRACTION and state not in (self.DONE, self.STOPPED):
+                # Экстракция прервана сбросом или промывкой на контроллере
+                self.finish_shot(side, self.STOPPED, yld)
+            g.state = state
+            g.start_time = self.clock.time() - (elapsed if state == self.EXTRACTION else 0)
+            if state in (self.DONE, self.STOPPED):
+                # Итог по весам — в кадре стопа (докап контроллер ждет сам)
+                self.finish_shot(side, state, yld)
+                # Summary держит бэкенд: по таймауту просим контроллер вернуться в IDLE
+                self.set_timer(side, self.summary_timeout(), self.reset_group)
+            else:
+                self.set_timer(side, None)
+                if state == self.EXTRACTION:
+                    self.begin_shot(side, g.profile)
+                elif state == self.IDLE:
+                    g.last_frame = None
+            self.telemetry_updated.set()
+
+        if state == self.EXTRACTION:
+            self.record_sample(side, elapsed, (temp, pressure, flow_in, flow_out, yld))
+            g.last_frame = {
+                "temp": round(temp, 1),
+                "pressure": round(pressure, 1),
+                "flowIn": round(flow_in, 2),
+                "flowOut": round(flow_out, 2),
+                "yield": round(yld, 1),
+                "time": f"{int(elapsed // 60)}:{int(elapsed % 60):02d}",
+                "done": False,
+                "active": True,
+                "state": self.EXTRACTION
+            }
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "serial": {
+                **self.parser.stats(),
+                "connected": self.port.fd is not None,
+                "bytes_in": self.port.bytes_in,
+                "bytes_out": self.port.bytes_out,
+            },
+        }
+
+    async def get_telemetry(self):
+        res = {"machine": dict(self.machine)}
+        for side, g in self.groups.items():
+            state = g.state
+            if state == self.EXTRACTION and g.last_frame:
+                window = self.windows[side].take()
+                res[side] = self.extraction_frame(side, g.last_frame, window[1] if window else None)
+            elif state in [self.DONE, self.STOPPED]:
+                if g.last_frame:
+                    res[side] = {**g.last_frame, "state": state, "active": False, "done": state == self.DONE}
+                else:
+                    res[side] = self.idle_frame(state)
+            else:
+                res[side] = self.idle_frame(state, active=state != self.IDLE)
+        return res
+
+    # --- Команды ---
+
+    def _send(self, side, command, profile_id=-1):
+        if side not in self.groups:
+            return
+        if not self.connected:
+            logging.warning(f"[SERIAL] Controller offline, dropping '{command}' for {side}")
+            return
+        self.port.write(encode(FRAME_COMMAND, self.groups[side].index, COMMANDS.index(command), profile_id))
+
+    def start_extraction(self, side, profile):
+        if side in self.groups:
+            self.groups[side].profile = profile
+            self._send(side, "start", profile_code((profile or {}).get("id")))
+
+    def stop_extraction(self, side):
+        self._send(side, "stop")
+
+    def start_flush(self, side):
+        self._send(side, "flush")
+
+    def start_cleaning(self, side):
+        self._send(side, "cleaning")
+
+    def reset_group(self, side):
+        self._send(side, "reset")
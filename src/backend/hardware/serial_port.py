@@ -0,0 +1,103 @@
+"""
+Неблокирующий последовательный порт поверх event loop.
+
+Без pyserial: порт открывается с O_NONBLOCK, переводится в raw-режим termios,
+чтение идет через loop.add_reader — каждый пришедший чанк сразу уходит
+в callback, без отдельного потока и без опроса. Работает и с pty
+(см. hardware/pty_controller.py).
+"""
+import asyncio
+import logging
+import os
+import termios
+import tty
+
+BAUDRATES = {
+    9600: termios.B9600,
+    57600: termios.B57600,
+    115200: termios.B115200,
+    230400: termios.B230400,
+}
+READ_SIZE = 4096
+
+
+class SerialPort:
+    def __init__(self, path, baudrate=115200):
+        self.path = path
+        self.baudrate = baudrate
+        self.fd = None
+        self.closed = None  # Future, завершается при потере порта
+        self._loop = None
+        self._pending = bytearray()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def open(self, on_data):
+        """Открывает порт и начинает отдавать данные в on_data(bytes) из event loop."""
+        self._loop = asyncio.get_running_loop()
+        fd = os.open(self.path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            tty.setraw(fd)
+            attrs = termios.tcgetattr(fd)
+            speed = BAUDRATES.get(self.baudrate, termios.B115200)
+            attrs[4] = attrs[5] = speed
+            termios.tcsetattr(fd, termios.TCSANOW, attrs)
+        except termios.error as e:
+            logging.warning(f"[SERIAL] Cannot configure {self.path}: {e}")
+        self.fd = fd
+        self.closed = self._loop.create_future()
+        self._loop.add_reader(fd, self._on_readable, on_data)
+
+    def _on_readable(self, on_data):
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.close(e)
+            return
+        if not data:
+            self.close(EOFError(self.path))
+            return
+        self.bytes_in += len(data)
+        on_data(data)
+
+    def write(self, data):
+        """Пишет без блокировки; остаток дописывается, когда порт готов."""
+        if self.fd is None:
+            raise ConnectionError(f"{self.path} is not open")
+        if not self._pending:
+            try:
+                n = os.write(self.fd, data)
+            except BlockingIOError:
+                n = 0
+            self.bytes_out += n
+            data = data[n:]
+            if not data:
+                return
+            self._loop.add_writer(self.fd, self._on_writable)
+        self._pending += data
+
+    def _on_writable(self):
+        try:
+            n = os.write(self.fd, self._pending)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.close(e)
+            return
+        self.bytes_out += n
+        del self._pending[:n]
+        if not self._pending:
+            self._loop.remove_writer(self.fd)
+
+    def close(self, error=None):
+        if self.fd is None:
+            return
+        self._loop.remove_reader(self.fd)
+        self._loop.remove_writer(self.fd)
+        os.close(self.fd)
+        self.fd = None
+        self._pending.clear()
+        if not self.closed.done():
+            self.closed.set_result(error)
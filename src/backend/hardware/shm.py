@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Разделяемая память состояния железа: процесс железа -> бэкенд и локальные сервисы.
+
+Файл в /dev/shm, отображенный через mmap. Писатель один — процесс железа
+(hardware/process.py). Читателей сколько угодно: они не пишут в файл и не
+обмениваются сообщениями с писателем, значения читаются struct.unpack_from
+прямо из отображения.
+
+Раскладка (little-endian, секции выровнены по 8 байт):
+  HEADER + имена групп (8s на группу)
+  слот machine        seqlock + MACHINE
+  слот на группу      seqlock + GROUP
+  рекордер на группу  seqlock + RECORDER_META, затем колонки float64[capacity] по ShotRecorder.FIELDS
+
+Seqlock: писатель делает seq нечетным, пишет данные, затем ставит четный seq
+и CRC32 данных. Читатель повторяет попытку, пока seq нечетный или изменился
+за время чтения. CRC страхует от переупорядочивания записей: в Python нет
+барьеров памяти, а на ARM запись может стать видна не по порядку.
+
+Посмотреть текущее состояние:
+    python3 -m hardware.shm [/dev/shm/headunit-state]
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+from hardware.protocol import STATES, WATER_LEVELS, parse_time, profile_code
+from hardware.recorder import ShotRecorder
+
+DEFAULT_PATH = "/dev/shm/headunit-state"
+
+MAGIC = b"HUSM"
+VERSION = 2
+HEADER = struct.Struct("<4sHBI")  # magic, version, n_groups, capacity
+NAME = struct.Struct("<8s")
+SEQ = struct.Struct("<QI")  # seq, crc32 данных слота
+
+# boiler_temp, steam_pressure, water_level
+MACHINE = struct.Struct("<ffB")
+# state, bits (done|active), elapsed сек, temp, pressure, flowIn, flowOut, yield
+GROUP = struct.Struct("<BBffffff")
+# shot_id, started_at, profile_id (-1 — нет), recording, final_state (255 — нет), head, count, total,
+# target_yield, overshoot (NaN — нет)
+RECORDER_META = struct.Struct("<IdiBBIIQff")
+
+BIT_DONE = 0x01
+BIT_ACTIVE = 0x02
+NO_STATE = 255
+READ_RETRIES = 100
+
+_STATE_IDS = {s: i for i, s in enumerate(STATES)}
+_WATER_IDS = {w: i for i, w in enumerate(WATER_LEVELS)}
+
+
+def _opt(value):
+    return math.nan if value is None else value
+
+
+def _from_opt(value):
+    return None if math.isnan(value) else round(value, 2)
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+class SharedState:
+    """
+    create=True — писатель: создает файл заново (через rename, чтобы читатели
+    старого файла не увидели его обнуленным). Иначе — читатель, только чтение.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, sides=("left", "right"), capacity=ShotRecorder.CAPACITY, create=False):
+        self.path = path
+        self.writable = create
+        if create:
+            n_fields = len(ShotRecorder.FIELDS)
+            size = self._layout(len(sides), capacity, n_fields)
+            tmp = f"{path}.tmp"
+            fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.ftruncate(fd, size)
+                self.mm = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+            HEADER.pack_into(self.mm, 0, MAGIC, VERSION, len(sides), capacity)
+            for i, side in enumerate(sides):
+                NAME.pack_into(self.mm, HEADER.size + i * NAME.size, side.encode())
+            os.replace(tmp, path)
+        else:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                self.mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            finally:
+                os.close(fd)
+
+        magic, version, n_groups, capacity = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"{path}: not a headunit state file (v{VERSION})")
+        self.capacity = capacity
+        self.sides = tuple(
+            NAME.unpack_from(self.mm, HEADER.size + i * NAME.size)[0].rstrip(b"\0").decode()
+            for i in range(n_groups)
+        )
+        self._layout(n_groups, capacity, len(ShotRecorder.FIELDS))
+        self.view = memoryview(self.mm)
+
+    def _layout(self, n_groups, capacity, n_fields):
+        """Смещения секций. Возвращает размер файла."""
+        off = _align(HEADER.size + n_groups * NAME.size)
+        self.machine_off = off
+        off += _align(SEQ.size + MACHINE.size)
+        self.group_off = []
+        for _ in range(n_groups):
+            self.group_off.append(off)
+            off += _align(SEQ.size + GROUP.size)
+        self.meta_off = []
+        self.columns_off = []
+        for _ in range(n_groups):
+            self.meta_off.append(off)
+            off += _align(SEQ.size + RECORDER_META.size)
+            self.columns_off.append(off)
+            off += 8 * capacity * n_fields
+        return off
+
+    def close(self):
+        try:
+            self.view.release()
+            self.mm.close()
+        except BufferError:
+            pass  # Колонки рекордеров еще у кого-то в руках — отображение закроет GC
+
+    # --- Seqlock ---
+
+    def _write(self, offset, layout, values):
+        data = offset + SEQ.size
+        seq = SEQ.unpack_from(self.mm, offset)[0] + 1  # Нечетный — запись идет
+        SEQ.pack_into(self.mm, offset, seq, 0)
+        layout.pack_into(self.mm, data, *values)
+        SEQ.pack_into(self.mm, offset, seq + 1, zlib.crc32(self.view[data:data + layout.size]))
+
+    def _read(self, offset, layout):
+        """Согласованный снимок слота или None (слот еще не писался)."""
+        data = offset + SEQ.size
+        for _ in range(READ_RETRIES):
+            seq, crc = SEQ.unpack_from(self.mm, offset)
+            if seq == 0:
+                return None
+            if seq & 1:
+                continue
+            if zlib.crc32(self.view[data:data + layout.size]) != crc:
+                continue
+            values = layout.unpack_from(self.mm, data)
+            if SEQ.unpack_from(self.mm, offset)[0] == seq:
+                return values
+        return None
+
+    # --- Кадры топиков ---
+
+    def write_frames(self, frames):
+        """Пишет кадры в формате get_telemetry() (лишние ключи, например window, не хранятся)."""
+        machine = frames.get("machine")
+        if machine:
+            self._write(self.machine_off, MACHINE, (
+                machine.get("boiler_temp", 0.0),
+                machine.get("steam_pressure", 0.0),
+                _WATER_IDS.get(machine.get("water_level"), 0),
+            ))
+        for i, side in enumerate(self.sides):
+            g = frames.get(side)
+            if not g:
+                continue
+            bits = (BIT_DONE if g.get("done") else 0) | (BIT_ACTIVE if g.get("active") else 0)
+            self._write(self.group_off[i], GROUP, (
+                _STATE_IDS.get(g.get("state"), _STATE_IDS["ERROR"]),
+                bits,
+                parse_time(g.get("time")),
+                g.get("temp", 0.0),
+                g.get("pressure", 0.0),
+                g.get("flowIn", 0.0),
+                g.get("flowOut", 0.0),
+                g.get("yield", 0.0),
+            ))
+
+    def read_frames(self):
+        """Последние кадры всех топиков; топики, которые еще не писались, пропускаются."""
+        frames = {}
+        machine = self._read(self.machine_off, MACHINE)
+        if machine:
+            boiler_temp, steam_pressure, water = machine
+            frames["machine"] = {
+                "boiler_temp": round(boiler_temp, 1),
+                "steam_pressure": round(steam_pressure, 2),
+                "water_level": WATER_LEVELS[water] if water < len(WATER_LEVELS) else "empty",
+            }
+        for i, side in enumerate(self.sides):
+            g = self._read(self.group_off[i], GROUP)
+            if not g:
+                continue
+            state, bits, elapsed, temp, pressure, flow_in, flow_out, yld = g
+            frames[side] = {
+                "temp": round(temp, 1),
+                "pressure": round(pressure, 1),
+                "flowIn": round(flow_in, 2),
+                "flowOut": round(flow_out, 2),
+                "yield": round(yld, 1),
+                "time": f"{int(elapsed // 60)}:{int(elapsed % 60):02d}",
+                "done": bool(bits & BIT_DONE),
+                "active": bool(bits & BIT_ACTIVE),
+                "state": STATES[state] if state < len(STATES) else "ERROR",
+            }
+        return frames
+
+    # --- Рекордеры ---
+
+    def columns(self, side):
+        """Колонки рекордера группы: memoryview float64 прямо в отображении."""
+        off = self.columns_off[self.sides.index(side)]
+        size = 8 * self.capacity
+        return [
+            self.view[off + k * size:off + (k + 1) * size].cast("d")
+            for k in range(len(ShotRecorder.FIELDS))
+        ]
+
+    def write_meta(self, side, values):
+        self._write(self.meta_off[self.sides.index(side)], RECORDER_META, values)
+
+    def read_meta(self, side):
+        return self._read(self.meta_off[self.sides.index(side)], RECORDER_META)
+
+
+class SharedRecorder(ShotRecorder):
+    """ShotRecorder процесса железа: колонки и состояние — в разделяемой памяти."""
+
+    def __init__(self, side, state, on_complete=None, clock=time.time):
+        super().__init__(side, state.capacity, on_complete, columns=state.columns(side), clock=clock)
+        self.state = state
+        self.total = 0  # Сэмплов с начала шота (не ограничено емкостью) — для окон читателей
+        self._publish()
+
+    def _publish(self):
+        self.state.write_meta(self.side, (
+            self.shot_id,
+            self.started_at or 0.0,
+            profile_code(self.profile_id),
+            self.recording,
+            STATES.index(self.final_state) if self.final_state in STATES else NO_STATE,
+            self.head,
+            self.count,
+            self.total,
+            _opt(self.target_yield),
+            _opt(self.overshoot),
+        ))
+
+    def start(self, profile_id=None):
+        super().start(profile_id)
+        self.total = 0
+        self._publish()
+
+    def freeze(self, state):
+        if self.recording:
+            self.recording = False
+            self.final_state = state
+            self._publish()
+            if self.on_complete:
+                self.on_complete(self.curve())
+
+    def append(self, t, temp, pressure, flow_in, flow_out, yld):
+        if not self.recording:
+            return
+        super().append(t, temp, pressure, flow_in, flow_out, yld)
+        self.total += 1
+        self._publish()
+
+
+class RecorderView(ShotRecorder):
+    """
+    Рекордер процесса железа со стороны читателя (тот же API чтения, что у ShotRecorder).
+    Перед чтением состояние обновляется из разделяемой памяти; колонки не копируются
+    до формирования ответа.
+    """
+
+    def __init__(self, side, state):
+        super().__init__(side, state.capacity, columns=state.columns(side))
+        self.state = state
+        self.total = 0
+
+    def refresh(self):
+        meta = self.state.read_meta(self.side)
+        if meta is None:
+            return False
+        shot_id, started_at, profile_id, recording, final_state, head, count, total, target, overshoot = meta
+        self.shot_id = shot_id
+        self.started_at = started_at if shot_id else None
+        self.profile_id = profile_id if profile_id >= 0 else None
+        self.recording = bool(recording)
+        self.final_state = STATES[final_state] if final_state < len(STATES) else None
+        self.head = head
+        self.count = count
+        self.total = total
+        self.target_yield = _from_opt(target)
+        self.overshoot = _from_opt(overshoot)
+        return True
+
+    def curve(self):
+        self.refresh()
+        return super().curve()
+
+    def recent(self, n):
+        """Последние n сэмплов (без поля t) в хронологическом порядке, по состоянию на refresh()."""
+        n = min(n, self.count)
+        sensors = self.columns[1:]
+        return [
+            tuple(col[i % self.capacity] for col in sensors)
+            for i in range(self.head - n, self.head)
+        ]
+
+    def start(self, profile_id=None):
+        raise RuntimeError("RecorderView is read-only")
+
+    def append(self, *values):
+        raise RuntimeError("RecorderView is read-only")
+
+
+if __name__ == "__main__":
+    shared = SharedState(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
+    print(json.dumps(shared.read_frames(), indent=2))
@@ -0,0 +1,175 @@
+"""
+Физическая модель кофемашины для MockHardware (режим HEADUNIT_HARDWARE=sim).
+
+Все группы шагают разом: состояние — массивы numpy длины n_groups,
+шаг — несколько векторных операций без dict на группу. При одном seed
+и одной последовательности шагов результат детерминирован (шаг фиксирован: dt).
+
+Модель на группу:
+  бойлер группы   C_BOILER * dT/dt = нагрев - вода через группу - потери;
+                  нагрев — energy профиля (Вт) или П-регулятор к уставке temp;
+  группа (temp)   тянется к температуре бойлера с постоянной TAU_GROUP;
+  таблетка        сначала пропитка (W_SAT г воды, давление почти 0, в чашку 0),
+                  затем сопротивление R = R0 * (1 - erosion): пролив размывает
+                  таблетку, и при том же давлении поток растет;
+  гидравлика      flowOut = P / R, помпа (расход до Q_MAX) держит уставку
+                  давления, C_HYD * dP/dt = flowIn - flowOut.
+Машина: паровой бойлер с гистерезисом термостата.
+
+numpy обязателен для этого режима; без него MockHardware работает по старой
+фиксированной кривой.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Старые образы без numpy в services/requirements.txt
+    np = None
+
+from hardware.acquisition import ACQUISITION_RATE
+
+# Поля сэмпла (= HardwareBase.SENSOR_FIELDS) и уставки (= hardware/profile.SETPOINT_FIELDS)
+TEMP, PRESS, FLOW_IN, FLOW_OUT, YIELD = range(5)
+SP_TEMP, SP_PRESS, SP_ENERGY = 0, 1, 4
+
+DEFAULT_SETPOINT = (93.0, 9.0, 0.0, 0.0, 0.0)  # Без профиля: 93 °C, 9 бар, нагрев регулятором
+
+WATER_C = 4.186  # Дж/(г·К)
+INLET_TEMP = 20.0  # °C
+AMBIENT_TEMP = 25.0
+C_BOILER = 4000.0  # Дж/К: 0.6 л воды + металл
+BOILER_LOSS = 3.0  # Вт/К
+HEATER_MAX = 1600.0  # Вт
+HEATER_GAIN = 400.0  # Вт/К — П-регулятор без профиля
+TAU_GROUP = 2.5  # с
+
+Q_MAX = 4.0  # г/с, производительность помпы
+PUMP_GAIN = 3.0  # г/с на бар ошибки давления
+C_HYD = 0.9  # г/бар — податливость гидравлики над таблеткой
+W_SAT = 6.0  # г воды до пропитки таблетки
+R0 = 4.5  # бар·с/г: ~2 г/с при 9 бар
+R0_SPREAD = 0.1  # Разброс помола от шота к шоту, доля
+EROSION_RATE = 0.006  # Доля сопротивления на грамм пролива
+EROSION_MAX = 0.35
+DRIP_PER_BAR = 0.12  # г докапа на бар давления в момент стопа
+
+STEAM_ON, STEAM_OFF = 124.0, 126.0  # °C, гистерезис термостата парового бойлера
+STEAM_HEAT, STEAM_LOSS = 0.8, 0.002  # К/с нагрева, 1/с остывания к AMBIENT
+
+# Шум датчиков (сигма): temp, pressure, flowIn, flowOut, yield
+NOISE = (0.05, 0.02, 0.02, 0.02, 0.0)
+
+
+class MachineSimulator:
+    def __init__(self, n_groups, seed=None, dt=1.0 / ACQUISITION_RATE, noise=True):
+        if np is None:
+            raise RuntimeError("numpy is required for the machine simulator")
+        self.n = n_groups
+        self.dt = dt
+        self.rng = np.random.default_rng(seed)
+        self.noise = np.array(NOISE) if noise else np.zeros(len(NOISE))
+        self.active = np.zeros(n_groups, dtype=bool)
+        self.boiler = np.full(n_groups, DEFAULT_SETPOINT[SP_TEMP])
+        self.group = self.boiler - 1.0
+        self.pressure = np.zeros(n_groups)
+        self.water = np.zeros(n_groups)  # Вода в таблетке до пропитки, г
+        self.resistance = np.full(n_groups, R0)
+        self.erosion = np.zeros(n_groups)
+        self.flow_in = np.zeros(n_groups)
+        self.flow_out = np.zeros(n_groups)
+        self.yld = np.zeros(n_groups)
+        self.steam_temp = 125.0
+        self.steam_heating = False
+        self.steps = 0
+
+    # --- Шот ---
+
+    def start(self, i):
+        """Новая таблетка в группе i: помол чуть отличается от шота к шоту."""
+        self.active[i] = True
+        self.pressure[i] = 0.0
+        self.water[i] = 0.0
+        self.erosion[i] = 0.0
+        self.resistance[i] = R0 * (1.0 + self.rng.uniform(-R0_SPREAD, R0_SPREAD))
+        self.flow_in[i] = self.flow_out[i] = 0.0
+        self.yld[i] = 0.0
+
+    def stop(self, i):
+        """Помпа выключена, давление сброшено. Возвращает итоговый выход с докапом."""
+        drip = self.pressure[i] * DRIP_PER_BAR * (1.0 + self.rng.normal(0.0, 0.1))
+        final = float(self.yld[i] + max(drip, 0.0))
+        self.active[i] = False
+        self.pressure[i] = 0.0
+        self.flow_in[i] = self.flow_out[i] = 0.0
+        return final
+
+    # --- Шаг ---
+
+    def step(self, setpoints=None):
+        """
+        Один шаг dt для всех групп. setpoints — массив (n, 5) уставок профиля
+        (temp, press, flowIn, flowOut, energy) или None — DEFAULT_SETPOINT.
+        """
+        dt = self.dt
+        sp = np.broadcast_to(DEFAULT_SETPOINT, (self.n, 5)) if setpoints is None else setpoints
+        active = self.active
+        sp_press = np.where(active, sp[:, SP_PRESS], 0.0)
+
+        # Таблетка: пропитка, затем пролив
+        wet = self.water >= W_SAT
+        soaking = active & ~wet
+        fill = np.where(soaking, Q_MAX * np.clip(sp_press / DEFAULT_SETPOINT[SP_PRESS], 0.0, 1.0), 0.0)
+        self.water += fill * dt
+        r = self.resistance * (1.0 - self.erosion)
+        flow_out = np.where(active & wet, self.pressure / r, 0.0)
+        pumped = np.clip(flow_out + PUMP_GAIN * (sp_press - self.pressure), 0.0, Q_MAX)
+        flow_in = np.where(wet, pumped, fill) * active
+        self.pressure = np.where(
+            wet,
+            np.maximum(self.pressure + (flow_in - flow_out) * dt / C_HYD, 0.0),
+            0.5 * self.water / W_SAT,  # При пропитке давление почти не растет
+        ) * active
+        self.erosion = np.minimum(self.erosion + EROSION_RATE * flow_out * dt, EROSION_MAX)
+        self.yld += flow_out * dt
+        self.flow_in, self.flow_out = flow_in, flow_out
+
+        # Тепло: энергия профиля или регулятор, холодная вода из помпы, потери
+        heater = np.where(
+            sp[:, SP_ENERGY] > 0,
+            np.minimum(sp[:, SP_ENERGY], HEATER_MAX),
+            np.clip(HEATER_GAIN * (sp[:, SP_TEMP] - self.boiler), 0.0, HEATER_MAX),
+        )
+        cooling = flow_in * WATER_C * (self.boiler - INLET_TEMP) + BOILER_LOSS * (self.boiler - AMBIENT_TEMP)
+        self.boiler += (heater - cooling) * dt / C_BOILER
+        self.group += (self.boiler - 1.0 - self.group) * (1.0 - math.exp(-dt / TAU_GROUP))
+
+        # Паровой бойлер
+        if self.steam_temp < STEAM_ON:
+            self.steam_heating = True
+        elif self.steam_temp > STEAM_OFF:
+            self.steam_heating = False
+        self.steam_temp += (STEAM_HEAT * self.steam_heating - STEAM_LOSS * (self.steam_temp - AMBIENT_TEMP)) * dt
+        self.steps += 1
+
+    def settle(self):
+        """Долгий простой: бойлеры групп без экстракции — в равновесии у уставки."""
+        idle = ~self.active
+        self.boiler[idle] = DEFAULT_SETPOINT[SP_TEMP]
+        self.group[idle] = DEFAULT_SETPOINT[SP_TEMP] - 1.0
+
+    # --- Показания ---
+
+    def readings(self):
+        """Сэмплы всех групп (n, 5): temp, pressure, flowIn, flowOut, yield — с шумом датчиков."""
+        out = np.column_stack((self.group, self.pressure, self.flow_in, self.flow_out, self.yld))
+        out += self.rng.normal(0.0, 1.0, out.shape) * self.noise
+        out[:, PRESS:YIELD] = np.maximum(out[:, PRESS:YIELD], 0.0)
+        return out
+
+    def machine(self):
+        # Насыщенный пар: ~1 бар избыточного на 120 °C, ~0.035 бар/К рядом
+        return {
+            "boiler_temp": round(self.steam_temp, 1),
+            "steam_pressure": round(max(1.0 + (self.steam_temp - 120.0) * 0.035, 0.0), 2),
+            "water_level": "ok",
+        }
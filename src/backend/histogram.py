@@ -0,0 +1,59 @@
+"""
+Гистограммы с фиксированными корзинами для таймингов бэкенда.
+
+Счетчики выделяются один раз при создании; observe() — bisect по границам
+и инкремент, без аллокаций, поэтому годится для горячих циклов (50 Гц и выше).
+"""
+import bisect
+from array import array
+
+# Границы корзин в миллисекундах: от долей мс (нормальный джиттер) до сотен (зависание loop)
+TIMING_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+# Длительные операции (применение настроек: timedatectl, nmcli), мс
+SLOW_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class Histogram:
+    def __init__(self, bounds=TIMING_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = array("Q", bytes(8 * (len(self.bounds) + 1)))  # Последняя корзина — +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Оценка квантиля сверху: верхняя граница корзины, в которую он попадает."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def snapshot(self):
+        buckets = {str(b): n for b, n in zip(self.bounds, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 3) if self.count else 0.0,
+            "p99": round(self.quantile(0.99), 3),
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
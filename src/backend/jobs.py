@@ -0,0 +1,111 @@
+"""
+Фоновые задачи бэкенда (применение настроек и т.п.).
+
+Задачи выполняются по очереди в одном рабочем потоке: блокирующие
+subprocess-вызовы (timedatectl, headunit-apply-config, nmcli) не занимают
+event loop, и телеметрия продолжает идти во время применения настроек.
+"""
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from histogram import Histogram, SLOW_BUCKETS_MS
+
+
+class Job:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, job_id, kind):
+        self.id = job_id
+        self.kind = kind
+        self.status = self.QUEUED
+        self.step = None
+        self.steps = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "step": self.step,
+            "steps": list(self.steps),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    HISTORY = 50  # Сколько завершенных задач помнить для опроса статуса
+
+    def __init__(self, on_update=None):
+        self.on_update = on_update  # callback(job_dict), вызывается из рабочего потока
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hu-jobs")
+        self.durations = {}  # kind -> Histogram длительности выполнения, мс
+
+    def submit(self, kind, fn, *args):
+        """
+        Ставит fn(*args, progress=...) в очередь и сразу возвращает Job.
+        progress(step) отмечает текущий шаг задачи.
+        """
+        with self.lock:
+            job = Job(next(self._ids), kind)
+            self.jobs[job.id] = job
+            while len(self.jobs) > self.HISTORY:
+                self.jobs.popitem(last=False)
+        self._notify(job)
+        self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def _notify(self, job):
+        if self.on_update:
+            try:
+                self.on_update(job.to_dict())
+            except Exception as e:
+                logging.error(f"[JOBS] Update callback failed: {e}")
+
+    def _run(self, job, fn, args):
+        def progress(step):
+            job.step = step
+            job.steps.append(step)
+            self._notify(job)
+
+        job.status = Job.RUNNING
+        job.started_at = time.time()
+        self._notify(job)
+        try:
+            ok = fn(*args, progress=progress)
+            job.status = Job.DONE if ok is not False else Job.FAILED
+        except Exception as e:
+            logging.error(f"[JOBS] Job {job.id} ({job.kind}) failed: {e}")
+            job.status = Job.FAILED
+            job.error = str(e)
+        job.step = None
+        job.finished_at = time.time()
+        hist = self.durations.get(job.kind)
+        if hist is None:
+            hist = self.durations[job.kind] = Histogram(SLOW_BUCKETS_MS)
+        hist.observe((job.finished_at - job.started_at) * 1000)
+        self._notify(job)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,24 +1,154 @@
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 import os
 import json
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
 from typing import Optional
 
 # Local imports
 import settings_manager
-from hardware.mock import MockHardware
-
-app = FastAPI(title="HeadUnit OS API")
-hw = MockHardware()
+import control
+from jobs import JobQueue
+import metrics
+from hardware.factory import create_hardware
+from shots.downsample import downsample_curve
+from shots.store import ShotStore
+from telemetry.broadcaster import TelemetryBroadcaster
+from telemetry.delta import DeltaEncoder
+from telemetry.binary import BinaryEncoder, BINARY_SUBPROTOCOL, JSON_SUBPROTOCOL, topic_ids
+from telemetry import session as telemetry_session
 
 # Пути
 BASE_DIR = os.path.dirname(__file__)
 FRONTEND_PATH = os.path.join(BASE_DIR, "../frontend/dist")
 MANIFEST_PATH = os.path.join(BASE_DIR, "../manifest.json")
+SHOTS_DIR = os.environ.get("HEADUNIT_SHOTS_DIR") or (
+    "/data/shots" if os.name != 'nt' else os.path.join(BASE_DIR, "shots_dev")
+)
+HARDWARE_KIND = os.environ.get("HEADUNIT_HARDWARE", "mock")
+HARDWARE_PROCESS = os.environ.get("HEADUNIT_HARDWARE_PROCESS") == "1"
+# Шоты replay — повтор записанных: в историю машины их не пишем
+SAVE_SHOTS = HARDWARE_KIND != "replay"
+
+def hardware_from_env():
+    """
+    Драйвер железа: HEADUNIT_HARDWARE=mock (по умолчанию), sim, replay или serial.
+    HEADUNIT_SIM_SEED — seed физической модели (sim).
+    HEADUNIT_SIM_SPEED — ускорение времени mock/sim/replay (10 — в 10 раз быстрее).
+    HEADUNIT_REPLAY_PATH — каталог истории шотов для replay,
+    HEADUNIT_REPLAY_AUTOPLAY=1 — группы запускают шоты сами.
+    HEADUNIT_HARDWARE_PROCESS=1 — драйвер в отдельном процессе, состояние
+    через разделяемую память (см. hardware/process.py).
+    HEADUNIT_SHOTS_DIR — каталог истории шотов (по умолчанию /data/shots).
+    """
+    kind = HARDWARE_KIND
+    port = os.environ.get("HEADUNIT_SERIAL_PORT", "/dev/ttyAMA0")
+    baudrate = int(os.environ.get("HEADUNIT_SERIAL_BAUD", "115200"))
+    seed = os.environ.get("HEADUNIT_SIM_SEED")
+    seed = int(seed) if seed else None
+    speed = float(os.environ.get("HEADUNIT_SIM_SPEED", "1"))
+    trace = os.environ.get("HEADUNIT_REPLAY_PATH")
+    autoplay = os.environ.get("HEADUNIT_REPLAY_AUTOPLAY") == "1"
+    if HARDWARE_PROCESS:
+        from hardware import process, shm
+        return process.ProcessHardware(
+            kind,
+            shm_path=os.environ.get("HEADUNIT_SHM_PATH", shm.DEFAULT_PATH),
+            socket_path=os.environ.get("HEADUNIT_HARDWARE_SOCKET", process.DEFAULT_SOCKET),
+            shots_dir=SHOTS_DIR if SAVE_SHOTS else None,
+            port=port,
+            baudrate=baudrate,
+            seed=seed,
+            speed=speed,
+            trace=trace,
+            autoplay=autoplay,
+        )
+    return create_hardware(kind, port, baudrate, seed, speed, trace, autoplay)
+
+hw = hardware_from_env()
+BINARY_TOPICS = topic_ids(hw.SIDES)  # Группы из конфига "groups": топик группы = 1 + ее id
+# Частоты публикации по состояниям можно переопределить в конфиге: {"publish_rates": {"IDLE": 0.5}}
+broadcaster = TelemetryBroadcaster(hw, rates=settings_manager.get_setting("publish_rates"))
+shot_store = ShotStore(SHOTS_DIR)
+jobs = JobQueue()
+
+def _save_shot(curve):
+    try:
+        shot_id = shot_store.append(curve)
+        logging.info(f"[SHOTS] Saved shot {shot_id} ({curve['side']}, {curve['samples']} samples)")
+    except Exception as e:
+        logging.error(f"[SHOTS] Failed to save shot: {e}")
+
+# Запись на SD — в фоновом потоке, чтобы не блокировать event loop.
+# Процесс железа сохраняет шоты сам, бэкенд только читает историю.
+if SAVE_SHOTS and not HARDWARE_PROCESS:
+    hw.shot_listeners.append(
+        lambda curve: asyncio.get_running_loop().run_in_executor(None, _save_shot, curve)
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Прогресс фоновых задач уходит клиентам топиком "jobs" (из рабочего потока — через loop)
+    loop = asyncio.get_running_loop()
+    jobs.on_update = lambda job: loop.call_soon_threadsafe(broadcaster.publish_topic, "jobs", job)
+    broadcaster.start()
+    acquisition = asyncio.create_task(hw.acquisition_loop())
+    loop_lag = asyncio.create_task(metrics.loop_lag_monitor(LOOP_LAG))
+    yield
+    loop_lag.cancel()
+    acquisition.cancel()
+    await asyncio.gather(acquisition, loop_lag, return_exceptions=True)  # Процесс железа останавливается в acquisition_loop
+    await broadcaster.stop()
+    jobs.shutdown()
+
+app = FastAPI(title="HeadUnit OS API", lifespan=lifespan)
+
+# --- Метрики (GET /metrics, формат Prometheus) ---
+# Горячие пути пишут в готовые гистограммы, текст собирается только по запросу
+HTTP_ROUTES = {}  # Шаблон маршрута -> Histogram, см. metrics.RouteTimer
+app.add_middleware(metrics.RouteTimer, routes=HTTP_ROUTES)
+registry = metrics.Registry()
+LOOP_LAG = registry.histogram("headunit_event_loop_lag_seconds", "Event loop wakeup lateness.")
+registry.register(
+    "headunit_telemetry_tick_seconds", "histogram", "Telemetry tick: hardware poll and fan-out to clients.",
+    lambda: [((), broadcaster.tick_duration)],
+)
+registry.register(
+    "headunit_telemetry_send_seconds", "histogram", "WebSocket frame send latency per client.",
+    lambda: [((("client", sub.name),), sub.send_latency) for sub in list(broadcaster.subscribers)],
+)
+registry.register(
+    "headunit_telemetry_clients", "gauge", "Connected telemetry clients.",
+    lambda: [((), len(broadcaster.subscribers))],
+)
+registry.register(
+    "headunit_telemetry_frames_sent_total", "counter", "Telemetry frames sent to clients.",
+    lambda: [((), broadcaster.frame_totals()[0])],
+)
+registry.register(
+    "headunit_telemetry_frames_dropped_total", "counter", "Telemetry frames replaced before send (slow clients).",
+    lambda: [((), broadcaster.frame_totals()[1])],
+)
+registry.register(
+    "headunit_telemetry_missed_ticks_total", "counter", "Telemetry ticks late by more than half a period.",
+    lambda: [((), broadcaster.missed_ticks)],
+)
+registry.register(
+    "headunit_http_request_seconds", "histogram", "HTTP request latency per route.",
+    lambda: [((("route", route),), hist) for route, hist in list(HTTP_ROUTES.items())],
+)
+registry.register(
+    "headunit_job_seconds", "histogram", "Background job duration (kind=settings: applying settings).",
+    lambda: [((("kind", kind),), hist) for kind, hist in list(jobs.durations.items())],
+)
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(registry.render(), media_type=metrics.CONTENT_TYPE)
 
 class SettingsUpdate(BaseModel):
     serial: Optional[str] = None
@@ -52,10 +182,18 @@ async def health():
 async def get_settings():
     return settings_manager.get_settings()
 
-@app.patch("/api/settings")
+@app.patch("/api/settings", status_code=202)
 async def update_settings(settings: SettingsUpdate):
-    success = settings_manager.update_settings(settings.dict(exclude_unset=True))
-    return {"status": "ok" if success else "error"}
+    # Применение блокирующее (timedatectl, nmcli) — уводим в фоновую задачу
+    job = jobs.submit("settings", settings_manager.update_settings, settings.dict(exclude_unset=True))
+    return {"status": "accepted", "job_id": job.id}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: int):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 # --- System API ---
 @app.post("/api/system/reboot")
@@ -75,63 +213,103 @@ async def shutdown():
 # --- Telemetry WebSocket ---
 @app.websocket("/ws/telemetry")
 async def telemetry_websocket(websocket: WebSocket):
-    await websocket.accept()
-    try:
-        while True:
-            data = await hw.get_telemetry()
-
-            # Определяем частоту: 5Гц для любых активных состояний (включая DONE и STOPPED для точного таймера),
-            # и 1Гц только для полного IDLE
-            is_active = any(
-                g.get("state") != "IDLE"
-                for g in [data.get("left", {}), data.get("right", {})]
-            )
-
-            # Отправляем раздельные пакеты
-            for key in ["machine", "left", "right"]:
-                if key in data:
-                    await websocket.send_json({
-                        "topic": key,
-                        "payload": data[key]
-                    })
-
-            # Ждем либо следующего тика (0.2с / 1.0с), либо мгновенного события обновления
-            delay = 0.2 if is_active else 1.0
-            try:
-                await asyncio.wait_for(hw.telemetry_updated.wait(), timeout=delay)
-                hw.telemetry_updated.clear()
-            except asyncio.TimeoutError:
-                pass
-    except WebSocketDisconnect:
-        logging.info("Telemetry client disconnected")
-    except Exception as e:
-        logging.error(f"WebSocket error: {e}")
+    # Формат выбирается через subprotocol; без него — JSON, как раньше
+    offered = websocket.scope.get("subprotocols", [])
+    if BINARY_SUBPROTOCOL in offered:
+        await websocket.accept(subprotocol=BINARY_SUBPROTOCOL)
+        # Коды топиков зависят от конфига "groups": клиент узнает их первым сообщением
+        await websocket.send_json({"type": "topic_ids", "topics": BINARY_TOPICS})
+        encoder = BinaryEncoder(BINARY_TOPICS)
+    else:
+        await websocket.accept(subprotocol=JSON_SUBPROTOCOL if JSON_SUBPROTOCOL in offered else None)
+        # ?delta=0 — полные кадры {"topic","payload"} для простых клиентов
+        encoder = DeltaEncoder(enabled=websocket.query_params.get("delta") != "0")
+
+    await telemetry_session.serve(websocket, broadcaster, encoder)
+
+@app.get("/api/telemetry/clients")
+async def telemetry_clients():
+    stats = broadcaster.stats()
+    stats.update(hw.stats())
+    return stats
 
 # --- Control API (Mock) ---
+# Те же команды доступны через WebSocket (см. telemetry/session.py).
+# {side} — имя группы или ее id (номер в конфиге "groups")
+def _control(command, side, profile=None):
+    try:
+        return {"status": control.execute(hw, command, side, profile)}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/api/groups")
+async def list_groups():
+    """Группы машины: id, имя (оно же топик телеметрии) и текущее состояние."""
+    return [{"id": g.index, "name": g.side, "state": g.state} for g in hw.group_list]
+
 @app.post("/api/control/start/{side}")
 async def start_extraction(side: str, profile: dict):
-    hw.start_extraction(side, profile)
-    return {"status": "started"}
+    return _control("start", side, profile)
 
 @app.post("/api/control/stop/{side}")
 async def stop_extraction(side: str):
-    hw.stop_extraction(side)
-    return {"status": "stopped"}
+    return _control("stop", side)
 
 @app.post("/api/control/flush/{side}")
 async def start_flush(side: str):
-    hw.start_flush(side)
-    return {"status": "flushing"}
+    return _control("flush", side)
 
 @app.post("/api/control/cleaning/{side}")
 async def start_cleaning(side: str):
-    hw.start_cleaning(side)
-    return {"status": "cleaning"}
+    return _control("cleaning", side)
 
 @app.post("/api/control/reset/{side}")
 async def reset_group(side: str):
-    hw.reset_group(side)
-    return {"status": "reset"}
+    return _control("reset", side)
+
+# --- Shots API ---
+@app.get("/api/shots/live/{side}")
+async def live_shot(side: str, points: Optional[int] = None):
+    """
+    Кривая текущего (или последнего завершенного) шота группы.
+    ?points=N — прореженная до N точек (LTTB), для отрисовки на киоске.
+    """
+    group = hw.group(side)
+    recorder = hw.recorders.get(group.side) if group else None
+    curve = recorder.curve() if recorder else None
+    if curve is None:
+        raise HTTPException(status_code=404, detail="No shot recorded")
+    if points:
+        key = ("live", group.side, curve["shot_id"]) if curve["state"] != "RECORDING" else None
+        return downsample_curve(curve, points, key=key)
+    return curve
+
+@app.get("/api/shots")
+async def list_shots(
+    side: Optional[str] = None,
+    profile_id: Optional[int] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 50,
+    offset: int = 0,
+):
+    """История шотов (новые первыми). Фильтры по группе, профилю и времени (unix ts)."""
+    # Лок хранилища держит append через два fsync — читаем вне event loop
+    def query():
+        return {
+            "total": len(shot_store),
+            "shots": shot_store.list(side, profile_id, since, until, min(max(limit, 0), 500), max(offset, 0)),
+        }
+    return await asyncio.get_running_loop().run_in_executor(None, query)
+
+@app.get("/api/shots/{shot_id}")
+async def get_shot(shot_id: int, points: Optional[int] = None):
+    shot = await asyncio.get_running_loop().run_in_executor(None, shot_store.get, shot_id)
+    if shot is None:
+        raise HTTPException(status_code=404, detail="Shot not found")
+    if points:
+        return downsample_curve(shot, points, key=("history", shot_id))
+    return shot
 
 # Раздача статики фронтенда
 if os.path.exists(FRONTEND_PATH):
@@ -0,0 +1,112 @@
+"""
+Метрики бэкенда в текстовом формате Prometheus (GET /metrics).
+
+Горячие пути пишут только в готовые счетчики и гистограммы (histogram.py):
+корзины выделены заранее, observe() — bisect и инкремент, без аллокаций.
+Формат собирается лишь при запросе /metrics: гистограммы в мс переводятся
+в секунды, корзины — в накопительные (le), как ждет Prometheus.
+
+Метрики не из Histogram (число клиентов, счетчики кадров) читаются
+функциями-источниками в момент запроса — горячий путь их не трогает.
+"""
+import asyncio
+import time
+
+from histogram import Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LOOP_LAG_INTERVAL = 0.5  # с между проверками лага event loop
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """
+    Семейства метрик: name -> (type, help, source).
+    source() -> [(labels, value)], где labels — кортеж пар (ключ, значение),
+    value — число (counter/gauge) или Histogram в мс (histogram).
+    """
+
+    def __init__(self):
+        self.families = {}
+
+    def register(self, name, kind, help, source):
+        self.families[name] = (kind, help, source)
+
+    def histogram(self, name, help, bounds=None):
+        """Гистограмма без меток: создается один раз, в горячем пути — только observe()."""
+        hist = Histogram(bounds) if bounds else Histogram()
+        self.register(name, "histogram", help, lambda: [((), hist)])
+        return hist
+
+    def render(self):
+        out = []
+        for name, (kind, help, source) in self.families.items():
+            out.append(f"# HELP {name} {help}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, value in source():
+                if kind == "histogram":
+                    _render_histogram(out, name, labels, value)
+                else:
+                    out.append(f"{name}{_labels(labels)} {_number(value)}")
+        out.append("")
+        return "\n".join(out)
+
+
+def _render_histogram(out, name, labels, hist):
+    cumulative = 0
+    for bound, n in zip(hist.bounds, hist.counts):
+        cumulative += n
+        out.append(f"{name}_bucket{_labels(labels + (('le', _number(bound / 1000)),))} {cumulative}")
+    out.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {hist.count}")
+    out.append(f"{name}_sum{_labels(labels)} {_number(hist.sum / 1000)}")
+    out.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+
+class RouteTimer:
+    """
+    ASGI-обертка: время HTTP-запроса по шаблону маршрута (/api/shots/{shot_id}),
+    а не по пути — число серий ограничено числом маршрутов.
+    Гистограмма маршрута создается при первом запросе к нему.
+    """
+
+    def __init__(self, app, routes=None):
+        self.app = app
+        self.routes = routes if routes is not None else {}  # path -> Histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "other"
+            hist = self.routes.get(path)
+            if hist is None:
+                hist = self.routes[path] = Histogram()
+            hist.observe((time.perf_counter() - t0) * 1000)
+
+
+async def loop_lag_monitor(hist, interval=LOOP_LAG_INTERVAL):
+    """Лаг event loop: на сколько пробуждение опоздало к сроку (мс)."""
+    loop = asyncio.get_running_loop()
+    while True:
+        deadline = loop.time() + interval
+        await asyncio.sleep(interval)
+        hist.observe(max(loop.time() - deadline, 0.0) * 1000)
@@ -1,7 +1,9 @@
 import os
 import sys
 import json
+import time
 import logging
+import subprocess
 
 # Добавляем путь к системным библиотекам для импорта hu_config
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -31,8 +33,71 @@ if os.name == 'nt':
     # Создаем директорию если ее нет
     os.makedirs(os.path.dirname(hu_config.USER_CONFIG_FILE), exist_ok=True)
 
+# Отдельный файл настроек пользователя (нагрузочный тест не трогает настройки машины)
+if os.environ.get("HEADUNIT_USER_CONFIG"):
+    hu_config.USER_CONFIG_FILE = os.environ["HEADUNIT_USER_CONFIG"]
+
+# --- Кэш конфигурации ---
+# load_config() читает и парсит два JSON-файла. На горячем пути (телеметрия)
+# читаем снимок из памяти; изменение файлов извне (headunit-config, OTA)
+# ловим по mtime/size не чаще раза в CHECK_INTERVAL секунд.
+CHECK_INTERVAL = 1.0
+
+_cache = None
+_cache_stamp = None
+_checked_at = 0.0
+
+
+def _config_files():
+    return [getattr(hu_config, "FACTORY_CONFIG_FILE", None), hu_config.USER_CONFIG_FILE]
+
+
+def _files_stamp():
+    stamp = []
+    for path in _config_files():
+        try:
+            st = os.stat(path) if path else None
+            stamp.append((st.st_mtime_ns, st.st_size) if st else None)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _snapshot():
+    global _cache, _cache_stamp, _checked_at
+    now = time.monotonic()
+    if _cache is not None and now - _checked_at < CHECK_INTERVAL:
+        return _cache
+
+    _checked_at = now
+    stamp = _files_stamp()
+    if _cache is None or stamp != _cache_stamp:
+        _cache = hu_config.load_config()
+        _cache_stamp = stamp
+    return _cache
+
+
+def _update_cache(cfg):
+    """Обновляет кэш после собственной записи, не дожидаясь проверки mtime."""
+    global _cache, _cache_stamp, _checked_at
+    _cache = dict(cfg)
+    _cache_stamp = _files_stamp()
+    _checked_at = time.monotonic()
+
+
+def invalidate_cache():
+    global _cache
+    _cache = None
+
+
 def get_settings():
-    return hu_config.load_config()
+    """Копия текущей конфигурации (из кэша)."""
+    return dict(_snapshot())
+
+
+def get_setting(key, default=None):
+    """Одно значение без копирования — для горячего пути."""
+    return _snapshot().get(key, default)
 
 
 
@@ -49,7 +114,12 @@ def _check_ntp_availability():
     except Exception:
         return False
 
-def update_settings(new_settings):
+def update_settings(new_settings, progress=None):
+    """
+    Применяет и сохраняет настройки. Блокирующая (subprocess), поэтому из API
+    вызывается в фоновой задаче (см. jobs.py). progress(step) — отметка шага.
+    """
+    progress = progress or (lambda step: None)
     cfg = hu_config.load_config()
 
     # 1. Логика NTP и Timezone (дефолты если нет)
@@ -59,6 +129,7 @@ def update_settings(new_settings):
 
     # Обработка system_time (Ручная установка)
     if "system_time" in new_settings:
+        progress("system_time")
         manual_time = new_settings.pop("system_time") # Удаляем, чтобы не сохранять в конфиг
         logging.info(f"Setting manual time: {manual_time}")
 
@@ -77,6 +148,7 @@ def update_settings(new_settings):
 
     # Обработка NTP
     if "ntp_enabled" in new_settings:
+        progress("ntp")
         ntp_state = new_settings["ntp_enabled"]
         if ntp_state:
             # Если включаем NTP - проверяем доступность
@@ -95,6 +167,7 @@ def update_settings(new_settings):
 
     # Обработка Timezone
     if "timezone" in new_settings and new_settings["timezone"] != cfg.get("timezone"):
+        progress("timezone")
         tz = new_settings["timezone"]
         if os.name == 'nt':
             logging.info(f"[MOCK] timedatectl set-timezone {tz}")
@@ -106,11 +179,14 @@ def update_settings(new_settings):
 
     cfg.update(new_settings)
 
+    progress("save")
     if hu_config.save_config(cfg):
+        _update_cache(cfg)
+
         # На реальном устройстве вызываем применение остальных настроек (сеть и т.д.)
         if os.name != 'nt':
+            progress("apply_config")
             try:
-                import subprocess
                 subprocess.run(["sudo", "/usr/local/bin/headunit-apply-config"], check=True)
             except Exception as e:
                 logging.error(f"Failed to apply settings: {e}")
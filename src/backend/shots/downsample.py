@@ -0,0 +1,122 @@
+"""
+Прореживание кривых шота для отрисовки на киоске.
+
+LTTB (Largest-Triangle-Three-Buckets) сразу по всем полям кривой:
+в каждой корзине выбирается точка с максимальной суммой нормированных
+площадей треугольников по всем полям, поэтому все колонки делят одни и те же
+индексы (общая ось времени для графика), а пики любого поля сохраняются.
+
+numpy используется, если установлен; иначе — чистый python (медленнее,
+но с тем же результатом).
+"""
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # Старые образы без numpy в services/requirements.txt
+    np = None
+
+CACHE_SIZE = 32
+_cache = OrderedDict()  # (key, points) -> результат
+
+
+def _lttb_indices_np(x, ys, points):
+    n = len(x)
+    # Нормируем поля к диапазону [0, 1], чтобы площади были сравнимы
+    span = ys.max(axis=1, keepdims=True) - ys.min(axis=1, keepdims=True)
+    span[span == 0] = 1.0
+    ys = (ys - ys.min(axis=1, keepdims=True)) / span
+    xs = (x - x[0]) / ((x[-1] - x[0]) or 1.0)
+
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    out = np.empty(points, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nlo, nhi = hi, max(edges[i + 2] if i + 2 < len(edges) else n, hi + 1)
+        # Вершина C — среднее следующей корзины
+        cx = xs[nlo:nhi].mean()
+        cy = ys[:, nlo:nhi].mean(axis=1, keepdims=True)
+        bx = xs[lo:hi]
+        by = ys[:, lo:hi]
+        area = np.abs((xs[a] - cx) * (by - ys[:, a:a + 1]) - (xs[a] - bx) * (cy - ys[:, a:a + 1])).sum(axis=0)
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def _lttb_indices_py(x, ys, points):
+    n = len(x)
+    norm = []
+    for col in ys:
+        lo, hi = min(col), max(col)
+        span = (hi - lo) or 1.0
+        norm.append([(v - lo) / span for v in col])
+    x_span = (x[-1] - x[0]) or 1.0
+    xs = [(v - x[0]) / x_span for v in x]
+
+    step = (n - 2) / (points - 2)
+    edges = [1 + int(i * step) for i in range(points - 1)]
+    edges[-1] = n - 1
+    out = [0]
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nlo, nhi = hi, max(edges[i + 2] if i + 2 < len(edges) else n, hi + 1)
+        cx = sum(xs[nlo:nhi]) / (nhi - nlo)
+        cys = [sum(col[nlo:nhi]) / (nhi - nlo) for col in norm]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = 0.0
+            for col, cy in zip(norm, cys):
+                area += abs((xs[a] - cx) * (col[j] - col[a]) - (xs[a] - xs[j]) * (cy - col[a]))
+            if area > best_area:
+                best, best_area = j, area
+        a = best
+        out.append(a)
+    out.append(n - 1)
+    return out
+
+
+def lttb(data, points, x_field="t"):
+    """
+    Прореживает колоночные данные {field: [values]} до `points` точек.
+    Возвращает новый dict с теми же полями.
+    """
+    x = data[x_field]
+    n = len(x)
+    if points >= n or points < 3:
+        return {k: list(v) for k, v in data.items()}
+
+    fields = [k for k in data if k != x_field]
+    if np is not None:
+        xa = np.asarray(x, dtype=np.float64)
+        ya = np.asarray([data[k] for k in fields], dtype=np.float64)
+        idx = _lttb_indices_np(xa, ya, points)
+        return {k: np.asarray(data[k], dtype=np.float64)[idx].tolist() for k in data}
+
+    idx = _lttb_indices_py(x, [data[k] for k in fields], points)
+    return {k: [data[k][i] for i in idx] for k in data}
+
+
+def downsample_curve(curve, points, key=None):
+    """
+    Прореживает кривую шота (колонки в curve["data"]) с кэшем по (key, points).
+    key=None — без кэша (например, шот еще записывается).
+    """
+    if key is not None:
+        key = (key, points)
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    result = {k: v for k, v in curve.items() if k != "data"}
+    result["data"] = lttb(curve["data"], points)
+    result["points"] = len(result["data"]["t"])
+
+    if key is not None:
+        _cache[key] = result
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
@@ -0,0 +1,249 @@
+"""
+Persistent история шотов на /data.
+
+Два файла:
+  shots.log — append-only лог записей шотов (бинарный, колонки float32);
+  shots.idx — индекс фиксированного размера: одна запись на шот
+              (id, время, группа, профиль, итог, смещение в логе).
+
+Индекс целиком держится в памяти (десятки тысяч шотов — единицы МБ),
+id шота = номер записи в индексе + 1, поэтому выборка по id — O(1),
+а фильтр по времени — bisect по отсортированному started_at. Шот пишется,
+когда кончился, а не когда начался (две группы, шаг часов по NTP), поэтому
+порядок по времени — отдельный индекс (by_time), а не порядок id.
+Один шот — одна запись в лог и одна в индекс, без перезаписи старых данных.
+Писатель может жить в другом процессе (hardware/process.py): перед чтением
+индекс дочитывается с места, где остановились (refresh()).
+"""
+import bisect
+import logging
+import math
+import os
+import struct
+import threading
+import zlib
+from array import array
+
+from hardware.protocol import profile_code
+
+STATES = ["DONE", "STOPPED", "ERROR"]
+
+# Заголовок записи лога: magic, shot_id, started_at, sample_rate, samples, n_fields
+LOG_HEADER = struct.Struct("<4sIdHIB")
+LOG_MAGIC = b"SHOT"
+# Хвост записи после колонок: target_yield, overshoot (NaN — нет). В старых записях его нет
+LOG_META = struct.Struct("<ff")
+# Запись индекса: shot_id, started_at, duration, yield, side, profile_id, state, offset, length
+INDEX_RECORD = struct.Struct("<Idff8siBQI")
+CRC = struct.Struct("<I")
+
+
+class ShotStore:
+    FIELDS = ("t", "temp", "pressure", "flowIn", "flowOut", "yield")
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        self.readonly = readonly  # Чужая история (трасса replay): без записи и обрезки хвоста
+        self.log_path = os.path.join(path, "shots.log")
+        self.index_path = os.path.join(path, "shots.idx")
+        self.lock = threading.Lock()
+        # Колонки индекса в памяти
+        self.started_at = array("d")  # Отсортированы по времени
+        self.by_time = array("I")  # Номер записи в entries для started_at[i]
+        self.entries = []  # tuple(INDEX_RECORD) по порядку id
+        self._index_bytes = 0  # Сколько байт индекса уже загружено
+        self._load_index()
+
+    # --- Индекс ---
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        size = os.path.getsize(self.index_path)
+        valid = self._read_index()
+        if valid != size and not self.readonly:
+            logging.warning(f"[SHOTS] Truncating damaged index tail at {valid} bytes")
+            with open(self.index_path, "r+b") as f:
+                f.truncate(valid)
+
+    def _read_index(self):
+        """Дочитывает целые записи индекса после уже загруженных. Возвращает загруженный размер."""
+        log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_bytes)
+            data = f.read()
+
+        valid = len(data) - len(data) % INDEX_RECORD.size
+        for offset in range(0, valid, INDEX_RECORD.size):
+            rec = INDEX_RECORD.unpack_from(data, offset)
+            # Индекс пишется после лога; запись за концом лога — след сбоя питания
+            if rec[7] + rec[8] > log_size:
+                valid = offset
+                break
+            self.entries.append(rec)
+            self._index_time(rec[1])
+        self._index_bytes += valid
+        return self._index_bytes
+
+    def _index_time(self, started_at):
+        """Вставка последней записи entries в индекс по времени (обычно — в конец)."""
+        pos = bisect.bisect_right(self.started_at, started_at)
+        self.started_at.insert(pos, started_at)
+        self.by_time.insert(pos, len(self.entries) - 1)
+
+    def refresh(self):
+        """Подхватывает шоты, дописанные другим процессом (хвост без обрезки — запись может идти)."""
+        with self.lock:
+            try:
+                if os.path.getsize(self.index_path) > self._index_bytes:
+                    self._read_index()
+            except OSError:
+                pass
+
+    def __len__(self):
+        self.refresh()
+        return len(self.entries)
+
+    @staticmethod
+    def _summary(rec):
+        shot_id, started_at, duration, yld, side, profile_id, state, _, _ = rec
+        return {
+            "id": shot_id,
+            "started_at": started_at,
+            "duration": round(duration, 2),
+            "yield": round(yld, 2),
+            "side": side.rstrip(b"\0").decode(),
+            "profile_id": profile_id if profile_id >= 0 else None,
+            "state": STATES[state],
+        }
+
+    # --- Запись ---
+
+    def append(self, curve):
+        """
+        Сохраняет завершенный шот (формат ShotRecorder.curve()).
+        Вызывается из фонового потока: блокирующий I/O не трогает event loop.
+        """
+        if self.readonly:
+            raise RuntimeError("shot store is read-only")
+        data = curve["data"]
+        count = curve["samples"]
+        if count == 0:
+            return None  # Остановлен до первого сэмпла — сохранять нечего
+        fields = [f for f in self.FIELDS if f in data]
+
+        with self.lock:
+            shot_id = len(self.entries) + 1
+            body = LOG_HEADER.pack(
+                LOG_MAGIC, shot_id, curve["started_at"], curve.get("sample_rate", 0), count, len(fields)
+            )
+            body += "".join(f"{f}\0" for f in fields).encode()
+            for f in fields:
+                body += array("f", data[f]).tobytes()
+            body += LOG_META.pack(*(
+                math.nan if curve.get(key) is None else curve[key] for key in ("target_yield", "overshoot")
+            ))
+            body += CRC.pack(zlib.crc32(body))
+
+            os.makedirs(self.path, exist_ok=True)
+            with open(self.log_path, "ab") as f:
+                offset = f.tell()
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+
+            state = curve.get("state")
+            rec = (
+                shot_id,
+                curve["started_at"],
+                data["t"][-1],
+                data["yield"][-1],
+                curve["side"].encode()[:8],
+                profile_code(curve.get("profile_id")),
+                STATES.index(state) if state in STATES else STATES.index("STOPPED"),
+                offset,
+                len(body),
+            )
+            with open(self.index_path, "ab") as f:
+                f.write(INDEX_RECORD.pack(*rec))
+                f.flush()
+                os.fsync(f.fileno())
+            self._index_bytes += INDEX_RECORD.size
+
+            # Читатели видят шот только после того, как он на диске
+            self.entries.append(INDEX_RECORD.unpack(INDEX_RECORD.pack(*rec)))
+            self._index_time(rec[1])
+        return shot_id
+
+    # --- Чтение ---
+
+    def list(self, side=None, profile_id=None, since=None, until=None, limit=50, offset=0):
+        """Сводки шотов, новые (по started_at) первыми. Лог не читается — только индекс в памяти."""
+        if limit <= 0:
+            return []
+        self.refresh()
+        with self.lock:
+            lo = bisect.bisect_left(self.started_at, since) if since is not None else 0
+            hi = bisect.bisect_right(self.started_at, until) if until is not None else len(self.entries)
+            side_key = side.encode()[:8].ljust(8, b"\0") if side else None
+
+            result = []
+            skipped = 0
+            for i in range(hi - 1, lo - 1, -1):
+                rec = self.entries[self.by_time[i]]
+                if side_key is not None and rec[4] != side_key:
+                    continue
+                if profile_id is not None and rec[5] != profile_id:
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                result.append(self._summary(rec))
+                if len(result) >= limit:
+                    break
+            return result
+
+    def get(self, shot_id):
+        """Полная кривая шота по id: одно чтение из лога по смещению из индекса."""
+        self.refresh()
+        with self.lock:
+            if not 1 <= shot_id <= len(self.entries):
+                return None
+            rec = self.entries[shot_id - 1]
+
+        with open(self.log_path, "rb") as f:
+            f.seek(rec[7])
+            body = f.read(rec[8])
+
+        payload, (crc,) = body[:-CRC.size], CRC.unpack(body[-CRC.size:])
+        if zlib.crc32(payload) != crc:
+            logging.error(f"[SHOTS] CRC mismatch for shot {shot_id}")
+            return None
+
+        magic, _, _, sample_rate, count, n_fields = LOG_HEADER.unpack_from(payload, 0)
+        if magic != LOG_MAGIC:
+            return None
+        pos = LOG_HEADER.size
+        names = []
+        for _ in range(n_fields):
+            end = payload.index(b"\0", pos)
+            names.append(payload[pos:end].decode())
+            pos = end + 1
+
+        columns = {}
+        for name in names:
+            col = array("f")
+            col.frombytes(payload[pos:pos + 4 * count])
+            columns[name] = [round(v, 3) for v in col]
+            pos += 4 * count
+
+        target, overshoot = LOG_META.unpack_from(payload, pos) if len(payload) - pos >= LOG_META.size else (math.nan, math.nan)
+        result = self._summary(rec)
+        result.update(
+            sample_rate=sample_rate,
+            samples=count,
+            target_yield=None if math.isnan(target) else round(target, 2),
+            overshoot=None if math.isnan(overshoot) else round(overshoot, 2),
+            data=columns,
+        )
+        return result
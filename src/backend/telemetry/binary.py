@@ -0,0 +1,147 @@
+import struct
+
+from hardware.protocol import STATES, WATER_LEVELS, parse_time
+from telemetry.delta import DeltaEncoder
+
+# WebSocket subprotocol-ы. Клиент без subprotocol получает JSON (как раньше).
+JSON_SUBPROTOCOL = "headunit.telemetry.json.v1"
+BINARY_SUBPROTOCOL = "headunit.telemetry.bin.v1"
+
+# Коды state и water_level — индексы в STATES/WATER_LEVELS из hardware/protocol.py
+# (те же, что у контроллера). Синхронизировано с src/frontend/src/utils/telemetryCodec.js
+TOPIC_IDS = {"machine": 0, "left": 1, "right": 2}  # Для групп по умолчанию, см. topic_ids()
+
+# Заголовок: topic_id (u8), flags (u8), seq (u16)
+HEADER = struct.Struct("<BBH")
+# Группа: temp, pressure, flowIn, flowOut, yield (f32), elapsed сек (u16), state (u8), bits (u8)
+GROUP = struct.Struct("<fffffHBB")
+# Машина: boiler_temp, steam_pressure (f32), water_level (u8)
+MACHINE = struct.Struct("<ffB")
+# Необязательные блоки после тела группы, в порядке флагов.
+# Поля зафиксированы здесь, а не взяты из драйвера: это раскладка на проводе.
+WINDOW_FIELDS = ("temp", "pressure", "flowIn", "flowOut", "yield")  # HardwareBase.SENSOR_FIELDS
+LIVE_FIELDS = ("temp", "pressure", "flowIn", "flowOut")  # hardware/profile.py TRACKED
+# Окно: samples (u16), затем min, max, mean по WINDOW_FIELDS (f32)
+WINDOW = struct.Struct("<H" + "f" * 3 * len(WINDOW_FIELDS))
+# Профиль: target, deviation по LIVE_FIELDS (f32)
+LIVE = struct.Struct("<" + "f" * 2 * len(LIVE_FIELDS))
+
+FLAG_KEY = 0x01
+FLAG_WINDOW = 0x02  # После тела группы — блок WINDOW ("window")
+FLAG_LIVE = 0x04  # Затем блок LIVE ("target", "deviation")
+BIT_DONE = 0x01
+BIT_ACTIVE = 0x02
+
+_STATE_IDS = {s: i for i, s in enumerate(STATES)}
+_WATER_IDS = {w: i for i, w in enumerate(WATER_LEVELS)}
+
+
+def topic_ids(groups):
+    """Коды топиков машины: machine = 0, группа = 1 + ее id (номер в конфиге "groups")."""
+    if len(groups) > 254:
+        raise ValueError("too many groups for binary topics")
+    return {"machine": 0, **{side: i + 1 for i, side in enumerate(groups)}}
+
+
+def pack_frame(topic, payload, seq=0, key=False, topics=TOPIC_IDS):
+    """
+    Упаковывает кадр топика в бинарный формат фиксированной раскладки.
+    Возвращает None, если для топика нет раскладки (его шлем JSON-ом).
+    """
+    topic_id = topics.get(topic)
+    if topic_id is None:
+        return None
+
+    flags = FLAG_KEY if key else 0
+    if topic == "machine":
+        return HEADER.pack(topic_id, flags, seq & 0xFFFF) + MACHINE.pack(
+            payload.get("boiler_temp", 0.0),
+            payload.get("steam_pressure", 0.0),
+            _WATER_IDS.get(payload.get("water_level"), 0),
+        )
+
+    bits = (BIT_DONE if payload.get("done") else 0) | (BIT_ACTIVE if payload.get("active") else 0)
+    body = GROUP.pack(
+        payload.get("temp", 0.0),
+        payload.get("pressure", 0.0),
+        payload.get("flowIn", 0.0),
+        payload.get("flowOut", 0.0),
+        payload.get("yield", 0.0),
+        min(parse_time(payload.get("time")), 0xFFFF),
+        _STATE_IDS.get(payload.get("state"), 0),
+        bits,
+    )
+    window = payload.get("window")
+    if window:
+        flags |= FLAG_WINDOW
+        body += WINDOW.pack(
+            min(window.get("samples", 0), 0xFFFF),
+            *(window.get(agg, {}).get(f, 0.0) for agg in ("min", "max", "mean") for f in WINDOW_FIELDS),
+        )
+    if "target" in payload and "deviation" in payload:
+        flags |= FLAG_LIVE
+        body += LIVE.pack(*(payload[part].get(f, 0.0) for part in ("target", "deviation") for f in LIVE_FIELDS))
+    return HEADER.pack(topic_id, flags, seq & 0xFFFF) + body
+
+
+def unpack_frame(data, topics=TOPIC_IDS):
+    """Обратная операция (для тестов, бенчмарка и python-клиентов)."""
+    topic_id, flags, seq = HEADER.unpack_from(data, 0)
+    topic = next(t for t, i in topics.items() if i == topic_id)
+
+    if topic == "machine":
+        boiler, steam, water = MACHINE.unpack_from(data, HEADER.size)
+        payload = {
+            "boiler_temp": round(boiler, 2),
+            "steam_pressure": round(steam, 2),
+            "water_level": WATER_LEVELS[water],
+        }
+    else:
+        temp, press, flow_in, flow_out, yld, elapsed, state, bits = GROUP.unpack_from(data, HEADER.size)
+        payload = {
+            "temp": round(temp, 2),
+            "pressure": round(press, 2),
+            "flowIn": round(flow_in, 2),
+            "flowOut": round(flow_out, 2),
+            "yield": round(yld, 2),
+            "time": f"{elapsed // 60}:{elapsed % 60:02d}",
+            "done": bool(bits & BIT_DONE),
+            "active": bool(bits & BIT_ACTIVE),
+            "state": STATES[state],
+        }
+        pos = HEADER.size + GROUP.size
+        if flags & FLAG_WINDOW:
+            samples, *values = WINDOW.unpack_from(data, pos)
+            pos += WINDOW.size
+            n = len(WINDOW_FIELDS)
+            payload["window"] = {"samples": samples, **{
+                agg: {f: round(v, 2) for f, v in zip(WINDOW_FIELDS, values[i * n:(i + 1) * n])}
+                for i, agg in enumerate(("min", "max", "mean"))
+            }}
+        if flags & FLAG_LIVE:
+            values = LIVE.unpack_from(data, pos)
+            n = len(LIVE_FIELDS)
+            payload["target"] = {f: round(v, 2) for f, v in zip(LIVE_FIELDS, values[:n])}
+            payload["deviation"] = {f: round(v, 2) for f, v in zip(LIVE_FIELDS, values[n:])}
+    return {"topic": topic, "seq": seq, "key": bool(flags & FLAG_KEY), "payload": payload}
+
+
+class BinaryEncoder(DeltaEncoder):
+    """
+    Кодировщик для BINARY_SUBPROTOCOL.
+    Кадр фиксированной раскладки и так компактен, поэтому вместо дельт
+    шлется полный бинарный кадр, но только если топик изменился
+    (или пора слать ключевой кадр). Топики без раскладки идут JSON-дельтами.
+    topics — коды топиков (topic_ids() по группам машины).
+    """
+
+    def __init__(self, topics=TOPIC_IDS, **kwargs):
+        super().__init__(**kwargs)
+        self.topics = topics
+
+    def encode(self, topic, payload):
+        msg = super().encode(topic, payload)
+        if msg is None:
+            return None
+        frame = pack_frame(topic, payload, msg["seq"], msg.get("key", False), self.topics)
+        return frame if frame is not None else msg
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+
+from histogram import Histogram
+from telemetry.subscriber import Subscriber
+
+
+class TelemetryBroadcaster:
+    """
+    Единственный продюсер телеметрии.
+    Опрашивает железо один раз за тик и раздает кадр всем подписчикам,
+    поэтому стоимость опроса не зависит от количества клиентов.
+    Каждый подписчик получает свою ограниченную очередь (см. Subscriber).
+    """
+
+    # Частота публикации (Гц) по состоянию группы; тик идет с максимальной частотой среди групп.
+    # Датчики опрашиваются чаще (hardware/acquisition.py), в кадр уходит агрегат за окно.
+    PUBLISH_RATES = {
+        "IDLE": 1.0,
+        "HEATING": 5.0,
+        "EXTRACTION": 5.0,
+        "FLUSH": 5.0,
+        "CLEANING": 5.0,
+        "DONE": 5.0,
+        "STOPPED": 5.0,
+        "ERROR": 5.0,
+    }
+    DEFAULT_RATE = 5.0  # Состояния, которых нет в таблице
+    ERROR_INTERVAL = 1.0  # После ошибки опроса железа
+
+    def __init__(self, hw, rates=None):
+        self.hw = hw
+        self.rates = {**self.PUBLISH_RATES, **(rates or {})}
+        self.subscribers = set()
+        self.last_frame = None
+        self.retained = {}  # Топики вне снимка железа (например, "jobs"), последнее значение
+        self._task = None
+        # Тайминг тиков продюсера
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.max_lateness = 0.0
+        self.tick_duration = Histogram()  # Опрос железа + раздача кадра, мс
+        # Счетчики отключившихся клиентов: суммы по клиентам не убывают (/metrics)
+        self.closed_sent = 0
+        self.closed_dropped = 0
+
+    def snapshot(self):
+        """Последние значения всех топиков."""
+        return {**(self.last_frame or {}), **self.retained}
+
+    def subscribe(self, name="client"):
+        """Регистрирует клиента. Сразу отдает последний кадр, чтобы не ждать тика."""
+        sub = Subscriber(name)
+        for topic, payload in self.snapshot().items():
+            sub.offer(topic, payload)
+        self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        if sub in self.subscribers:
+            self.subscribers.discard(sub)
+            self.closed_sent += sub.frames_sent
+            self.closed_dropped += sub.frames_dropped
+
+    def frame_totals(self):
+        """(отправлено, вытеснено) кадров за все время, включая отключившихся клиентов."""
+        subs = self.subscribers
+        return (
+            self.closed_sent + sum(s.frames_sent for s in subs),
+            self.closed_dropped + sum(s.frames_dropped for s in subs),
+        )
+
+    def topics(self):
+        return list(self.snapshot())
+
+    def stats(self):
+        return {
+            "clients": len(self.subscribers),
+            "ticks": self.ticks,
+            "missed_ticks": self.missed_ticks,
+            "max_tick_lateness_ms": round(self.max_lateness * 1000, 3),
+            "subscribers": [sub.stats() for sub in self.subscribers],
+        }
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def interval(self, data):
+        """Период следующего тика по состояниям групп в кадре."""
+        rates = [
+            self.rates.get(payload["state"], self.DEFAULT_RATE)
+            for payload in data.values()
+            if isinstance(payload, dict) and "state" in payload
+        ]
+        return 1.0 / max(rates, default=self.rates["IDLE"])
+
+    def publish(self, data):
+        self.last_frame = data
+        now = time.monotonic()
+        for sub in self.subscribers:
+            for topic, payload in data.items():
+                if sub.wants(topic, now):
+                    sub.offer(topic, payload)
+
+    def publish_topic(self, topic, payload):
+        """Публикует отдельный топик вне тика (значение запоминается для новых клиентов)."""
+        self.retained[topic] = payload
+        now = time.monotonic()
+        for sub in self.subscribers:
+            if sub.wants(topic, now):
+                sub.offer(topic, payload)
+
+    def _track_tick(self, deadline, delay):
+        """Опоздание тика относительно плана. Пропущенным считаем опоздание > половины периода."""
+        self.ticks += 1
+        lateness = time.monotonic() - deadline
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+        if lateness > delay / 2:
+            self.missed_ticks += 1
+
+    async def refresh(self):
+        """Внеочередной опрос и публикация (например, сразу после команды)."""
+        data = await self.hw.get_telemetry()
+        self.hw.telemetry_updated.clear()
+        self.publish(data)
+        return data
+
+    async def _run(self):
+        while True:
+            try:
+                t0 = time.perf_counter()
+                data = await self.hw.get_telemetry()
+                self.publish(data)
+                self.tick_duration.observe((time.perf_counter() - t0) * 1000)
+                delay = self.interval(data)
+            except Exception as e:
+                logging.error(f"[TELEMETRY] Producer error: {e}")
+                delay = self.ERROR_INTERVAL
+
+            # Ждем либо следующего тика, либо мгновенного события обновления.
+            # Событие сбрасывает только продюсер, поэтому ни один клиент его не "проглотит".
+            deadline = time.monotonic() + delay
+            try:
+                await asyncio.wait_for(self.hw.telemetry_updated.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                self._track_tick(deadline, delay)
+            self.hw.telemetry_updated.clear()
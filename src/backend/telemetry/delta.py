@@ -0,0 +1,60 @@
+import time
+
+
+class DeltaEncoder:
+    """
+    Дельта-кодирование кадров телеметрии для одного соединения.
+
+    Протокол (JSON):
+      keyframe: {"topic": t, "seq": n, "key": true, "payload": {...}}
+      delta:    {"topic": t, "seq": n, "delta": {...}, "removed": [...]}
+
+    Ключевой кадр отправляется при подключении и далее раз в KEYFRAME_INTERVAL,
+    между ними — только изменившиеся поля. Если топик не изменился, кадр не
+    отправляется вовсе. Дельта считается от последнего *отправленного* кадра,
+    поэтому пропуск устаревших кадров в очереди Subscriber не ломает цепочку.
+    """
+
+    KEYFRAME_INTERVAL = 10.0  # сек
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.last_sent = {}   # topic -> payload
+        self.seq = {}         # topic -> последний номер
+        self.last_key = {}    # topic -> monotonic время последнего keyframe
+
+    def reset(self, topic=None):
+        """Форсирует ключевой кадр для топика (или всех топиков)."""
+        if topic is None:
+            self.last_sent.clear()
+        else:
+            self.last_sent.pop(topic, None)
+
+    def _next_seq(self, topic):
+        seq = self.seq.get(topic, 0) + 1
+        self.seq[topic] = seq
+        return seq
+
+    def encode(self, topic, payload):
+        """Возвращает сообщение для отправки или None, если изменений нет."""
+        if not self.enabled:
+            return {"topic": topic, "payload": payload}
+
+        now = time.monotonic()
+        prev = self.last_sent.get(topic)
+
+        if prev is None or now - self.last_key.get(topic, 0) >= self.KEYFRAME_INTERVAL:
+            self.last_sent[topic] = payload
+            self.last_key[topic] = now
+            return {"topic": topic, "seq": self._next_seq(topic), "key": True, "payload": payload}
+
+        delta = {k: v for k, v in payload.items() if k not in prev or prev[k] != v}
+        removed = [k for k in prev if k not in payload]
+        if not delta and not removed:
+            return None
+
+        self.last_sent[topic] = payload
+        msg = {"topic": topic, "seq": self._next_seq(topic), "delta": delta}
+        if removed:
+            msg["removed"] = removed
+        return msg
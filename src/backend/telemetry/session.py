@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import time
+
+from fastapi import WebSocketDisconnect
+
+import control
+from telemetry.subscriber import ALL_TOPICS
+
+
+class TelemetrySession:
+    """
+    Одно соединение /ws/telemetry: отправка кадров из очереди Subscriber
+    и прием управляющих сообщений клиента.
+
+    Сообщения клиента (JSON):
+      {"type": "subscribe", "topics": {"left": {"max_hz": 1}, "machine": {}}}
+      {"type": "unsubscribe", "topics": ["left", "right"]}   # "*" — от всех
+      {"type": "list"}                                       # доступные топики
+      {"type": "command", "id": 1, "command": "start", "side": "left", "profile": {...}}
+
+    На команду приходит {"type": "ack", "id": 1, "ok": true, "status": "started"},
+    следом — кадр с новым состоянием на этом же соединении.
+    """
+
+    def __init__(self, websocket, broadcaster, encoder, sub):
+        self.websocket = websocket
+        self.broadcaster = broadcaster
+        self.encoder = encoder
+        self.sub = sub
+
+    async def run(self):
+        tasks = [
+            asyncio.create_task(self._send_loop()),
+            asyncio.create_task(self._recv_loop()),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()  # Пробрасываем исключение завершившейся задачи
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _send_loop(self):
+        while True:
+            # Забираем только актуальные кадры: устаревшие уже вытеснены в очереди
+            for topic, payload in await self.sub.next_batch():
+                msg = self.encoder.encode(topic, payload)
+                if msg is None:
+                    continue
+                t0 = time.perf_counter()
+                if isinstance(msg, bytes):
+                    await self.websocket.send_bytes(msg)
+                else:
+                    await self.websocket.send_json(msg)
+                self.sub.mark_sent(send_ms=(time.perf_counter() - t0) * 1000)
+
+    async def _recv_loop(self):
+        while True:
+            text = await self.websocket.receive_text()
+            try:
+                msg = json.loads(text)
+                if msg.get("type") == "command":
+                    await self._command(msg)
+                    continue
+                reply = self.handle_message(msg)
+            except (ValueError, TypeError, AttributeError) as e:
+                reply = {"type": "error", "error": f"bad message: {e}"}
+            if reply is not None:
+                await self.websocket.send_json(reply)
+
+    async def _command(self, msg):
+        ack = {"type": "ack", "id": msg.get("id")}
+        try:
+            ack["status"] = control.execute(self.broadcaster.hw, msg.get("command"), msg.get("side"), msg.get("profile"))
+            ack["ok"] = True
+        except Exception as e:
+            ack.update(ok=False, error=str(e))
+        await self.websocket.send_json(ack)
+
+        if ack["ok"]:
+            # Новое состояние публикуем сразу, не дожидаясь тика продюсера
+            await self.broadcaster.refresh()
+
+    def handle_message(self, msg):
+        kind = msg.get("type")
+
+        if kind == "subscribe":
+            topics = msg.get("topics", {})
+            if isinstance(topics, list):
+                topics = {t: {} for t in topics}
+            for topic, opts in topics.items():
+                self.sub.subscribe(topic, (opts or {}).get("max_hz"))
+                self._prime(topic)
+            return {"type": "subscribed", "topics": self.sub.subscriptions()}
+
+        if kind == "unsubscribe":
+            for topic in msg.get("topics", []):
+                self.sub.unsubscribe(topic)
+            return {"type": "subscribed", "topics": self.sub.subscriptions()}
+
+        if kind == "list":
+            return {"type": "topics", "topics": self.broadcaster.topics()}
+
+        return {"type": "error", "error": f"unknown message type: {kind}"}
+
+    def _prime(self, topic):
+        """Новая подписка сразу получает ключевой кадр из последнего снимка."""
+        frame = self.broadcaster.snapshot()
+        topics = list(frame) if topic == ALL_TOPICS else [topic]
+        for t in topics:
+            if t in frame:
+                self.encoder.reset(t)
+                self.sub.offer(t, frame[t])
+
+
+async def serve(websocket, broadcaster, encoder):
+    client = websocket.client
+    sub = broadcaster.subscribe(f"{client.host}:{client.port}" if client else "client")
+    try:
+        await TelemetrySession(websocket, broadcaster, encoder, sub).run()
+    except WebSocketDisconnect:
+        logging.info("Telemetry client disconnected")
+    except Exception as e:
+        logging.error(f"WebSocket error: {e}")
+    finally:
+        broadcaster.unsubscribe(sub)
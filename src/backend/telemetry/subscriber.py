@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+from histogram import Histogram
+
+ALL_TOPICS = "*"
+_OFF = None  # Явная отписка от топика при подписке на "*"
+
+
+class Subscriber:
+    """
+    Очередь отправки одного клиента телеметрии.
+    На каждый топик хранится только последний кадр (latest-value-wins):
+    если клиент не успел отправить предыдущий кадр, тот считается устаревшим
+    и заменяется новым. Очередь ограничена количеством топиков,
+    поэтому медленный клиент пропускает кадры, а не копит задержку.
+
+    Клиент получает только топики, на которые подписан, не чаще
+    запрошенной частоты. По умолчанию — все топики без ограничения.
+    """
+
+    def __init__(self, name="client"):
+        self.name = name
+        self.connected_at = time.time()
+        self.pending = {}  # topic -> payload
+        self.ready = asyncio.Event()
+        # topic (или "*") -> минимальный интервал между кадрами, сек (0 — без ограничения)
+        self.rules = {ALL_TOPICS: 0}
+        self.next_due = {}  # topic -> monotonic время, раньше которого кадр не шлем
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.frames_throttled = 0
+        self.max_depth = 0
+        self.send_latency = Histogram()  # Время отправки кадра в сокет, мс
+
+    def subscribe(self, topic, max_hz=None):
+        """Подписка на топик (или "*") с ограничением частоты."""
+        self.rules[topic] = 1.0 / max_hz if max_hz else 0
+        self.next_due.pop(topic, None)
+
+    def unsubscribe(self, topic):
+        if topic == ALL_TOPICS:
+            self.rules.clear()
+        elif ALL_TOPICS in self.rules:
+            self.rules[topic] = _OFF
+        else:
+            self.rules.pop(topic, None)
+        self.pending.pop(topic, None)
+
+    def subscriptions(self):
+        return {
+            topic: {"max_hz": round(1.0 / interval, 3) if interval else None}
+            for topic, interval in self.rules.items()
+            if interval is not _OFF
+        }
+
+    def wants(self, topic, now):
+        """Проверяет подписку и частоту. Кадры чаще лимита отбрасываются:
+        продюсер шлет полный снимок каждый тик, следующий кадр будет свежее."""
+        interval = self.rules.get(topic, self.rules.get(ALL_TOPICS, _OFF))
+        if interval is _OFF:
+            return False
+        if interval:
+            if now < self.next_due.get(topic, 0):
+                self.frames_throttled += 1
+                return False
+            self.next_due[topic] = now + interval
+        return True
+
+    @property
+    def depth(self):
+        return len(self.pending)
+
+    def offer(self, topic, payload):
+        """Кладет кадр в слот топика, вытесняя неотправленный."""
+        if topic in self.pending:
+            self.frames_dropped += 1
+        self.pending[topic] = payload
+        if len(self.pending) > self.max_depth:
+            self.max_depth = len(self.pending)
+        self.ready.set()
+
+    async def next_batch(self):
+        """Ждет и забирает все накопленные кадры: [(topic, payload), ...]."""
+        await self.ready.wait()
+        self.ready.clear()
+        batch = list(self.pending.items())
+        self.pending.clear()
+        return batch
+
+    def mark_sent(self, count=1, send_ms=None):
+        self.frames_sent += count
+        if send_ms is not None:
+            self.send_latency.observe(send_ms)
+
+    def stats(self):
+        return {
+            "client": self.name,
+            "connected_at": self.connected_at,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "frames_throttled": self.frames_throttled,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "subscriptions": self.subscriptions(),
+        }
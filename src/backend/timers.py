@@ -0,0 +1,90 @@
+"""
+Таймеры переходов состояний (конец экстракции, выход из Summary, шаги циклов).
+
+Куча по времени срабатывания: переход планируется один раз при входе
+в состояние, а не проверяется на каждом тике. Задача run() спит ровно до
+ближайшего таймера (или до появления более раннего), поэтому без таймеров
+CPU не тратится вовсе. Отмена ленивая: отмененный таймер выбрасывается,
+когда доходит до вершины кучи.
+
+Время берется из clock (clock.py): с VirtualClock переходы срабатывают
+по advance() без реального ожидания.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+
+from clock import SYSTEM_CLOCK
+from histogram import Histogram
+
+
+class Timer:
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerHeap:
+    def __init__(self, clock=SYSTEM_CLOCK):
+        # Для run_due() достаточно функции времени, run() нужен Clock
+        self.clock = clock
+        self._heap = []
+        self._seq = itertools.count()  # Порядок срабатывания при равном времени
+        self._wake = asyncio.Event()
+        self.fired = 0
+        self.lateness = Histogram()  # Опоздание срабатывания, мс
+
+    def __len__(self):
+        return sum(1 for _, _, t in self._heap if not t.cancelled)
+
+    def call_later(self, delay, callback, *args):
+        timer = Timer(self.clock() + delay, callback, args)
+        heapq.heappush(self._heap, (timer.when, next(self._seq), timer))
+        if self._heap[0][2] is timer:
+            self._wake.set()  # Новый ближайший таймер — run() пересчитает сон
+        return timer
+
+    def next_deadline(self):
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run_due(self, now=None):
+        """Вызывает все наступившие таймеры. Возвращает их количество."""
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            timer.cancelled = True  # Сработавший таймер повторная отмена не трогает
+            self.lateness.observe((now - timer.when) * 1000)
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                logging.error(f"[TIMERS] {getattr(timer.callback, '__name__', timer.callback)} failed: {e}")
+            fired += 1
+        self.fired += fired
+        return fired
+
+    async def run(self):
+        while True:
+            deadline = self.next_deadline()
+            self._wake.clear()
+            timeout = None if deadline is None else max(deadline - self.clock(), 0)
+            await self.clock.wait(self._wake, timeout)
+            self.run_due()
+
+    def stats(self):
+        return {"pending": len(self), "fired": self.fired, "lateness_ms": self.lateness.snapshot()}
@@ -39,8 +39,15 @@ const App = () => {
     startFlush,
     startCleaning,
     resetGroup,
+    setTopicRates,
   } = useRealTimeData();
 
+  // В настройках группы свернуты и стоят в IDLE — 5Гц для них не нужны
+  const isSystemView = appState === AppStates.SYSTEM_EXPANDED;
+  useEffect(() => {
+    setTopicRates(isSystemView ? { left: 1, right: 1 } : { left: null, right: null });
+  }, [isSystemView]);
+
   useEffect(() => {
     const timer = setInterval(() => setTime(new Date()), 1000);
 
@@ -171,7 +171,12 @@ const CoffeeGroup = ({
         )}
       >
         {isExpanded ? (
-          <DetailedGraph profileName={selectedProfile?.name} t={t} />
+          <DetailedGraph
+            side={side}
+            serverState={serverState}
+            profileName={selectedProfile?.name}
+            t={t}
+          />
         ) : (
           <>
             {/* Состояние IDLE (Выбор профилей) */}
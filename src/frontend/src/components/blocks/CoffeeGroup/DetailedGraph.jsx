@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { ResponsiveContainer, AreaChart, Area, XAxis, YAxis, CartesianGrid } from 'recharts';
 
 const mockGraphData = Array.from({ length: 40 }, (_, i) => ({
@@ -7,54 +7,89 @@ const mockGraphData = Array.from({ length: 40 }, (_, i) => ({
   target: 45 + Math.sin(i / 5) * 18 + (i > 20 ? 15 : 0),
 }));
 
-const DetailedGraph = ({ profileName, t }) => (
-  <div className="flex h-full w-full flex-col overflow-hidden animate-in fade-in duration-300">
-    <div className="flex-1 relative bg-white/5 rounded-[1.5rem] p-[1.5rem] border border-white/5">
-      <ResponsiveContainer width="100%" height="100%">
-        <AreaChart data={mockGraphData} margin={{ top: 20, right: 30, left: -20, bottom: 20 }}>
-          <defs>
-            <linearGradient id="colorValue" x1="0" y1="0" x2="0" y2="1">
-              <stop offset="5%" stopColor="#f04438" stopOpacity={0.4} />
-              <stop offset="95%" stopColor="#f04438" stopOpacity={0} />
-            </linearGradient>
-          </defs>
-          <CartesianGrid strokeDasharray="3 3" stroke="#ffffff05" vertical={false} />
-          <XAxis
-            dataKey="time"
-            axisLine={false}
-            tickLine={false}
-            tick={{ fill: '#667085', fontSize: 12, fontWeight: 700 }}
-            tickFormatter={(v) => `00:${v.toString().padStart(2, '0')}`}
-          />
-          <YAxis hide domain={[0, 100]} />
-          <Area
-            type="monotone"
-            dataKey="target"
-            stroke="#f0443850"
-            strokeWidth={2}
-            strokeDasharray="10 8"
-            fill="transparent"
-            dot={false}
-          />
-          <Area
-            type="monotone"
-            dataKey="value"
-            stroke="#f04438"
-            strokeWidth={4}
-            fillOpacity={1}
-            fill="url(#colorValue)"
-            dot={false}
-          />
-        </AreaChart>
-      </ResponsiveContainer>
-
-      <div className="absolute bottom-[1.5rem] left-[3rem] right-[3rem] flex justify-between text-[0.625rem] font-black text-text-muted font-display uppercase tracking-widest opacity-60">
-        <span>{t('start')}</span>
-        <span>00:26</span>
-        <span>00:34 {t('finish')}</span>
+// Бэкенд отдает кривую уже прореженной (LTTB), киоск рисует не больше GRAPH_POINTS точек
+const GRAPH_POINTS = 200;
+const REFRESH_MS = 1000;
+
+const toChartData = ({ t, pressure }) => t.map((time, i) => ({ time, value: pressure[i] }));
+
+const DetailedGraph = ({ side, serverState, profileName, t }) => {
+  const [curve, setCurve] = useState(null);
+
+  useEffect(() => {
+    if (!side) return undefined;
+    let cancelled = false;
+    const load = async () => {
+      try {
+        const res = await fetch(`/api/shots/live/${side}?points=${GRAPH_POINTS}`);
+        if (!res.ok) return;
+        const shot = await res.json();
+        if (!cancelled) setCurve(toChartData(shot.data));
+      } catch (e) {
+        console.error('[GRAPH] Load failed:', e);
+      }
+    };
+    load();
+    // Пока идет экстракция — обновляем раз в секунду, иначе кривая заморожена
+    const timer = serverState === 'EXTRACTION' ? setInterval(load, REFRESH_MS) : null;
+    return () => {
+      cancelled = true;
+      if (timer) clearInterval(timer);
+    };
+  }, [side, serverState]);
+
+  return (
+    <div className="flex h-full w-full flex-col overflow-hidden animate-in fade-in duration-300">
+      <div className="flex-1 relative bg-white/5 rounded-[1.5rem] p-[1.5rem] border border-white/5">
+        <ResponsiveContainer width="100%" height="100%">
+          <AreaChart
+            data={curve || mockGraphData}
+            margin={{ top: 20, right: 30, left: -20, bottom: 20 }}
+          >
+            <defs>
+              <linearGradient id="colorValue" x1="0" y1="0" x2="0" y2="1">
+                <stop offset="5%" stopColor="#f04438" stopOpacity={0.4} />
+                <stop offset="95%" stopColor="#f04438" stopOpacity={0} />
+              </linearGradient>
+            </defs>
+            <CartesianGrid strokeDasharray="3 3" stroke="#ffffff05" vertical={false} />
+            <XAxis
+              dataKey="time"
+              axisLine={false}
+              tickLine={false}
+              tick={{ fill: '#667085', fontSize: 12, fontWeight: 700 }}
+              tickFormatter={(v) => `00:${Math.floor(v).toString().padStart(2, '0')}`}
+            />
+            <YAxis hide domain={curve ? [0, 'auto'] : [0, 100]} />
+            <Area
+              type="monotone"
+              dataKey="target"
+              stroke="#f0443850"
+              strokeWidth={2}
+              strokeDasharray="10 8"
+              fill="transparent"
+              dot={false}
+            />
+            <Area
+              type="monotone"
+              dataKey="value"
+              stroke="#f04438"
+              strokeWidth={4}
+              fillOpacity={1}
+              fill="url(#colorValue)"
+              dot={false}
+            />
+          </AreaChart>
+        </ResponsiveContainer>
+
+        <div className="absolute bottom-[1.5rem] left-[3rem] right-[3rem] flex justify-between text-[0.625rem] font-black text-text-muted font-display uppercase tracking-widest opacity-60">
+          <span>{t('start')}</span>
+          <span>00:26</span>
+          <span>00:34 {t('finish')}</span>
+        </div>
       </div>
     </div>
-  </div>
-);
+  );
+};
 
 export default DetailedGraph;
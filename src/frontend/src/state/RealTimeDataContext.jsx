@@ -1,12 +1,22 @@
 import React, { createContext, useContext, useState, useEffect, useRef } from 'react';
+import {
+  decodeFrame,
+  topicTable,
+  BINARY_SUBPROTOCOL,
+  DEFAULT_TOPICS,
+  JSON_SUBPROTOCOL,
+} from '../utils/telemetryCodec';
 
 const RealTimeDataContext = createContext(null);
 
+const COMMAND_TIMEOUT_MS = 2000;
+
 export const RealTimeDataProvider = ({ children }) => {
   const [leftData, setLeftData] = useState(null);
   const [rightData, setRightData] = useState(null);
   const [machineData, setMachineData] = useState(null);
-  const [teaData] = useState({
+  // Заглушка, пока бэкенд не публикует топик 'tea'
+  const [teaData, setTeaData] = useState({
     temp: 84.1,
     timer: '2:10',
     yield: 250,
@@ -14,19 +24,77 @@ export const RealTimeDataProvider = ({ children }) => {
   });
 
   const ws = useRef(null);
+  // Последнее собранное состояние по топикам (база для дельта-кадров)
+  const frames = useRef({});
+  // id -> топик бинарных кадров (зависит от групп машины, приходит от сервера)
+  const topicIds = useRef(DEFAULT_TOPICS);
+  // Переопределения подписок (topic -> { max_hz }), переотправляются при переподключении
+  const subscriptions = useRef({});
+  // Ожидающие подтверждения команды: id -> callback(ack)
+  const pendingCommands = useRef({});
+  const commandSeq = useRef(0);
+
+  const send = (msg) => {
+    if (ws.current && ws.current.readyState === WebSocket.OPEN) {
+      ws.current.send(JSON.stringify(msg));
+    }
+  };
 
   useEffect(() => {
     const connectWS = () => {
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
       const host = window.location.host || 'localhost:8000'; // Fallback for dev
-      ws.current = new WebSocket(`${protocol}//${host}/ws/telemetry`);
+      // Бинарные кадры дешевле JSON.parse; сервер без их поддержки выберет JSON
+      ws.current = new WebSocket(`${protocol}//${host}/ws/telemetry`, [
+        BINARY_SUBPROTOCOL,
+        JSON_SUBPROTOCOL,
+      ]);
+      ws.current.binaryType = 'arraybuffer';
+      topicIds.current = DEFAULT_TOPICS;
+
+      ws.current.onopen = () => {
+        if (Object.keys(subscriptions.current).length > 0) {
+          send({ type: 'subscribe', topics: subscriptions.current });
+        }
+      };
 
       ws.current.onmessage = (event) => {
         try {
-          const { topic, payload } = JSON.parse(event.data);
-          if (topic === 'left') setLeftData(payload);
-          if (topic === 'right') setRightData(payload);
-          if (topic === 'machine') setMachineData(payload);
+          const msg =
+            typeof event.data === 'string'
+              ? JSON.parse(event.data)
+              : decodeFrame(event.data, topicIds.current);
+          const { topic, payload, delta, removed } = msg;
+          if (!topic) {
+            // Служебные ответы (topic_ids, ack, subscribed, topics, error)
+            if (msg.type === 'topic_ids') {
+              topicIds.current = topicTable(msg.topics);
+              return;
+            }
+            if (msg.type === 'ack' && pendingCommands.current[msg.id]) {
+              pendingCommands.current[msg.id](msg);
+              delete pendingCommands.current[msg.id];
+            }
+            return;
+          }
+          let next;
+          if (payload) {
+            // Ключевой кадр (или полный кадр от сервера без дельт)
+            next = payload;
+          } else if (delta) {
+            const base = frames.current[topic];
+            if (!base) return; // Дельта без ключевого кадра — ждем следующий keyframe
+            next = { ...base, ...delta };
+            if (removed) removed.forEach((k) => delete next[k]);
+          } else {
+            return;
+          }
+          frames.current[topic] = next;
+
+          if (topic === 'left') setLeftData(next);
+          if (topic === 'right') setRightData(next);
+          if (topic === 'machine') setMachineData(next);
+          if (topic === 'tea') setTeaData((prev) => ({ ...prev, ...next }));
         } catch (e) {
           console.error('[WS] Parse error:', e);
         }
@@ -34,6 +102,7 @@ export const RealTimeDataProvider = ({ children }) => {
 
       ws.current.onclose = () => {
         console.log('[WS] Disconnected, retrying...');
+        frames.current = {};
         setTimeout(connectWS, 2000);
       };
     };
@@ -44,49 +113,56 @@ export const RealTimeDataProvider = ({ children }) => {
     };
   }, []);
 
-  const stopSimulation = async (side) => {
-    try {
-      await fetch(`/api/control/stop/${side}`, { method: 'POST' });
-    } catch (e) {
-      console.error(`[CONTROL] Stop ${side} failed:`, e);
-    }
+  // Ограничение частоты топиков: setTopicRates({ left: 1, right: 1 }); null — без ограничения
+  const setTopicRates = (rates) => {
+    const topics = {};
+    Object.entries(rates).forEach(([topic, maxHz]) => {
+      topics[topic] = { max_hz: maxHz };
+      if (maxHz) subscriptions.current[topic] = { max_hz: maxHz };
+      else delete subscriptions.current[topic];
+    });
+    send({ type: 'subscribe', topics });
   };
 
-  const startSimulation = async (side, profile) => {
-    try {
-      await fetch(`/api/control/start/${side}`, {
+  // Команда через открытый WebSocket (ack по id); если сокет закрыт — HTTP POST
+  const sendCommand = (command, side, profile) => {
+    if (!ws.current || ws.current.readyState !== WebSocket.OPEN) {
+      return fetch(`/api/control/${command}/${side}`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(profile),
+        ...(profile && {
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify(profile),
+        }),
       });
-    } catch (e) {
-      console.error(`[CONTROL] Start ${side} failed:`, e);
-    }
-  };
-
-  const startFlush = async (side) => {
-    try {
-      await fetch(`/api/control/flush/${side}`, { method: 'POST' });
-    } catch (e) {
-      console.error(`[CONTROL] Flush ${side} failed:`, e);
     }
+    const id = ++commandSeq.current;
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        delete pendingCommands.current[id];
+        reject(new Error('ack timeout'));
+      }, COMMAND_TIMEOUT_MS);
+      pendingCommands.current[id] = (ack) => {
+        clearTimeout(timer);
+        if (ack.ok) resolve(ack);
+        else reject(new Error(ack.error));
+      };
+      send({ type: 'command', id, command, side, profile });
+    });
   };
 
-  const startCleaning = async (side) => {
+  const runCommand = async (command, side, profile) => {
     try {
-      await fetch(`/api/control/cleaning/${side}`, { method: 'POST' });
+      await sendCommand(command, side, profile);
     } catch (e) {
-      console.error(`[CONTROL] Cleaning ${side} failed:`, e);
+      console.error(`[CONTROL] ${command} ${side} failed:`, e);
     }
   };
 
-  const resetGroup = async (side) => {
-    try {
-      await fetch(`/api/control/reset/${side}`, { method: 'POST' });
-    } catch (e) {
-      console.error(`[CONTROL] Reset ${side} failed:`, e);
-    }
-  };
+  const stopSimulation = (side) => runCommand('stop', side);
+  const startSimulation = (side, profile) => runCommand('start', side, profile);
+  const startFlush = (side) => runCommand('flush', side);
+  const startCleaning = (side) => runCommand('cleaning', side);
+  const resetGroup = (side) => runCommand('reset', side);
 
   return (
     <RealTimeDataContext.Provider
@@ -95,6 +171,7 @@ export const RealTimeDataProvider = ({ children }) => {
         right: rightData,
         machine: machineData,
         tea: teaData,
+        setTopicRates,
         startSimulation,
         stopSimulation,
         startFlush,
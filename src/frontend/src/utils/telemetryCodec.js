@@ -0,0 +1,86 @@
+// Декодер бинарных кадров телеметрии (subprotocol headunit.telemetry.bin.v1).
+// Раскладка синхронизирована с src/backend/telemetry/binary.py
+
+export const JSON_SUBPROTOCOL = 'headunit.telemetry.json.v1';
+export const BINARY_SUBPROTOCOL = 'headunit.telemetry.bin.v1';
+
+// Коды — индексы STATES/WATER_LEVELS из src/backend/hardware/protocol.py
+const STATES = ['IDLE', 'HEATING', 'EXTRACTION', 'CLEANING', 'FLUSH', 'ERROR', 'DONE', 'STOPPED'];
+const WATER_LEVELS = ['ok', 'low', 'empty'];
+// Коды топиков для групп по умолчанию; фактические сервер шлет первым
+// сообщением {"type": "topic_ids", "topics": {"machine": 0, "left": 1, ...}}
+export const DEFAULT_TOPICS = ['machine', 'left', 'right'];
+
+const HEADER_SIZE = 4;
+const GROUP_SIZE = 24;
+const FLAG_KEY = 0x01;
+const FLAG_WINDOW = 0x02; // Блок окна: samples u16, min/max/mean по WINDOW_FIELDS (f32)
+const FLAG_LIVE = 0x04; // Блок профиля: target/deviation по LIVE_FIELDS (f32)
+const WINDOW_FIELDS = ['temp', 'pressure', 'flowIn', 'flowOut', 'yield'];
+const LIVE_FIELDS = ['temp', 'pressure', 'flowIn', 'flowOut'];
+const BIT_DONE = 0x01;
+const BIT_ACTIVE = 0x02;
+
+// float32 -> значение с точностью бэкенда (0.01)
+const f32 = (view, offset) => Math.round(view.getFloat32(offset, true) * 100) / 100;
+
+// Подряд идущие f32 -> { field: value }
+const f32Fields = (view, offset, fields) =>
+  Object.fromEntries(fields.map((f, i) => [f, f32(view, offset + 4 * i)]));
+
+// {"machine": 0, "left": 1, ...} -> таблица id -> топик
+export function topicTable(ids) {
+  const table = [];
+  Object.entries(ids).forEach(([topic, id]) => {
+    table[id] = topic;
+  });
+  return table;
+}
+
+export function decodeFrame(buffer, topics = DEFAULT_TOPICS) {
+  const view = new DataView(buffer);
+  const topic = topics[view.getUint8(0)];
+  if (topic === undefined) return {}; // Неизвестный код — кадр пропускаем
+  const flags = view.getUint8(1);
+  const seq = view.getUint16(2, true);
+  const o = HEADER_SIZE;
+
+  let payload;
+  if (topic === 'machine') {
+    payload = {
+      boiler_temp: f32(view, o),
+      steam_pressure: f32(view, o + 4),
+      water_level: WATER_LEVELS[view.getUint8(o + 8)],
+    };
+  } else {
+    const elapsed = view.getUint16(o + 20, true);
+    const bits = view.getUint8(o + 23);
+    payload = {
+      temp: f32(view, o),
+      pressure: f32(view, o + 4),
+      flowIn: f32(view, o + 8),
+      flowOut: f32(view, o + 12),
+      yield: f32(view, o + 16),
+      time: `${Math.floor(elapsed / 60)}:${String(elapsed % 60).padStart(2, '0')}`,
+      done: Boolean(bits & BIT_DONE),
+      active: Boolean(bits & BIT_ACTIVE),
+      state: STATES[view.getUint8(o + 22)],
+    };
+    let pos = o + GROUP_SIZE;
+    if (flags & FLAG_WINDOW) {
+      const n = 4 * WINDOW_FIELDS.length;
+      payload.window = {
+        samples: view.getUint16(pos, true),
+        min: f32Fields(view, pos + 2, WINDOW_FIELDS),
+        max: f32Fields(view, pos + 2 + n, WINDOW_FIELDS),
+        mean: f32Fields(view, pos + 2 + 2 * n, WINDOW_FIELDS),
+      };
+      pos += 2 + 3 * n;
+    }
+    if (flags & FLAG_LIVE) {
+      payload.target = f32Fields(view, pos, LIVE_FIELDS);
+      payload.deviation = f32Fields(view, pos + 4 * LIVE_FIELDS.length, LIVE_FIELDS);
+    }
+  }
+  return { topic, seq, key: Boolean(flags & FLAG_KEY), payload };
+}
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+import time
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from hardware.acquisition import AcquisitionScheduler, Window
+from hardware.mock import MockHardware
+
+
+class TestWindow(unittest.TestCase):
+
+    def test_spike_between_publishes_is_kept(self):
+        window = Window(("pressure", "temp"))
+        for p in (9.0, 9.1, 12.5, 9.0):
+            window.add((p, 93.0))
+
+        last, stats = window.take()
+        self.assertEqual(last, (9.0, 93.0))
+        self.assertEqual(stats["samples"], 4)
+        self.assertEqual(stats["max"]["pressure"], 12.5)
+        self.assertEqual(stats["min"]["pressure"], 9.0)
+        self.assertEqual(stats["mean"]["pressure"], 9.9)
+        # Окно начинается заново
+        self.assertIsNone(window.take())
+
+
+class TestAcquisitionScheduler(unittest.TestCase):
+
+    def test_rate_is_independent_of_publish(self):
+        async def scenario():
+            hw = MockHardware()
+            hw.scheduler.rate = 200
+            hw.start_extraction("left", {"id": 1})
+            task = asyncio.create_task(hw.acquisition_loop())
+            await asyncio.sleep(0.1)
+            telemetry = await hw.get_telemetry()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return hw, telemetry
+
+        hw, telemetry = asyncio.run(scenario())
+        window = telemetry["left"]["window"]
+        # Один кадр публикации несет все сэмплы окна
+        self.assertGreater(window["samples"], 5)
+        self.assertEqual(window["samples"], hw.recorders["left"].count)
+        self.assertLessEqual(window["min"]["pressure"], window["max"]["pressure"])
+        self.assertNotIn("window", telemetry["right"])
+
+    def test_transitions_advance_without_clients(self):
+        async def scenario():
+            hw = MockHardware()
+            hw.EXTRACTION_TIME = 0.05
+            hw.scheduler.rate = 200
+            hw.start_extraction("left", {})
+            hw.telemetry_updated.clear()
+            task = asyncio.create_task(hw.acquisition_loop())
+            states = []
+            for _ in range(40):
+                await asyncio.sleep(0.01)
+                if not states or states[-1] != hw.groups["left"].state:
+                    states.append(hw.groups["left"].state)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return hw, states
+
+        with patch("settings_manager.get_setting", return_value=0):
+            hw, states = asyncio.run(scenario())
+        # get_telemetry() ни разу не вызывался
+        self.assertEqual((states[0], states[-1]), ("EXTRACTION", "IDLE"))
+        self.assertEqual(hw.recorders["left"].final_state, "DONE")
+        self.assertTrue(hw.telemetry_updated.is_set())
+        self.assertGreater(hw.scheduler.stats()["jitter_ms"]["count"], 0)
+        self.assertEqual(hw.timers.stats()["fired"], 2)
+
+    def test_loop_sleeps_while_idle(self):
+        async def scenario():
+            hw = MockHardware()
+            hw.scheduler.rate = 200
+            task = asyncio.create_task(hw.acquisition_loop())
+            await asyncio.sleep(0.05)
+            idle_ticks = hw.scheduler.samples
+            hw.start_extraction("left", {})
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return idle_ticks, hw.scheduler.samples
+
+        idle_ticks, total = asyncio.run(scenario())
+        self.assertEqual(idle_ticks, 0)
+        self.assertGreater(total, 3)
+
+    def test_overrun_is_counted(self):
+        calls = []
+
+        def slow_sample():
+            calls.append(1)
+            time.sleep(0.02)  # Дольше периода 10 мс
+
+        scheduler = AcquisitionScheduler(slow_sample, rate=100)
+
+        async def scenario():
+            task = asyncio.create_task(scheduler.run())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+        self.assertGreater(scheduler.overruns, 0)
+        self.assertEqual(scheduler.stats()["samples"], len(calls))
+
+
+if __name__ == '__main__':
+    unittest.main()
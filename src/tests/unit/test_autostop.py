@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from hardware.autostop import AutoStop
+from hardware.mock import MockHardware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAutoStop(unittest.TestCase):
+
+    def run_shot(self, auto, clock, flow=2.0, true_latency=0.3, true_drip=1.5):
+        """Шот с постоянным потоком; возвращает перелив."""
+        auto.arm("left", 36)
+        yld = 0.0
+        while not auto.update("left", flow, yld):
+            clock.now += 0.02
+            yld += flow * 0.02
+        clock.now += true_latency
+        return auto.finish("left", yld + flow * true_latency + true_drip)[1]
+
+    def test_stops_ahead_of_target(self):
+        clock = FakeClock()
+        auto = AutoStop(latency=0.3, drip=1.5, clock=clock)
+        auto.arm("left", 36)
+        auto.shots["left"].flow = 2.0  # Поток уже установился
+        self.assertFalse(auto.update("left", 2.0, 33.0))
+        self.assertTrue(auto.update("left", 2.0, 34.0))  # 34 + 2*0.3 + 1.5 >= 36
+        self.assertFalse(auto.update("left", 2.0, 34.1))  # Один раз за шот
+
+    def test_model_learns_latency_and_drip(self):
+        clock = FakeClock()
+        auto = AutoStop(latency=0.05, drip=0.0, clock=clock)
+        first = self.run_shot(auto, clock)
+        for _ in range(20):
+            last = self.run_shot(auto, clock)
+
+        self.assertGreater(first, 1.5)
+        self.assertLess(abs(last), 0.2)
+        self.assertAlmostEqual(auto.latency, 0.3, places=2)
+        self.assertEqual(auto.stats()["stops"], 21)
+        self.assertEqual(auto.stats()["overshoot_g"]["count"], 21)
+
+    def test_no_target_no_stop(self):
+        auto = AutoStop(clock=FakeClock())
+        auto.arm("left", None)
+        self.assertFalse(auto.update("left", 2.0, 500.0))
+        self.assertEqual(auto.finish("left", 500.0), (None, None))
+
+
+class TestMockAutoStop(unittest.TestCase):
+
+    def test_extraction_ends_at_target_with_recorded_overshoot(self):
+        async def scenario():
+            hw = MockHardware()
+            hw.scheduler.rate = 200
+            # Модель уже знает реакцию клапана мока; докап мока случаен в пределах ±20%
+            hw.autostop.latency = hw.SIM_STOP_LATENCY
+            hw.autostop.drip = hw.SIM_DRIP
+            saved = []
+            hw.shot_listeners.append(saved.append)
+            task = asyncio.create_task(hw.acquisition_loop())
+            # Поток мока 2.2 г/с ускорен в 10 раз: шот ~2 с вместо ~16
+            with patch.object(MockHardware, "_read_sensors", lambda self, e: (93.0, 9.0, 2.5, 22.0, e * 22.0)):
+                hw.start_extraction("left", {"id": 1, "targetYield": 36})
+                for _ in range(100):
+                    await asyncio.sleep(0.05)
+                    if hw.groups["left"].state != "EXTRACTION":
+                        break
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return hw, saved
+
+        hw, saved = asyncio.run(scenario())
+        self.assertEqual(hw.groups["left"].state, "DONE")
+        self.assertEqual(saved[0]["target_yield"], 36.0)
+        # Недолив не больше разброса докапа, перелив — в пределах сэмпла и опоздания таймера
+        self.assertGreater(saved[0]["overshoot"], -0.3 * hw.SIM_DRIP)
+        self.assertLess(saved[0]["overshoot"], 22.0 * hw.SIM_STOP_LATENCY)
+        self.assertEqual(hw.stats()["autostop"]["stops"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
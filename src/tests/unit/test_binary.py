@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from telemetry.binary import BinaryEncoder, pack_frame, unpack_frame, topic_ids
+
+
+class TestBinaryFrames(unittest.TestCase):
+
+    def test_group_roundtrip(self):
+        payload = {
+            "temp": 93.1, "pressure": 9.0, "flowIn": 2.5, "flowOut": 2.2,
+            "yield": 24.6, "time": "1:05", "done": True, "active": False,
+            "state": "DONE",
+        }
+        frame = pack_frame("left", payload, seq=7, key=True)
+        self.assertEqual(len(frame), 28)
+        decoded = unpack_frame(frame)
+        self.assertEqual(decoded["topic"], "left")
+        self.assertEqual(decoded["seq"], 7)
+        self.assertTrue(decoded["key"])
+        self.assertEqual(decoded["payload"], payload)
+
+    def test_window_and_profile_blocks(self):
+        fields = ("temp", "pressure", "flowIn", "flowOut", "yield")
+        payload = {
+            "temp": 93.1, "pressure": 9.0, "flowIn": 2.5, "flowOut": 2.2,
+            "yield": 24.6, "time": "0:20", "done": False, "active": True,
+            "state": "EXTRACTION",
+            "window": {
+                "samples": 10,
+                "min": {f: 1.25 for f in fields},
+                "max": {f: 9.5 for f in fields},
+                "mean": {f: 4.75 for f in fields},
+            },
+            "target": {"temp": 93.0, "pressure": 9.0, "flowIn": 2.0, "flowOut": 2.0},
+            "deviation": {"temp": 0.1, "pressure": 0.0, "flowIn": 0.5, "flowOut": 0.2},
+        }
+        frame = pack_frame("right", payload)
+        self.assertEqual(len(frame), 28 + 62 + 32)
+        self.assertEqual(unpack_frame(frame)["payload"], payload)
+
+        without_live = {k: v for k, v in payload.items() if k not in ("target", "deviation")}
+        self.assertEqual(unpack_frame(pack_frame("right", without_live))["payload"], without_live)
+
+    def test_machine_roundtrip(self):
+        payload = {"boiler_temp": 95.5, "steam_pressure": 1.2, "water_level": "low"}
+        self.assertEqual(unpack_frame(pack_frame("machine", payload))["payload"], payload)
+
+    def test_configured_group_topics(self):
+        topics = topic_ids(("left", "center", "right", "tea"))
+        self.assertEqual(topics, {"machine": 0, "left": 1, "center": 2, "right": 3, "tea": 4})
+        frame = BinaryEncoder(topics).encode("tea", {"state": "IDLE", "temp": 84.0})
+        self.assertEqual(frame[0], 4)
+        self.assertEqual(unpack_frame(frame, topics)["topic"], "tea")
+
+    def test_unknown_topic_falls_back_to_json(self):
+        enc = BinaryEncoder()
+        msg = enc.encode("tea", {"temp": 84.1})
+        self.assertIsInstance(msg, dict)
+        self.assertIsInstance(enc.encode("left", {"state": "IDLE"}), bytes)
+        self.assertIsNone(enc.encode("left", {"state": "IDLE"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from telemetry.broadcaster import TelemetryBroadcaster
+
+
+class CountingHardware:
+    """Фейковое железо: считает количество опросов."""
+
+    def __init__(self):
+        self.telemetry_updated = asyncio.Event()
+        self.calls = 0
+
+    async def get_telemetry(self):
+        self.calls += 1
+        return {"machine": {"tick": self.calls}, "left": {"state": "EXTRACTION"}}
+
+
+class TestTelemetryBroadcaster(unittest.TestCase):
+
+    def test_sampling_does_not_scale_with_clients(self):
+        async def scenario():
+            hw = CountingHardware()
+            broadcaster = TelemetryBroadcaster(hw)
+            broadcaster.rates["EXTRACTION"] = 100
+            subs = [broadcaster.subscribe() for _ in range(5)]
+            broadcaster.start()
+            batches = [await s.next_batch() for s in subs]
+            await broadcaster.stop()
+            return hw, batches
+
+        hw, batches = asyncio.run(scenario())
+        # Все клиенты получили один и тот же кадр из одного опроса
+        machine = [dict(b)["machine"] for b in batches]
+        self.assertEqual(len({id(m) for m in machine}), 1)
+        self.assertLessEqual(hw.calls, 2)
+
+    def test_update_event_reaches_every_client(self):
+        async def scenario():
+            hw = CountingHardware()
+            broadcaster = TelemetryBroadcaster(hw)
+            broadcaster.rates["EXTRACTION"] = 0.1
+            a, b = broadcaster.subscribe(), broadcaster.subscribe()
+            broadcaster.start()
+            await a.next_batch(); await b.next_batch()
+            hw.telemetry_updated.set()
+            second = await asyncio.wait_for(asyncio.gather(a.next_batch(), b.next_batch()), timeout=1)
+            await broadcaster.stop()
+            return second
+
+        a_batch, b_batch = asyncio.run(scenario())
+        self.assertEqual(a_batch, b_batch)
+        self.assertEqual(dict(a_batch)["machine"]["tick"], 2)
+
+    def test_late_subscriber_gets_last_frame(self):
+        broadcaster = TelemetryBroadcaster(CountingHardware())
+        broadcaster.publish({"machine": {}})
+        sub = broadcaster.subscribe()
+        self.assertEqual(sub.depth, 1)
+        broadcaster.unsubscribe(sub)
+        self.assertEqual(len(broadcaster.subscribers), 0)
+
+    def test_slow_subscriber_drops_stale_frames(self):
+        broadcaster = TelemetryBroadcaster(CountingHardware())
+        sub = broadcaster.subscribe()
+        for tick in range(10):
+            broadcaster.publish({"machine": {"tick": tick}, "left": {"state": "IDLE"}})
+
+        # Очередь ограничена количеством топиков, в ней только свежие кадры
+        self.assertEqual(sub.depth, 2)
+        self.assertEqual(sub.frames_dropped, 18)
+        batch = asyncio.run(sub.next_batch())
+        self.assertEqual(dict(batch)["machine"]["tick"], 9)
+        self.assertEqual(sub.depth, 0)
+        self.assertEqual(sub.stats()["max_queue_depth"], 2)
+
+    def test_unsubscribed_topics_are_not_queued(self):
+        broadcaster = TelemetryBroadcaster(CountingHardware())
+        sub = broadcaster.subscribe()
+        sub.unsubscribe("left")
+        broadcaster.publish({"machine": {}, "left": {}})
+        self.assertEqual(list(sub.pending), ["machine"])
+
+        sub.unsubscribe("*")
+        sub.subscribe("left")
+        broadcaster.publish({"machine": {}, "left": {}})
+        self.assertEqual(sorted(sub.pending), ["left", "machine"])
+        self.assertEqual(sub.subscriptions(), {"left": {"max_hz": None}})
+
+    def test_publish_rate_follows_busiest_group(self):
+        broadcaster = TelemetryBroadcaster(CountingHardware(), rates={"FLUSH": 10})
+        idle = {"machine": {}, "left": {"state": "IDLE"}, "right": {"state": "IDLE"}}
+        self.assertEqual(broadcaster.interval(idle), 1.0)
+        self.assertEqual(broadcaster.interval({**idle, "right": {"state": "EXTRACTION"}}), 0.2)
+        self.assertEqual(broadcaster.interval({**idle, "left": {"state": "FLUSH"}}), 0.1)
+        self.assertEqual(broadcaster.interval({"machine": {}}), 1.0)
+
+    def test_max_rate_is_enforced_per_topic(self):
+        sub = TelemetryBroadcaster(CountingHardware()).subscribe()
+        sub.subscribe("left", max_hz=1)
+        self.assertTrue(sub.wants("left", 100.0))
+        self.assertFalse(sub.wants("left", 100.5))
+        self.assertTrue(sub.wants("machine", 100.5))
+        self.assertTrue(sub.wants("left", 101.0))
+        self.assertEqual(sub.frames_throttled, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+import time
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from clock import Clock, VirtualClock
+from timers import TimerHeap
+from hardware.mock import MockHardware
+from hardware.simulator import np, MachineSimulator
+
+
+class TestClocks(unittest.TestCase):
+
+    def test_scaled_clock_sleeps_faster(self):
+        clock = Clock(speed=50)
+
+        async def scenario():
+            t0, real0 = clock(), time.monotonic()
+            await clock.sleep(1.0)
+            return clock() - t0, time.monotonic() - real0
+
+        virtual, real = asyncio.run(scenario())
+        self.assertGreaterEqual(virtual, 1.0)
+        self.assertLess(real, 0.5)
+
+    def test_virtual_clock_drives_timer_heap(self):
+        clock = VirtualClock()
+        fired = []
+
+        async def scenario():
+            timers = TimerHeap(clock)
+            task = asyncio.create_task(timers.run())
+            timers.call_later(30, fired.append, "end")
+            timers.call_later(5, fired.append, "soak")
+            for _ in range(40):
+                await asyncio.sleep(0)
+                clock.advance(1.0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return timers
+
+        timers = asyncio.run(scenario())
+        self.assertEqual(fired, ["soak", "end"])
+        self.assertEqual(timers.stats()["fired"], 2)
+
+
+class TestVirtualMock(unittest.TestCase):
+
+    def run_shots(self, hw, shots):
+        settings = {"summary_timeout": 15}
+        with patch("hardware.base.settings_manager.get_setting", lambda key, default=None: settings.get(key, default)):
+            saved = []
+            hw.shot_listeners.append(saved.append)
+            for _ in range(shots):
+                hw.start_extraction("left", {"id": 1, "targetYield": 36})
+                hw.run_for(60)
+        return saved
+
+    def test_shot_and_summary_in_virtual_time(self):
+        hw = MockHardware(clock=VirtualClock(), seed=1)
+        t0 = time.monotonic()
+        saved = self.run_shots(hw, 20)
+
+        self.assertLess(time.monotonic() - t0, 10)
+        self.assertEqual(len(saved), 20)
+        self.assertEqual(hw.groups["left"].state, "IDLE")  # Summary 15 с тоже прошел
+        self.assertEqual({c["state"] for c in saved}, {"DONE"})
+        self.assertEqual(saved[0]["started_at"], 1_700_000_000.0)
+        self.assertEqual(hw.stats()["timers"]["lateness_ms"]["max"], 0)
+
+    def test_reset_during_extraction_saves_stopped_shot(self):
+        hw = MockHardware(clock=VirtualClock(), seed=1)
+        saved = []
+        hw.shot_listeners.append(saved.append)
+        hw.start_extraction("left", {"id": 1, "targetYield": 36})
+        hw.run_for(5)
+        hw.reset_group("left")
+
+        self.assertEqual(hw.groups["left"].state, "IDLE")
+        self.assertEqual([c["state"] for c in saved], ["STOPPED"])
+        self.assertEqual(hw.recorders["left"].curve()["state"], "STOPPED")
+        self.assertNotIn("left", hw.autostop.shots)
+        self.assertNotIn("left", hw.executor.profiles)
+
+        saved.clear()
+        self.run_shots(hw, 1)
+        self.assertEqual(len(saved), 1)  # Следующий шот — как обычно
+
+    def test_same_seed_same_shots(self):
+        runs = [self.run_shots(MockHardware(clock=VirtualClock(), seed=7), 5) for _ in range(2)]
+        self.assertEqual(runs[0], runs[1])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_same_seed_same_simulated_shots(self):
+        def run():
+            return self.run_shots(MockHardware(("left", "right"), MachineSimulator(2, seed=3), VirtualClock(), seed=3), 3)
+
+        first, second = run(), run()
+        self.assertEqual(first, second)
+        self.assertGreater(first[0]["data"]["pressure"][-1], 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from telemetry.delta import DeltaEncoder
+
+
+class TestDeltaEncoder(unittest.TestCase):
+
+    def test_first_frame_is_keyframe(self):
+        enc = DeltaEncoder()
+        msg = enc.encode("left", {"temp": 93.0, "state": "IDLE"})
+        self.assertTrue(msg["key"])
+        self.assertEqual(msg["seq"], 1)
+        self.assertEqual(msg["payload"], {"temp": 93.0, "state": "IDLE"})
+
+    def test_only_changed_fields_are_sent(self):
+        enc = DeltaEncoder()
+        enc.encode("left", {"temp": 93.0, "yield": 0.0, "state": "IDLE"})
+        msg = enc.encode("left", {"temp": 93.0, "yield": 2.2, "state": "EXTRACTION"})
+        self.assertEqual(msg["delta"], {"yield": 2.2, "state": "EXTRACTION"})
+        self.assertEqual(msg["seq"], 2)
+        self.assertNotIn("payload", msg)
+
+    def test_unchanged_frame_is_skipped(self):
+        enc = DeltaEncoder()
+        enc.encode("machine", {"boiler_temp": 95.5})
+        self.assertIsNone(enc.encode("machine", {"boiler_temp": 95.5}))
+
+    def test_removed_fields_and_periodic_keyframe(self):
+        enc = DeltaEncoder()
+        enc.encode("left", {"a": 1, "b": 2})
+        msg = enc.encode("left", {"a": 1})
+        self.assertEqual(msg["removed"], ["b"])
+
+        enc.KEYFRAME_INTERVAL = 0
+        msg = enc.encode("left", {"a": 1})
+        self.assertTrue(msg["key"])
+
+    def test_disabled_sends_full_frames(self):
+        enc = DeltaEncoder(enabled=False)
+        enc.encode("left", {"a": 1})
+        self.assertEqual(enc.encode("left", {"a": 1}), {"topic": "left", "payload": {"a": 1}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import math
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from shots import downsample
+
+
+def make_curve(n=3000):
+    t = [i * 0.01 for i in range(n)]
+    pressure = [9.0 + math.sin(i / 50.0) for i in range(n)]
+    pressure[n // 3] = 15.0  # Короткий пик, который нельзя потерять
+    return {"t": t, "pressure": pressure, "yield": [i * 0.01 for i in range(n)]}
+
+
+class TestDownsample(unittest.TestCase):
+
+    def test_reduces_to_requested_points_and_keeps_peak(self):
+        data = make_curve()
+        result = downsample.lttb(data, 200)
+        self.assertEqual(len(result["t"]), 200)
+        self.assertEqual(result["t"][0], data["t"][0])
+        self.assertEqual(result["t"][-1], data["t"][-1])
+        self.assertIn(15.0, result["pressure"])
+        # Колонки прорежены по одним и тем же индексам
+        self.assertEqual(result["yield"], result["t"])
+
+    def test_short_curve_is_returned_as_is(self):
+        data = {"t": [0.0, 1.0], "pressure": [0.0, 9.0]}
+        self.assertEqual(downsample.lttb(data, 300), data)
+
+    @unittest.skipIf(downsample.np is None, "numpy not installed")
+    def test_python_fallback_matches_numpy(self):
+        data = make_curve(1000)
+        fast = downsample.lttb(data, 100)
+        with patch.object(downsample, "np", None):
+            slow = downsample.lttb(data, 100)
+        self.assertEqual(fast["t"], slow["t"])
+
+    def test_frozen_shot_is_cached(self):
+        curve = {"side": "left", "shot_id": 42, "state": "DONE", "data": make_curve(500)}
+        first = downsample.downsample_curve(curve, 50, key=("live", "left", 42))
+        again = downsample.downsample_curve(curve, 50, key=("live", "left", 42))
+        self.assertIs(first, again)
+        self.assertEqual(first["points"], 50)
+        self.assertIsNot(downsample.downsample_curve(curve, 50), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+import control
+from hardware.base import configured_groups, DEFAULT_GROUPS
+from hardware.mock import MockHardware
+
+SIDES = ("g0", "g1", "g2", "g3")
+
+
+class TestGroups(unittest.TestCase):
+
+    def test_groups_from_config(self):
+        config = {}
+        get = lambda key, default=None: config.get(key, default)
+        with patch("hardware.base.settings_manager.get_setting", get):
+            self.assertEqual(configured_groups(), DEFAULT_GROUPS)
+            config["groups"] = ["left", "center", "right"]
+            self.assertEqual(configured_groups(), ("left", "center", "right"))
+            hw = MockHardware()
+        self.assertEqual(hw.SIDES, ("left", "center", "right"))
+        self.assertEqual([g.index for g in hw.group_list], [0, 1, 2])
+
+    def test_group_names_fit_shared_memory_and_store(self):
+        config = {}
+        get = lambda key, default=None: config.get(key, default)
+        with patch("hardware.base.settings_manager.get_setting", get):
+            for bad in (["left", "center-left"], ["left", "левая"], ["left", "left"], ["machine"], [""]):
+                config["groups"] = bad
+                with self.assertRaises(ValueError):
+                    configured_groups()
+            config["groups"] = ["left", "center-l"]
+            self.assertEqual(configured_groups(), ("left", "center-l"))
+        with self.assertRaises(ValueError):
+            MockHardware(sides=("left", "center-left"))
+
+    def test_group_by_name_or_id(self):
+        hw = MockHardware(sides=SIDES)
+        self.assertIs(hw.group("g2"), hw.group_list[2])
+        self.assertIs(hw.group(2), hw.group_list[2])
+        self.assertIs(hw.group("2"), hw.group_list[2])
+        self.assertIsNone(hw.group("4"))
+        self.assertIsNone(hw.group("-1"))
+        self.assertIsNone(hw.group("tea"))
+
+    def test_control_dispatch_by_id(self):
+        hw = MockHardware(sides=SIDES)
+        self.assertEqual(control.execute(hw, "start", "3", {"id": 1}), "started")
+        self.assertEqual(hw.groups["g3"].state, "EXTRACTION")
+        self.assertEqual(control.execute(hw, "stop", "g3"), "stopped")
+        self.assertEqual(hw.groups["g3"].state, "STOPPED")
+        with self.assertRaises(ValueError):
+            control.execute(hw, "start", "7")
+
+    def test_all_groups_are_sampled_and_published(self):
+        async def scenario():
+            hw = MockHardware(sides=SIDES)
+            task = asyncio.create_task(hw.acquisition_loop())
+            for side in SIDES[1:]:
+                hw.start_extraction(side, {"id": 1})
+            await asyncio.sleep(0.2)
+            frames = await hw.get_telemetry()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return hw, frames
+
+        hw, frames = asyncio.run(scenario())
+        self.assertEqual(set(frames), {"machine", *SIDES})
+        self.assertEqual(frames["g0"]["state"], "IDLE")
+        for side in SIDES[1:]:
+            self.assertEqual(frames[side]["state"], "EXTRACTION")
+            self.assertGreater(hw.recorders[side].count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
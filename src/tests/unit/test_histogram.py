@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from histogram import Histogram
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_buckets_and_quantiles(self):
+        h = Histogram((1, 5, 10))
+        for v in (0.5, 1.0, 3, 4, 7, 100):
+            h.observe(v)
+
+        snap = h.snapshot()
+        self.assertEqual(snap["buckets"], {"1": 2, "5": 2, "10": 1, "+Inf": 1})
+        self.assertEqual(snap["count"], 6)
+        self.assertEqual(snap["max"], 100)
+        self.assertEqual(h.quantile(0.5), 5)
+        self.assertEqual(h.quantile(0.99), 100)
+
+    def test_reset_keeps_buckets(self):
+        h = Histogram((1, 5))
+        h.observe(2)
+        counts = h.counts
+        h.reset()
+        self.assertIs(h.counts, counts)
+        self.assertEqual(h.snapshot()["count"], 0)
+        self.assertEqual(h.quantile(0.99), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import threading
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from jobs import JobQueue
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.updates = []
+        self.finished = threading.Event()
+
+        def on_update(job):
+            self.updates.append(job)
+            if job["status"] in ("done", "failed"):
+                self.finished.set()
+
+        self.queue = JobQueue(on_update=on_update)
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+    def test_submit_returns_before_job_runs(self):
+        gate = threading.Event()
+
+        def slow(value, progress):
+            gate.wait(1)
+            progress("apply_config")
+            return True
+
+        job = self.queue.submit("settings", slow, {"timezone": "UTC"})
+        self.assertIn(self.queue.get(job.id)["status"], ("queued", "running"))
+        gate.set()
+        self.assertTrue(self.finished.wait(1))
+
+        result = self.queue.get(job.id)
+        self.assertEqual(result["status"], "done")
+        self.assertEqual(result["steps"], ["apply_config"])
+        self.assertEqual([u["status"] for u in self.updates][0], "queued")
+
+    def test_failure_is_reported(self):
+        def broken(progress):
+            raise RuntimeError("nmcli failed")
+
+        job = self.queue.submit("settings", broken)
+        self.assertTrue(self.finished.wait(1))
+        self.assertEqual(self.queue.get(job.id)["status"], "failed")
+        self.assertEqual(self.queue.get(job.id)["error"], "nmcli failed")
+        self.assertIsNone(self.queue.get(999))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+import metrics
+from histogram import Histogram
+from jobs import JobQueue
+from telemetry.broadcaster import TelemetryBroadcaster
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_histogram_exposition_is_cumulative_in_seconds(self):
+        registry = metrics.Registry()
+        hist = registry.histogram("tick_seconds", "Tick.", bounds=(1, 10))
+        for value in (0.5, 2, 3, 50):
+            hist.observe(value)
+        registry.register("clients", "gauge", "Clients.", lambda: [((("side", 'l"eft'),), 3)])
+
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE tick_seconds histogram", lines)
+        self.assertIn('tick_seconds_bucket{le="0.001"} 1', lines)
+        self.assertIn('tick_seconds_bucket{le="0.01"} 3', lines)
+        self.assertIn('tick_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("tick_seconds_sum 0.0555", lines)
+        self.assertIn("tick_seconds_count 4", lines)
+        self.assertIn('clients{side="l\\"eft"} 3', lines)
+
+    def test_route_timer_labels_by_route_template(self):
+        class Route:
+            path = "/api/shots/{shot_id}"
+
+        async def app(scope, receive, send):
+            scope["route"] = Route()
+
+        routes = {}
+        timer = metrics.RouteTimer(app, routes)
+        for _ in range(3):
+            asyncio.run(timer({"type": "http"}, None, None))
+        self.assertEqual(list(routes), ["/api/shots/{shot_id}"])
+        self.assertEqual(routes["/api/shots/{shot_id}"].count, 3)
+
+    def test_loop_lag_monitor_observes(self):
+        hist = Histogram()
+
+        async def scenario():
+            task = asyncio.create_task(metrics.loop_lag_monitor(hist, interval=0.01))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+        self.assertGreater(hist.count, 3)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_frame_counters_survive_disconnect(self):
+        broadcaster = TelemetryBroadcaster(hw=None)
+        sub = broadcaster.subscribe()
+        sub.offer("left", {"state": "IDLE"})
+        sub.offer("left", {"state": "FLUSH"})
+        sub.mark_sent(send_ms=0.3)
+        self.assertEqual(broadcaster.frame_totals(), (1, 1))
+        self.assertEqual(sub.send_latency.count, 1)
+        broadcaster.unsubscribe(sub)
+        broadcaster.unsubscribe(sub)
+        self.assertEqual(broadcaster.frame_totals(), (1, 1))
+
+    def test_job_duration_by_kind(self):
+        queue = JobQueue()
+        done = []
+        queue.on_update = lambda job: done.append(job["status"])
+        queue.submit("settings", lambda progress: True)
+        queue._executor.shutdown(wait=True)
+        self.assertEqual(done[-1], "done")
+        self.assertEqual(queue.durations["settings"].count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from hardware.profile import CompiledProfile, ProfileExecutor, compile_profile
+from hardware.mock import MockHardware
+
+CLASSIC = {
+    "id": 1,
+    "targetYield": 36,
+    "points": [
+        {"t": 0, "temp": 92, "press": 0, "flowIn": 0, "flowOut": 0, "energy": 0},
+        {"t": 2, "temp": 93, "press": 3, "flowIn": 1, "flowOut": 0, "energy": 1200},
+        {"t": 5, "temp": 94, "press": 9, "flowIn": 2, "flowOut": 1.5, "energy": 1500},
+        {"t": 25, "temp": 94, "press": 9, "flowIn": 2.2, "flowOut": 2.2, "energy": 1000},
+        {"t": 30, "temp": 93, "press": 6, "flowIn": 1.5, "flowOut": 1.5, "energy": 400},
+    ],
+}
+
+
+class TestCompiledProfile(unittest.TestCase):
+
+    def test_table_matches_linear_interpolation(self):
+        compiled = CompiledProfile(CLASSIC["points"], rate=50)
+        self.assertEqual(compiled.size, 30 * 50 + 1)
+        self.assertEqual(compiled.setpoint(0), (92, 0, 0, 0, 0))
+        temp, press, flow_in, flow_out, energy = compiled.setpoint(1.0)
+        self.assertAlmostEqual(temp, 92.5)
+        self.assertAlmostEqual(press, 1.5)
+        self.assertAlmostEqual(energy, 600)
+        self.assertAlmostEqual(compiled.setpoint(3.5)[1], 6.0)
+        # После конца профиля держится последняя точка
+        self.assertEqual(compiled.setpoint(100)[1], 6.0)
+        self.assertEqual(compiled.setpoint(-1)[0], 92)
+
+    def test_unsorted_and_single_point(self):
+        compiled = CompiledProfile([{"t": 4, "press": 8}, {"t": 0, "press": 0}], rate=10)
+        self.assertAlmostEqual(compiled.setpoint(2)[1], 4.0)
+        single = CompiledProfile([{"t": 0, "press": 9}], rate=10)
+        self.assertEqual(single.size, 1)
+        self.assertEqual(single.setpoint(5)[1], 9)
+
+    def test_bad_profiles_are_not_compiled(self):
+        self.assertIsNone(compile_profile({"id": 1}))
+        self.assertIsNone(compile_profile({"id": 1, "points": [{"t": "x"}]}))
+        self.assertIsNone(compile_profile({"id": 1, "points": [{"t": 0}, {"t": 10 ** 6}]}))
+
+    def test_executor_reports_deviation(self):
+        executor = ProfileExecutor()
+        executor.load("left", CLASSIC)
+        executor.update("left", 10.0, (93.5, 8.0, 2.0, 1.7, 10.0))
+        live = executor.live("left")
+        self.assertEqual(live["target"]["pressure"], 9.0)
+        self.assertEqual(live["deviation"]["pressure"], -1.0)
+        self.assertEqual(live["deviation"]["temp"], -0.5)
+        executor.unload("left")
+        self.assertIsNone(executor.live("left"))
+
+
+class TestMockFollowsProfile(unittest.TestCase):
+
+    def test_pressure_tracks_setpoint(self):
+        async def scenario():
+            hw = MockHardware()
+            hw.scheduler.rate = 200
+            hw.start_extraction("left", {**CLASSIC, "targetYield": None})
+            hw.groups["left"].start_time -= 8  # Сразу на плато 9 бар
+            task = asyncio.create_task(hw.acquisition_loop())
+            await asyncio.sleep(0.5)
+            frame = (await hw.get_telemetry())["left"]
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return frame
+
+        frame = asyncio.run(scenario())
+        self.assertEqual(frame["target"]["pressure"], 9.0)
+        self.assertIn("deviation", frame)
+        self.assertGreater(frame["pressure"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
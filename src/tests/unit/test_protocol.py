@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from binascii import crc_hqx
+from hardware.protocol import FrameParser, encode, FRAME_GROUP, FRAME_MACHINE, FRAME_COMMAND, CRC, CRC_INIT
+
+
+class TestFrameParser(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = FrameParser()
+        self.group = encode(FRAME_GROUP, 1, 2, 1500, 93.0, 9.0, 2.5, 2.25, 3.5)
+        self.machine = encode(FRAME_MACHINE, 95.5, 1.25, 1)
+
+    def test_crc_is_ccitt_false(self):
+        self.assertEqual(crc_hqx(b"123456789", CRC_INIT), 0x29B1)
+
+    def test_round_trip(self):
+        frames = self.parser.feed(self.group + self.machine)
+        self.assertEqual(frames, [
+            (FRAME_GROUP, (1, 2, 1500, 93.0, 9.0, 2.5, 2.25, 3.5)),
+            (FRAME_MACHINE, (95.5, 1.25, 1)),
+        ])
+        self.assertEqual(len(self.parser.buffer), 0)
+
+    def test_byte_by_byte(self):
+        frames = []
+        for b in self.group + self.machine:
+            frames += self.parser.feed(bytes([b]))
+        self.assertEqual([f[0] for f in frames], [FRAME_GROUP, FRAME_MACHINE])
+        self.assertEqual(self.parser.dropped_bytes, 0)
+
+    def test_resync_after_garbage_and_bad_crc(self):
+        corrupted = bytearray(self.group)
+        corrupted[10] ^= 0xFF
+        frames = self.parser.feed(b"\x00\xa5\x13" + bytes(corrupted) + self.machine)
+        self.assertEqual(frames, [(FRAME_MACHINE, (95.5, 1.25, 1))])
+        self.assertEqual(self.parser.crc_errors, 1)
+        self.assertEqual(len(self.parser.buffer), 0)
+
+    def test_unknown_type_is_skipped(self):
+        cmd = encode(FRAME_COMMAND, 0, 1, -1)
+        unknown = bytearray(cmd)
+        unknown[2] = 0x7F
+        unknown[-2:] = CRC.pack(crc_hqx(bytes(unknown[2:-2]), CRC_INIT))
+        frames = self.parser.feed(bytes(unknown) + cmd)
+        self.assertEqual(frames, [(FRAME_COMMAND, (0, 1, -1))])
+        self.assertEqual(self.parser.unknown, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
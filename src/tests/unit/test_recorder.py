@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from hardware.recorder import ShotRecorder
+
+
+class TestShotRecorder(unittest.TestCase):
+
+    def test_no_curve_before_first_shot(self):
+        self.assertIsNone(ShotRecorder("left").curve())
+
+    def test_records_only_while_recording(self):
+        rec = ShotRecorder("left", capacity=10)
+        rec.append(0.0, 93.0, 0.0, 0.0, 0.0, 0.0)
+        rec.start()
+        for i in range(3):
+            rec.append(i * 0.04, 93.0, 9.0, 2.5, 2.2, i * 0.1)
+        rec.freeze("DONE")
+        rec.append(1.0, 93.0, 9.0, 2.5, 2.2, 9.9)
+
+        curve = rec.curve()
+        self.assertEqual(curve["samples"], 3)
+        self.assertEqual(curve["state"], "DONE")
+        self.assertEqual(curve["data"]["t"], [0.0, 0.04, 0.08])
+        self.assertEqual(curve["data"]["yield"], [0.0, 0.1, 0.2])
+
+    def test_ring_keeps_latest_samples_in_order(self):
+        rec = ShotRecorder("right", capacity=4)
+        rec.start()
+        for i in range(6):
+            rec.append(float(i), 0, 0, 0, 0, 0)
+        self.assertEqual(rec.curve()["data"]["t"], [2.0, 3.0, 4.0, 5.0])
+
+    def test_new_shot_resets_buffer(self):
+        rec = ShotRecorder("left", capacity=4)
+        rec.start()
+        rec.append(1.0, 0, 0, 0, 0, 0)
+        rec.freeze("STOPPED")
+        rec.start()
+        curve = rec.curve()
+        self.assertEqual(curve["shot_id"], 2)
+        self.assertEqual(curve["samples"], 0)
+        self.assertEqual(curve["state"], "RECORDING")
+
+
+if __name__ == '__main__':
+    unittest.main()
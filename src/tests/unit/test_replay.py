@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from clock import VirtualClock
+from hardware.mock import MockHardware
+from hardware.replay import ReplayHardware, ShotTrace
+from shots.store import ShotStore
+
+SETTINGS = {"summary_timeout": 5}
+
+
+def get_setting(key, default=None):
+    return SETTINGS.get(key, default)
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+        patcher = patch("hardware.base.settings_manager.get_setting", get_setting)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # "Запись с машины": два шота мока, второй остановлен вручную
+        store = ShotStore(self.path)
+        hw = MockHardware(clock=VirtualClock(), seed=5)
+        hw.shot_listeners.append(store.append)
+        hw.start_extraction("left", {"id": 1, "targetYield": 36})
+        hw.run_for(30)
+        hw.start_extraction("right", {"id": 2})
+        hw.run_for(8)
+        hw.stop_extraction("right")
+        hw.run_for(10)
+        self.recorded = [store.get(1), store.get(2)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_trace_reads_columns_from_mapped_log(self):
+        trace = ShotTrace(self.path)
+        self.assertEqual(trace.ids, [1, 2])
+        shot = trace.shot(2)
+        self.assertEqual((shot.side, shot.state), ("right", "STOPPED"))
+        self.assertAlmostEqual(shot.duration, self.recorded[1]["duration"], places=2)
+        last = shot.sample(shot.duration + 100)
+        self.assertAlmostEqual(last[4], self.recorded[1]["data"]["yield"][-1], places=2)
+        self.assertIsNone(trace.shot(3))
+        trace.close()
+
+    def test_replay_reproduces_recorded_shots(self):
+        hw = ReplayHardware(self.path, clock=VirtualClock())
+        saved = []
+        hw.shot_listeners.append(saved.append)
+
+        hw.start_extraction("left", {})  # Следующий шот истории — первый
+        hw.run_for(40)
+        hw.start_extraction("left", {"trace": 2})
+        hw.run_for(20)
+
+        self.assertEqual([c["state"] for c in saved], ["DONE", "STOPPED"])
+        for replayed, recorded in zip(saved, self.recorded):
+            self.assertAlmostEqual(replayed["data"]["t"][-1], recorded["duration"], delta=0.05)
+            self.assertAlmostEqual(replayed["data"]["yield"][-1], recorded["data"]["yield"][-1], delta=0.1)
+            self.assertEqual(max(replayed["data"]["pressure"]), max(recorded["data"]["pressure"]))
+
+    def test_autoplay_keeps_groups_busy(self):
+        hw = ReplayHardware(self.path, clock=VirtualClock(), autoplay=True)
+        saved = []
+        hw.shot_listeners.append(saved.append)
+        hw.run_for(120)
+        self.assertGreaterEqual(len([c for c in saved if c["side"] == "left"]), 3)
+        self.assertGreaterEqual(len([c for c in saved if c["side"] == "right"]), 3)
+
+    def test_trace_is_opened_read_only(self):
+        index = os.path.join(self.path, "shots.idx")
+        with open(index, "ab") as f:
+            f.write(b"\x01\x02\x03")  # Недописанная запись индекса
+        size = os.path.getsize(index)
+
+        trace = ShotTrace(self.path)
+        self.assertEqual(trace.ids, [1, 2])
+        self.assertEqual(os.path.getsize(index), size)
+        with self.assertRaises(RuntimeError):
+            trace.store.append(self.recorded[0])
+        trace.close()
+
+    def test_damaged_shot_is_skipped(self):
+        with open(os.path.join(self.path, "shots.log"), "r+b") as f:
+            f.seek(100)
+            f.write(b"\xff\xff\xff\xff")
+        hw = ReplayHardware(self.path, clock=VirtualClock())
+        hw.start_extraction("left", {})
+        self.assertEqual(hw.playing["left"].shot_id, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
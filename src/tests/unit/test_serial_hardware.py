@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+try:
+    from hardware.pty_controller import PtyController
+    from hardware.serial_driver import SerialHardware
+except ImportError:  # Нет termios/pty (Windows)
+    PtyController = None
+
+
+@unittest.skipIf(PtyController is None, "pty is not available")
+class TestSerialHardware(unittest.TestCase):
+
+    async def _wait_state(self, hw, side, state, timeout=2.0):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while hw.groups[side].state != state:
+            if loop.time() > deadline:
+                self.fail(f"{side} did not reach {state}, now {hw.groups[side]['state']}")
+            await asyncio.sleep(0.01)
+
+    async def _scenario(self):
+        controller = PtyController()
+        hw = SerialHardware(controller.path)
+        shots = []
+        hw.shot_listeners.append(shots.append)
+        tasks = [asyncio.create_task(controller.run()), asyncio.create_task(hw.acquisition_loop())]
+        try:
+            await self._wait_state(hw, "left", hw.IDLE)
+            while not hw.connected:
+                await asyncio.sleep(0.01)
+
+            hw.start_extraction("left", {"id": 7})
+            await self._wait_state(hw, "left", hw.EXTRACTION)
+            await asyncio.sleep(0.3)
+            telemetry = await hw.get_telemetry()
+            self.assertTrue(telemetry["left"]["active"])
+            self.assertEqual(telemetry["machine"]["boiler_temp"], 95.5)
+
+            hw.stop_extraction("left")
+            await self._wait_state(hw, "left", hw.STOPPED)
+            self.assertEqual(controller.commands[:2], [("left", "start", 7), ("left", "stop", -1)])
+            self.assertEqual(len(shots), 1)
+            self.assertEqual(shots[0]["profile_id"], 7)
+            self.assertGreater(shots[0]["samples"], 3)
+            self.assertEqual(hw.parser.crc_errors, 0)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            controller.close()
+
+    def test_commands_and_samples_over_pty(self):
+        asyncio.run(self._scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+import json
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from clock import VirtualClock
+from hardware.mock import MockHardware
+from telemetry.broadcaster import TelemetryBroadcaster
+from telemetry.delta import DeltaEncoder
+from telemetry.session import TelemetrySession
+
+
+class FakeWebSocket:
+    """Сокет клиента: входящие сообщения из очереди, отправленные — списком по порядку."""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def receive_text(self):
+        return await self.incoming.get()
+
+    async def send_json(self, msg):
+        self.sent.append(msg)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+class TestCommandChannel(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch("hardware.base.settings_manager.get_setting", lambda key, default=None: default)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_session(self, messages, until):
+        """Отправляет сообщения клиента и ждет, пока until(sent) не станет True."""
+        hw = MockHardware(clock=VirtualClock(), seed=1)
+
+        async def scenario():
+            ws = FakeWebSocket()
+            broadcaster = TelemetryBroadcaster(hw)
+            sub = broadcaster.subscribe()
+            task = asyncio.create_task(TelemetrySession(ws, broadcaster, DeltaEncoder(enabled=False), sub).run())
+            for msg in messages:
+                ws.incoming.put_nowait(msg if isinstance(msg, str) else json.dumps(msg))
+            try:
+                for _ in range(100):
+                    await asyncio.sleep(0.01)
+                    if until(ws.sent):
+                        break
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            return ws.sent
+
+        return hw, asyncio.run(scenario())
+
+    @staticmethod
+    def acks(sent):
+        return [m for m in sent if m.get("type") == "ack"]
+
+    def test_ack_echoes_id_and_state_frame_follows(self):
+        def flushed(sent):
+            return any(m.get("topic") == "left" and m["payload"]["state"] == "FLUSH" for m in sent)
+
+        hw, sent = self.run_session([{"type": "command", "id": "c-1", "command": "flush", "side": "left"}], flushed)
+        self.assertEqual(self.acks(sent), [{"type": "ack", "id": "c-1", "status": "flushing", "ok": True}])
+        self.assertEqual(hw.groups["left"].state, "FLUSH")
+
+        ack_at = sent.index(self.acks(sent)[0])
+        frames = [i for i, m in enumerate(sent) if m.get("topic") == "left" and m["payload"]["state"] == "FLUSH"]
+        self.assertTrue(frames)
+        self.assertGreater(frames[0], ack_at)
+
+    def test_group_by_id(self):
+        hw, sent = self.run_session(
+            [{"type": "command", "id": 2, "command": "cleaning", "side": 1}],
+            lambda sent: self.acks(sent),
+        )
+        self.assertTrue(self.acks(sent)[0]["ok"])
+        self.assertEqual(hw.groups["right"].state, "CLEANING")
+
+    def test_error_acks(self):
+        messages = [
+            {"type": "command", "id": 1, "command": "flush", "side": "center"},
+            {"type": "command", "id": 2, "command": "brew", "side": "left"},
+            {"type": "command", "id": 3},
+        ]
+        hw, sent = self.run_session(messages, lambda sent: len(self.acks(sent)) == 3)
+        acks = self.acks(sent)
+        self.assertEqual([a["id"] for a in acks], [1, 2, 3])
+        self.assertTrue(all(a["ok"] is False for a in acks))
+        self.assertIn("unknown group", acks[0]["error"])
+        self.assertIn("unknown command", acks[1]["error"])
+        self.assertIn("unknown command", acks[2]["error"])
+        self.assertEqual({g.state for g in hw.group_list}, {"IDLE"})
+        # Ошибка команды не публикует внеочередной кадр
+        self.assertFalse([m for m in sent if "topic" in m])
+
+    def test_start_with_bad_profile_keeps_group_idle(self):
+        hw, sent = self.run_session(
+            [{"type": "command", "id": 4, "command": "start", "side": "right", "profile": "abc"}],
+            lambda sent: self.acks(sent),
+        )
+        self.assertEqual(self.acks(sent)[0]["ok"], False)
+        self.assertIn("profile", self.acks(sent)[0]["error"])
+        self.assertEqual(hw.groups["right"].state, "IDLE")
+
+        # Мимо control: шот не начался — и состояние не тронуто
+        with self.assertRaises(AttributeError):
+            hw.start_extraction("right", "abc")
+        self.assertEqual(hw.groups["right"].state, "IDLE")
+        self.assertIsNone(hw.groups["right"].timer)
+
+    def test_malformed_message(self):
+        _, sent = self.run_session(["{not json", '"text"'], lambda sent: len(sent) == 2)
+        self.assertEqual([m["type"] for m in sent], ["error", "error"])
+        self.assertTrue(sent[0]["error"].startswith("bad message"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+import settings_manager
+
+
+class TestSettingsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.user_file = os.path.join(self.tmp.name, "user_settings.json")
+        self.factory_file = os.path.join(self.tmp.name, "factory_defaults.json")
+        with open(self.factory_file, "w") as f:
+            json.dump({"serial": "CDR-00000001"}, f)
+        self.write_user({"summary_timeout": 15})
+
+        hu = settings_manager.hu_config
+        self.patches = [
+            patch.object(hu, "USER_CONFIG_FILE", self.user_file),
+            patch.object(hu, "FACTORY_CONFIG_FILE", self.factory_file, create=True),
+        ]
+        for p in self.patches:
+            p.start()
+        settings_manager.invalidate_cache()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        settings_manager.invalidate_cache()
+        self.tmp.cleanup()
+
+    def write_user(self, data):
+        with open(self.user_file, "w") as f:
+            json.dump(data, f)
+
+    def test_hot_path_does_not_reload(self):
+        self.assertEqual(settings_manager.get_setting("summary_timeout"), 15)
+        with patch.object(settings_manager.hu_config, "load_config") as load, \
+                patch.object(settings_manager.os, "stat") as stat:
+            for _ in range(100):
+                settings_manager.get_setting("summary_timeout")
+            load.assert_not_called()
+            stat.assert_not_called()
+
+    def test_external_change_is_picked_up(self):
+        self.assertEqual(settings_manager.get_setting("summary_timeout"), 15)
+        self.write_user({"summary_timeout": 30, "extra": "x" * 10})
+        with patch.object(settings_manager, "CHECK_INTERVAL", 0):
+            self.assertEqual(settings_manager.get_setting("summary_timeout"), 30)
+        self.assertEqual(settings_manager.get_setting("serial"), "CDR-00000001")
+
+    def test_get_settings_returns_copy(self):
+        settings_manager.get_settings()["summary_timeout"] = 0
+        self.assertEqual(settings_manager.get_setting("summary_timeout"), 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from hardware import shm
+from hardware.shm import SharedState, SharedRecorder, RecorderView
+from hardware.process import ProcessHardware
+from telemetry.broadcaster import TelemetryBroadcaster
+from telemetry.session import TelemetrySession
+
+PROFILE = {"id": 1, "points": [{"t": 0, "temp": 93, "press": 9}, {"t": 30, "temp": 93, "press": 9}]}
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, msg):
+        self.sent.append(msg)
+
+
+class TestSharedState(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "state")
+        self.writer = SharedState(self.path, ("left", "right"), capacity=16, create=True)
+        self.reader = SharedState(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        shutil.rmtree(self.dir)
+
+    def test_frames_round_trip(self):
+        self.assertEqual(self.reader.read_frames(), {})
+        self.writer.write_frames({
+            "machine": {"boiler_temp": 124.5, "steam_pressure": 1.25, "water_level": "low"},
+            "left": {"temp": 93.2, "pressure": 8.9, "flowIn": 2.0, "flowOut": 1.5, "yield": 20.3,
+                     "time": "0:12", "done": False, "active": True, "state": "EXTRACTION",
+                     "window": {"samples": 5}},
+        })
+
+        frames = self.reader.read_frames()
+        self.assertEqual(self.reader.sides, ("left", "right"))
+        self.assertEqual(frames["machine"], {"boiler_temp": 124.5, "steam_pressure": 1.25, "water_level": "low"})
+        self.assertEqual(frames["left"], {
+            "temp": 93.2, "pressure": 8.9, "flowIn": 2.0, "flowOut": 1.5, "yield": 20.3,
+            "time": "0:12", "done": False, "active": True, "state": "EXTRACTION",
+        })
+        self.assertNotIn("right", frames)
+
+    def test_torn_slot_is_not_returned(self):
+        self.writer.write_frames({"machine": {"boiler_temp": 120.0}})
+        off = self.writer.machine_off
+        seq, crc = shm.SEQ.unpack_from(self.writer.mm, off)
+
+        # Запись в процессе: нечетный seq
+        shm.SEQ.pack_into(self.writer.mm, off, seq + 1, crc)
+        self.assertNotIn("machine", self.reader.read_frames())
+        # Данные не совпадают с CRC (запись стала видна не по порядку)
+        shm.SEQ.pack_into(self.writer.mm, off, seq + 2, crc ^ 1)
+        self.assertNotIn("machine", self.reader.read_frames())
+
+        self.writer.write_frames({"machine": {"boiler_temp": 121.0}})
+        self.assertEqual(self.reader.read_frames()["machine"]["boiler_temp"], 121.0)
+
+    def test_recorder_view_reads_writer_columns(self):
+        done = []
+        rec = SharedRecorder("left", self.writer, on_complete=done.append)
+        view = RecorderView("left", self.reader)
+
+        rec.start(profile_id=3)
+        for i in range(20):  # Больше емкости — кольцо
+            rec.append(i * 0.02, 93.0, float(i), 1.0, 1.0, i * 0.1)
+
+        self.assertTrue(view.refresh())
+        self.assertEqual(view.total, 20)
+        self.assertEqual([s[1] for s in view.recent(3)], [17.0, 18.0, 19.0])
+
+        rec.freeze("DONE")
+        curve = view.curve()
+        self.assertEqual(curve, done[0])
+        self.assertEqual(curve["state"], "DONE")
+        self.assertEqual(curve["profile_id"], 3)
+        self.assertEqual(curve["data"]["pressure"][0], 4.0)
+        with self.assertRaises(RuntimeError):
+            view.append(0.0, 0, 0, 0, 0, 0)
+
+
+class TestProcessHardware(unittest.TestCase):
+
+    def run_process(self, body):
+        """body(hw) — корутина на подключенном к процессу железа ProcessHardware."""
+        tmp = tempfile.mkdtemp()
+        hw = ProcessHardware(
+            "mock",
+            shm_path=os.path.join(tmp, "state"),
+            socket_path=os.path.join(tmp, "hw.sock"),
+        )
+
+        async def scenario():
+            task = asyncio.create_task(hw.acquisition_loop())
+            try:
+                for _ in range(100):
+                    if hw.connected:
+                        break
+                    await asyncio.sleep(0.1)
+                self.assertTrue(hw.connected)
+                await body(hw)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        try:
+            asyncio.run(scenario())
+            self.assertIsNotNone(hw._proc.returncode)
+        finally:
+            if hw.shared is not None:
+                hw.shared.close()
+            shutil.rmtree(tmp)
+
+    def test_extraction_through_hardware_process(self):
+        async def body(hw):
+            hw.start_extraction("left", {"id": 1})
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                frames = await hw.get_telemetry()
+                if frames["left"].get("window"):
+                    break
+            self.assertEqual(frames["left"]["state"], "EXTRACTION")
+            self.assertEqual(frames["right"]["state"], "IDLE")
+            self.assertGreater(frames["left"]["window"]["samples"], 0)
+            self.assertEqual(hw.groups["left"].state, "EXTRACTION")
+
+            hw.stop_extraction("left")
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                if (await hw.get_telemetry())["left"]["state"] == "STOPPED":
+                    break
+            self.assertEqual(hw.groups["left"].state, "STOPPED")
+            self.assertEqual(hw.recorders["left"].curve()["state"], "STOPPED")
+
+        self.run_process(body)
+
+    def test_ws_start_keeps_profile_setpoints(self):
+        # Команда по WS сразу делает refresh(): память еще показывает IDLE
+        async def body(hw):
+            ws = FakeWebSocket()
+            session = TelemetrySession(ws, TelemetryBroadcaster(hw), None, None)
+            await session._command({"type": "command", "id": 7, "command": "start",
+                                    "side": "left", "profile": PROFILE})
+            self.assertEqual(ws.sent[0], {"type": "ack", "id": 7, "status": "started", "ok": True})
+
+            frames = []
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                frame = (await hw.get_telemetry())["left"]
+                if frame["state"] == "EXTRACTION":
+                    frames.append(frame)
+                if len(frames) >= 5:
+                    break
+            self.assertEqual(len(frames), 5)
+            self.assertTrue(all("deviation" in f for f in frames[1:]))
+
+            hw.stop_extraction("left")
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                if (await hw.get_telemetry())["left"]["state"] == "STOPPED":
+                    break
+            self.assertNotIn("left", hw.executor.profiles)
+
+        self.run_process(body)
+
+
+if __name__ == '__main__':
+    unittest.main()
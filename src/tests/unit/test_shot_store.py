@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import tempfile
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from shots.store import ShotStore, INDEX_RECORD
+
+
+def make_curve(side="left", started_at=1000.0, profile_id=1, state="DONE", n=50):
+    t = [i * 0.04 for i in range(n)]
+    return {
+        "side": side, "started_at": started_at, "profile_id": profile_id,
+        "state": state, "sample_rate": 25, "samples": n,
+        "data": {
+            "t": t, "temp": [93.0] * n, "pressure": [9.0] * n,
+            "flowIn": [2.5] * n, "flowOut": [2.2] * n, "yield": [x * 2.2 for x in t],
+        },
+    }
+
+
+class TestShotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_get_roundtrip(self):
+        store = ShotStore(self.path)
+        shot_id = store.append(make_curve())
+        self.assertEqual(shot_id, 1)
+
+        shot = store.get(1)
+        self.assertEqual(shot["side"], "left")
+        self.assertEqual(shot["profile_id"], 1)
+        self.assertEqual(shot["state"], "DONE")
+        self.assertEqual(shot["samples"], 50)
+        self.assertEqual(shot["data"]["pressure"][0], 9.0)
+        self.assertAlmostEqual(shot["duration"], 1.96, places=2)
+        self.assertIsNone(shot["overshoot"])
+        self.assertIsNone(store.get(2))
+
+    def test_overshoot_is_stored(self):
+        store = ShotStore(self.path)
+        store.append({**make_curve(), "target_yield": 36.0, "overshoot": 0.75})
+        shot = store.get(1)
+        self.assertEqual(shot["target_yield"], 36.0)
+        self.assertEqual(shot["overshoot"], 0.75)
+
+    def test_list_filters_and_survives_reopen(self):
+        store = ShotStore(self.path)
+        store.append(make_curve("left", 1000.0, 1))
+        store.append(make_curve("right", 2000.0, 2, "STOPPED"))
+        store.append(make_curve("left", 3000.0, 2))
+
+        store = ShotStore(self.path)
+        self.assertEqual(len(store), 3)
+        self.assertEqual([s["id"] for s in store.list()], [3, 2, 1])
+        self.assertEqual([s["id"] for s in store.list(side="left")], [3, 1])
+        self.assertEqual([s["id"] for s in store.list(profile_id=2)], [3, 2])
+        self.assertEqual([s["id"] for s in store.list(since=1500, until=2500)], [2])
+        self.assertEqual([s["id"] for s in store.list(limit=1, offset=1)], [2])
+
+    def test_time_filter_with_out_of_order_starts(self):
+        # Шоты пишутся по завершении: вторая группа начала раньше, а закончила позже
+        store = ShotStore(self.path)
+        store.append(make_curve("right", 105.0))
+        store.append(make_curve("left", 100.0))
+        store.append(make_curve("right", 140.0))
+
+        for store in (store, ShotStore(self.path)):
+            self.assertEqual([s["id"] for s in store.list(until=102)], [2])
+            self.assertEqual([s["id"] for s in store.list(since=102, until=120)], [1])
+            self.assertEqual([s["id"] for s in store.list()], [3, 1, 2])
+
+    def test_bad_profile_id_does_not_lose_shot(self):
+        store = ShotStore(self.path)
+        for profile_id in ("espresso", 2**40, True, None):
+            store.append(make_curve(profile_id=profile_id))
+        self.assertEqual(len(store), 4)
+        self.assertEqual({s["profile_id"] for s in store.list()}, {None})
+
+    def test_zero_limit(self):
+        store = ShotStore(self.path)
+        store.append(make_curve())
+        self.assertEqual(store.list(limit=0), [])
+        self.assertEqual(store.list(limit=-1), [])
+
+    def test_empty_shot_is_not_stored(self):
+        store = ShotStore(self.path)
+        self.assertIsNone(store.append(make_curve(n=0)))
+        self.assertEqual(len(store), 0)
+
+    def test_reader_sees_shots_of_other_writer(self):
+        reader = ShotStore(self.path)
+        writer = ShotStore(self.path)
+        writer.append(make_curve("left", 1000.0, 1))
+        self.assertEqual(len(reader), 1)
+        self.assertEqual(reader.list()[0]["side"], "left")
+        self.assertEqual(reader.get(1)["id"], 1)
+
+    def test_index_tail_past_log_end_is_dropped(self):
+        store = ShotStore(self.path)
+        store.append(make_curve())
+        # Индексная запись без данных в логе (сбой питания между записями)
+        with open(store.index_path, "ab") as f:
+            f.write(INDEX_RECORD.pack(2, 2000.0, 1.0, 2.0, b"left", 1, 0, 10**6, 100))
+
+        store = ShotStore(self.path)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(os.path.getsize(store.index_path), INDEX_RECORD.size)
+        self.assertEqual(store.append(make_curve()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
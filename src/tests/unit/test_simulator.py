@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from hardware import simulator
+from hardware.factory import create_hardware
+
+
+def run_shot(sim, i, seconds):
+    sim.start(i)
+    rows = []
+    for _ in range(int(seconds / sim.dt)):
+        sim.step()
+        rows.append(sim.readings()[i].tolist())
+    return rows
+
+
+@unittest.skipIf(simulator.np is None, "numpy not installed")
+class TestMachineSimulator(unittest.TestCase):
+
+    def test_same_seed_same_shot(self):
+        a = run_shot(simulator.MachineSimulator(2, seed=7), 0, 5)
+        b = run_shot(simulator.MachineSimulator(2, seed=7), 0, 5)
+        c = run_shot(simulator.MachineSimulator(2, seed=8), 0, 5)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_shot_shape(self):
+        sim = simulator.MachineSimulator(2, seed=1, noise=False)
+        rows = run_shot(sim, 0, 25)
+        temp, pressure, flow_in, flow_out, yld = rows[-1]
+        # Пропитка: в первые ~1.5 с в чашку ничего не течет
+        self.assertEqual(rows[int(1.0 / sim.dt)][simulator.FLOW_OUT], 0.0)
+        self.assertAlmostEqual(pressure, 9.0, delta=0.3)
+        # Таблетка размывается: поток в конце выше, чем в начале плато
+        self.assertGreater(flow_out, rows[int(6 / sim.dt)][simulator.FLOW_OUT])
+        self.assertGreater(yld, 30)
+        # Холодная вода остужает группу, регулятор не дает упасть далеко
+        self.assertLess(temp, 92.0)
+        self.assertGreater(temp, 85.0)
+        # Вторая группа не работала
+        self.assertEqual(sim.yld[1], 0.0)
+        self.assertGreater(sim.stop(0), yld)
+
+    def test_groups_step_together(self):
+        sim = simulator.MachineSimulator(8, seed=3, noise=False)
+        for i in range(0, 8, 2):
+            sim.start(i)
+        for _ in range(500):
+            sim.step()
+        self.assertTrue((sim.yld[::2] > 0).all())
+        self.assertTrue((sim.yld[1::2] == 0).all())
+
+
+@unittest.skipIf(simulator.np is None, "numpy not installed")
+class TestMockSimulatorMode(unittest.TestCase):
+
+    def test_extraction_uses_model(self):
+        async def scenario():
+            hw = create_hardware("sim", seed=5)
+            hw.scheduler.rate = 200
+            task = asyncio.create_task(hw.acquisition_loop())
+            hw.start_extraction("left", {"id": 1})
+            await asyncio.sleep(0.3)
+            frames = await hw.get_telemetry()
+            hw.stop_extraction("left")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return hw, frames
+
+        hw, frames = asyncio.run(scenario())
+        self.assertEqual(frames["left"]["state"], "EXTRACTION")
+        self.assertGreater(frames["left"]["flowIn"], 0.0)
+        self.assertIn("boiler_temp", frames["machine"])
+        self.assertGreater(hw.sim.steps, 0)
+        self.assertFalse(hw.sim.active.any())
+        self.assertEqual(hw.groups["left"].state, "STOPPED")
+
+
+if __name__ == '__main__':
+    unittest.main()
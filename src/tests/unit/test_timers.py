@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import asyncio
+import time
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from timers import TimerHeap
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTimerHeap(unittest.TestCase):
+
+    def test_fires_in_deadline_order_and_skips_cancelled(self):
+        clock = FakeClock()
+        timers = TimerHeap(clock)
+        fired = []
+        timers.call_later(3, fired.append, "c")
+        timers.call_later(1, fired.append, "a")
+        cancelled = timers.call_later(2, fired.append, "b")
+        timers.call_later(1, fired.append, "a2")
+        cancelled.cancel()
+
+        self.assertEqual(timers.next_deadline(), 101.0)
+        clock.now = 102.5
+        self.assertEqual(timers.run_due(), 2)
+        self.assertEqual(fired, ["a", "a2"])
+        self.assertEqual(len(timers), 1)
+
+        clock.now = 110
+        timers.run_due()
+        self.assertEqual(fired, ["a", "a2", "c"])
+        self.assertIsNone(timers.next_deadline())
+        self.assertEqual(timers.stats()["fired"], 3)
+
+    def test_earlier_timer_wakes_sleeping_loop(self):
+        async def scenario():
+            timers = TimerHeap()
+            fired = []
+            timers.call_later(10, fired.append, "late")
+            task = asyncio.create_task(timers.run())
+            await asyncio.sleep(0.01)
+            start = time.monotonic()
+            timers.call_later(0.02, fired.append, "early")
+            while not fired:
+                await asyncio.sleep(0.005)
+            elapsed = time.monotonic() - start
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return fired, elapsed
+
+        fired, elapsed = asyncio.run(scenario())
+        self.assertEqual(fired, ["early"])
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,13 @@
 #!/usr/bin/env python3
+"""
+Применение пользовательского конфига к системе (hostname, точка доступа, клиент Wi-Fi).
+
+Скрипт инкрементальный: сначала строится желаемое состояние файлов,
+затем оно сравнивается с диском и NetworkManager. Пишутся только
+отличающиеся файлы (меньше записей на SD), UUID соединений сохраняются,
+а переподнимается только затронутое соединение — смена, например,
+часового пояса не роняет точку доступа.
+"""
 import os
 import subprocess
 import uuid
@@ -6,33 +15,64 @@ import uuid
 import hu_config  # type: ignore
 
 NM_CONN_DIR = "/etc/NetworkManager/system-connections"
+HOSTNAME_FILE = "/etc/hostname"
+HOSTS_FILE = "/etc/hosts"
 
+AP_CONN = "internal-ap"
+CLIENT_CONN = "preconfigured-wifi"
 
-def set_hostname(hostname):
-    current = subprocess.getoutput("hostname").strip()
-    if current != hostname:
-        print(f"Applying hostname: {hostname}")
-        with open("/etc/hostname", "w") as f:
-            f.write(hostname)
-        subprocess.run(["hostnamectl", "set-hostname", hostname])
-        with open("/etc/hosts", "w") as f:
-            f.write(f"127.0.0.1\tlocalhost\n127.0.1.1\t{hostname}\n")
 
+def conn_path(name):
+    return os.path.join(NM_CONN_DIR, f"{name}.nmconnection")
 
-def configure_ap(serial, password):
-    parts = serial.split("-")
-    if len(parts) != 2:
-        return
 
-    ssid = serial
+def read_file(path):
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
 
-    psk = password if password else "headunit123"
 
-    print(f"Applying AP: {ssid}")
+def existing_uuid(path):
+    """UUID из уже записанного .nmconnection — чтобы NM видел то же соединение."""
+    content = read_file(path) or ""
+    for line in content.splitlines():
+        if line.startswith("uuid="):
+            return line[len("uuid="):].strip()
+    return str(uuid.uuid4())
+
 
-    config = f"""[connection]
-id=internal-ap
-uuid={uuid.uuid4()}
+def write_if_changed(path, content, mode=None):
+    """Пишет файл только при отличии содержимого. Возвращает True, если файл изменен."""
+    if read_file(path) == content:
+        return False
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    if mode is not None:
+        os.chmod(tmp, mode)
+    os.replace(tmp, path)
+    return True
+
+
+def remove_if_exists(path):
+    if os.path.exists(path):
+        os.remove(path)
+        return True
+    return False
+
+
+# --- Желаемое состояние ---
+
+
+def ap_config(ssid, password, conn_uuid):
+    psk = password if password else "headunit123"
+    return f"""[connection]
+id={AP_CONN}
+uuid={conn_uuid}
 type=wifi
 interface-name=wlan0
 autoconnect=true
@@ -54,25 +94,13 @@ address1=192.168.50.1/24
 addr-gen-mode=default
 method=ignore
 """
-    path = os.path.join(NM_CONN_DIR, "internal-ap.nmconnection")
-    with open(path, "w") as f:
-        f.write(config)
-    os.chmod(path, 0o600)
-
 
-def configure_client(ssid, password, country):
-    path = os.path.join(NM_CONN_DIR, "preconfigured-wifi.nmconnection")
-    if not ssid:
-        if os.path.exists(path):
-            os.remove(path)
-        return
 
-    print(f"Applying Client: {ssid}")
+def client_config(ssid, password, conn_uuid):
     sec = f"\n[wifi-security]\nkey-mgmt=wpa-psk\npsk={password}\n" if password else ""
-
-    config = f"""[connection]
-id=preconfigured-wifi
-uuid={uuid.uuid4()}
+    return f"""[connection]
+id={CLIENT_CONN}
+uuid={conn_uuid}
 type=wifi
 interface-name=wlan1
 autoconnect=true
@@ -88,9 +116,50 @@ method=auto
 addr-gen-mode=default
 method=auto
 """
-    with open(path, "w") as f:
-        f.write(config)
-    os.chmod(path, 0o600)
+
+
+# --- Применение ---
+
+
+def set_hostname(hostname):
+    changed = write_if_changed(HOSTNAME_FILE, hostname)
+    changed |= write_if_changed(HOSTS_FILE, f"127.0.0.1\tlocalhost\n127.0.1.1\t{hostname}\n")
+    if changed or subprocess.getoutput("hostname").strip() != hostname:
+        print(f"Applying hostname: {hostname}")
+        subprocess.run(["hostnamectl", "set-hostname", hostname])
+
+
+def configure_ap(serial, password):
+    """Возвращает True, если файл соединения изменился."""
+    if len(serial.split("-")) != 2:
+        return False
+    path = conn_path(AP_CONN)
+    changed = write_if_changed(path, ap_config(serial, password, existing_uuid(path)), 0o600)
+    if changed:
+        print(f"Applying AP: {serial}")
+    return changed
+
+
+def configure_client(ssid, password, country):
+    """Возвращает True, если файл соединения изменился (или удален)."""
+    path = conn_path(CLIENT_CONN)
+    if not ssid:
+        return remove_if_exists(path)
+    changed = write_if_changed(path, client_config(ssid, password, existing_uuid(path)), 0o600)
+    if changed:
+        print(f"Applying Client: {ssid}")
+    return changed
+
+
+def active_connections():
+    result = subprocess.run(
+        ["nmcli", "-t", "-f", "NAME", "connection", "show", "--active"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None  # NM недоступен — считаем, что состояние неизвестно
+    return set(result.stdout.split())
 
 
 def main():
@@ -100,34 +169,41 @@ def main():
         print("No user config found. Keeping factory defaults.")
         return
 
-    # 2. Если конфиг есть — применяем его
+    # 2. Если конфиг есть — применяем только отличия
     cfg = hu_config.load_config()
     sn = cfg.get("serial")
+    changed = set()
 
     if sn and sn != "CDR-00000000":
         parts = sn.split("-")
         if len(parts) == 2:
             set_hostname(f"cdreborn-{parts[1]}")
-            configure_ap(sn, cfg.get("wifi_app_pass"))
+            if configure_ap(sn, cfg.get("wifi_app_pass")):
+                changed.add(AP_CONN)
 
-    configure_client(
+    if configure_client(
         cfg.get("wifi_client_ssid"),
         cfg.get("wifi_client_pass"),
         cfg.get("wifi_country"),
-    )
-
-    subprocess.run(["nmcli", "connection", "reload"])
-    subprocess.run(
-        ["nmcli", "connection", "up", "internal-ap"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-    if cfg.get("wifi_client_ssid"):
-        subprocess.run(
-            ["nmcli", "connection", "up", "preconfigured-wifi"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+    ):
+        changed.add(CLIENT_CONN)
+
+    if changed:
+        subprocess.run(["nmcli", "connection", "reload"])
+
+    # Переподнимаем измененные соединения и те, что NM не держит активными
+    active = active_connections()
+    wanted = [AP_CONN] + ([CLIENT_CONN] if cfg.get("wifi_client_ssid") else [])
+    for name in wanted:
+        if name in changed or (active is not None and name not in active):
+            subprocess.run(
+                ["nmcli", "connection", "up", name],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+    if not changed:
+        print("Network configuration is up to date.")
 
 
 if __name__ == "__main__":
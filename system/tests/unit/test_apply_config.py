@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch, MagicMock
+import importlib.util
+
+LIB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../lib'))
+if LIB_PATH not in sys.path:
+    sys.path.insert(0, LIB_PATH)
+
+# Dynamic import for file with dashes
+SCRIPT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../bin/headunit-apply-config.py'))
+spec = importlib.util.spec_from_file_location("headunit_apply_config", SCRIPT_PATH)
+apply_config = importlib.util.module_from_spec(spec)
+sys.modules["headunit_apply_config"] = apply_config
+spec.loader.exec_module(apply_config)
+
+
+class TestApplyConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.user_config = os.path.join(root, "user_settings.json")
+        open(self.user_config, "w").close()
+        self.cfg = {
+            "serial": "CDR-12345678",
+            "wifi_app_pass": "secret123",
+            "wifi_client_ssid": "Cafe",
+            "wifi_client_pass": "pass",
+            "wifi_country": "RU",
+            "timezone": "UTC",
+        }
+        self.active = "internal-ap\npreconfigured-wifi\n"
+
+        patches = [
+            patch.object(apply_config, "NM_CONN_DIR", root),
+            patch.object(apply_config, "HOSTNAME_FILE", os.path.join(root, "hostname")),
+            patch.object(apply_config, "HOSTS_FILE", os.path.join(root, "hosts")),
+            patch.object(apply_config.hu_config, "USER_CONFIG_FILE", self.user_config),
+            patch.object(apply_config.hu_config, "load_config", lambda: dict(self.cfg)),
+            patch("headunit_apply_config.subprocess.getoutput", lambda cmd: "cdreborn-12345678"),
+            patch("headunit_apply_config.subprocess.run", side_effect=self._run),
+            patch("builtins.print"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.commands = []
+
+    def _run(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        return MagicMock(returncode=0, stdout=self.active)
+
+    def ups(self):
+        return [c[-1] for c in self.commands if c[:3] == ["nmcli", "connection", "up"]]
+
+    def test_unrelated_change_touches_nothing(self):
+        apply_config.main()
+        ap_path = apply_config.conn_path("internal-ap")
+        ap_uuid = apply_config.existing_uuid(ap_path)
+        mtime = os.stat(ap_path).st_mtime_ns
+
+        self.commands.clear()
+        self.cfg["timezone"] = "Europe/Moscow"
+        apply_config.main()
+
+        self.assertEqual(os.stat(ap_path).st_mtime_ns, mtime)
+        self.assertEqual(apply_config.existing_uuid(ap_path), ap_uuid)
+        self.assertNotIn(["nmcli", "connection", "reload"], self.commands)
+        self.assertEqual(self.ups(), [])
+
+    def test_client_change_reups_only_client(self):
+        apply_config.main()
+        ap_uuid = apply_config.existing_uuid(apply_config.conn_path("internal-ap"))
+        client_uuid = apply_config.existing_uuid(apply_config.conn_path("preconfigured-wifi"))
+
+        self.commands.clear()
+        self.cfg["wifi_client_ssid"] = "Home"
+        apply_config.main()
+
+        self.assertIn(["nmcli", "connection", "reload"], self.commands)
+        self.assertEqual(self.ups(), ["preconfigured-wifi"])
+        self.assertEqual(apply_config.existing_uuid(apply_config.conn_path("preconfigured-wifi")), client_uuid)
+        self.assertEqual(apply_config.existing_uuid(apply_config.conn_path("internal-ap")), ap_uuid)
+
+    def test_inactive_connection_is_brought_up(self):
+        apply_config.main()
+        self.commands.clear()
+        self.active = "preconfigured-wifi\n"
+        apply_config.main()
+        self.assertEqual(self.ups(), ["internal-ap"])
+
+    def test_removed_client_ssid_deletes_file(self):
+        apply_config.main()
+        self.commands.clear()
+        self.cfg["wifi_client_ssid"] = ""
+        apply_config.main()
+        self.assertFalse(os.path.exists(apply_config.conn_path("preconfigured-wifi")))
+        self.assertIn(["nmcli", "connection", "reload"], self.commands)
+        self.assertEqual(self.ups(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()